@@ -1,44 +1,207 @@
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 import os
 import json
+import base64
+import binascii
+import time
+import threading
+from werkzeug.exceptions import HTTPException, RequestedRangeNotSatisfiable
+
+
+from exercise_index import ExerciseIndex, load_records
+from facet_index import FACETS
+from image_cache import FileCache
+from metrics import CONTENT_TYPE, REGISTRY, SlowRequestProfiler
+from precompressed import PrecompressedJSON
+from reloader import DatasetWatcher
+import similarity
+import thumbnails
 
 app = Flask(__name__)
 
-# Folder untuk menyimpan latihan
-EXERCISES_FOLDER = 'exercises'
 
 
-def get_exercise_json(exercise_folder):
-    """Mencari file .json dalam folder latihan dan mengembalikan isi JSON."""
+class CatalogSnapshot:
+    """
+    Index latihan beserta respons yang diturunkan darinya. Respons penuh /list_all dan
+    /stats diserialisasi dan dikompres sekali per generation.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.generation = index.generation
+        self.list_all = PrecompressedJSON(index.list_payload)
+        self.stats = PrecompressedJSON(index.stats.to_dict())
+        # Matriks kemiripan dibangun saat /similar pertama kali dipanggil, atau langsung jika
+        # daftar tetangga dihitung di muka (GOGYM_SIMILAR_PRECOMPUTE=1)
+        self.similarity = similarity.LazySimilarity(index)
+        if similarity.PRECOMPUTE:
+            self.similarity.get()
+
+
+# Snapshot katalog yang sedang aktif. Diganti utuh (satu assignment) saat dataset berubah;
+# setiap request memakai snapshot yang aktif saat request dimulai (g.snapshot).
+SNAPSHOT = CatalogSnapshot(ExerciseIndex.load())
+RELOAD_LOCK = threading.Lock()
+
+# Watcher dataset aktif kecuali GOGYM_LIVE_RELOAD=0
+LIVE_RELOAD = os.environ.get('GOGYM_LIVE_RELOAD', '1') != '0'
+
+# Cache LRU isi file gambar beserta ETag-nya
+IMAGE_CACHE = FileCache()
+
+# Metrik request; dibaca lewat /metrics dalam format teks Prometheus
+REQUEST_LATENCY = REGISTRY.histogram(
+    'gogym_http_request_duration_seconds', 'Time spent handling a request, by route.', ('route', 'method')
+)
+REQUESTS = REGISTRY.counter('gogym_http_requests_total', 'Requests by route, method and status.', ('route', 'method', 'status'))
+ERRORS = REGISTRY.counter('gogym_http_errors_total', 'Responses with a 5xx status, by route.', ('route',))
+BYTES_SERVED = REGISTRY.counter(
+    'gogym_http_response_bytes_total', 'Response body bytes by route (streamed responses not counted).', ('route',)
+)
+REGISTRY.gauge(
+    'gogym_image_cache_lookups', 'Image cache lookups by result.',
+    lambda: {('hit',): IMAGE_CACHE.hits, ('miss',): IMAGE_CACHE.misses}, ('result',),
+)
+REGISTRY.gauge('gogym_image_cache_hit_ratio', 'Image cache hit ratio.', lambda: {(): IMAGE_CACHE.stats()['hit_ratio']})
+REGISTRY.gauge('gogym_image_cache_bytes', 'Bytes held in the image cache.', lambda: {(): IMAGE_CACHE.current_bytes})
+REGISTRY.gauge('gogym_catalog_generation', 'Generation of the active catalog snapshot.', lambda: {(): SNAPSHOT.generation})
+REGISTRY.gauge('gogym_catalog_exercises', 'Exercises in the active catalog snapshot.', lambda: {(): len(SNAPSHOT.index)})
+
+# Profiling sebagian request yang lambat (GOGYM_PROFILE_SAMPLE_RATE, GOGYM_PROFILE_SLOW_MS)
+PROFILER = SlowRequestProfiler.from_env()
+
+# Gambar latihan tidak berubah antar deploy, jadi boleh di-cache lama oleh klien
+IMAGE_MAX_AGE = 7 * 24 * 60 * 60
+
+# Batas jumlah id per request batch
+MAX_BATCH_SIZE = 200
+
+# Ukuran halaman /list_all jika memakai pagination
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Batas jumlah hasil per halaman untuk pencarian teks penuh
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+
+
+def record_request(route, method, status, duration, length):
+    """Mencatat satu request ke metrik; dipakai juga oleh route async di asgi.py."""
+    REQUEST_LATENCY.observe(duration, route, method)
+    REQUESTS.inc(route, method, str(status))
+    if status >= 500:
+        ERRORS.inc(route)
+    if length:
+        BYTES_SERVED.inc(route, amount=length)
+
+
+@app.before_request
+def pin_snapshot():
+    g.snapshot = SNAPSHOT
+    g.started = time.perf_counter()
+    g.profiler = PROFILER.start()
+
+
+@app.after_request
+def add_generation_header(response):
+    snapshot = g.get('snapshot')
+    if snapshot is not None:
+        response.headers['X-Catalog-Generation'] = str(snapshot.generation)
+
+    started = g.get('started')
+    if started is not None:
+        duration = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        length = None if response.is_streamed else response.calculate_content_length()
+        record_request(route, request.method, response.status_code, duration, length)
+        if g.get('profiler') is not None:
+            PROFILER.stop(g.profiler, f"{request.method} {route}", duration)
+            g.profiler = None
+    return response
+
+
+@app.teardown_request
+def release_profiler(error=None):
+    # Exception yang tidak tertangani melewati after_request; profiler tetap harus dilepas
+    if g.get('profiler') is not None:
+        PROFILER.stop(g.profiler, f"{request.method} {request.path}", time.perf_counter() - g.started)
+        g.profiler = None
+
+
+def apply_dataset_changes(changed_paths):
+    """
+    Menerapkan perubahan file dataset dari DatasetWatcher: perubahan record menghasilkan
+    snapshot baru yang hanya memproses ulang latihan yang berubah, dengan urutan id
+    mengikuti dataset.
+    """
+    global SNAPSHOT
+    with RELOAD_LOCK:
+        index = SNAPSHOT.index
+        records = load_records()
+        changes = index.diff(records)
+        order = [record['id'] for record in records]
+        if changes or order != index.ids:
+            SNAPSHOT = CatalogSnapshot(index.updated(changes, order))
+            print(f"Catalog generation {SNAPSHOT.generation}: {len(changes)} exercise(s) changed")
+
+
+def start_watcher():
+    # Gambar yang berubah di disk dibuang dari cache; hanya gambar yang ada di cache yang di-stat
+    watcher = DatasetWatcher(apply_dataset_changes, on_poll=IMAGE_CACHE.discard_stale)
+    watcher.start()
+    return watcher
+
+
+def split_param(values):
+    """Menggabungkan parameter berulang dan dipisah koma menjadi satu list."""
+    return [value.strip() for raw in values for value in raw.split(',') if value.strip()]
+
+
+def int_param(name, default=None):
+    """Parameter query bilangan bulat; default jika tidak ada, ValueError jika bukan bilangan bulat."""
+    raw = request.args.get(name)
+    return default if raw is None else int(raw)
+
+
+def is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def project(record, fields):
+    """Mengambil hanya field yang diminta dari record (id selalu disertakan)."""
+    if not fields:
+        return record
+    projected = {"id": record["id"]}
+    projected.update({field: record[field] for field in fields if field in record})
+    return projected
+
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(str(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Cursor adalah posisi berikutnya dalam katalog; None jika cursor tidak valid."""
     try:
-        json_file = os.path.join(exercise_folder, f"{os.path.basename(exercise_folder)}.json")
-        if os.path.exists(json_file):
-            with open(json_file, 'r') as f:
-                return json.load(f)
-        return None
-    except Exception as e:
-        print(f"Error reading JSON file in {exercise_folder}: {e}")
+        position = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, binascii.Error, UnicodeDecodeError):
         return None
+    return position if position >= 0 else None
 
 
 @app.route('/search', methods=['GET'])
 def search_exercise():
+    # Parameter 'q' memakai pencarian teks penuh dengan ranking BM25
+    if 'q' in request.args:
+        return ranked_search()
+
     # Mendapatkan parameter 'exercise' dari query string
     exercise_query = request.args.get('exercise', '').strip().lower()
-    exercises = []
 
     try:
-        # Cek apakah folder latihan ada
-        if not os.path.exists(EXERCISES_FOLDER):
-            return jsonify({"message": "Exercises folder not found."}), 500
-
-        # Cari folder latihan yang sesuai dengan query
-        if exercise_query:
-            for folder_name in os.listdir(EXERCISES_FOLDER):
-                folder_path = os.path.join(EXERCISES_FOLDER, folder_name)
-                # Pastikan folder ini adalah folder dan namanya cocok dengan query
-                if os.path.isdir(folder_path) and exercise_query in folder_name.lower():
-                    exercises.append(folder_name)
+        # Cari latihan yang sesuai dengan query
+        exercises = g.snapshot.index.search_ids(exercise_query)
 
         if exercises:
             return jsonify({"exercises": exercises}), 200
@@ -49,37 +212,197 @@ def search_exercise():
         return jsonify({"message": "Internal server error."}), 500
 
 
+def ranked_search():
+    """Pencarian teks penuh atas nama, otot, equipment, kategori dan instruksi."""
+    query = request.args.get('q', '').strip()
+    try:
+        limit = int_param('limit', DEFAULT_SEARCH_LIMIT)
+        offset = int_param('offset', 0)
+    except ValueError:
+        return jsonify({"message": "'limit' and 'offset' must be integers."}), 400
+
+    if not query:
+        return jsonify({"message": "Query parameter 'q' is required."}), 400
+    if limit < 1 or offset < 0:
+        return jsonify({"message": "Invalid 'limit' or 'offset'."}), 400
+    # Limit yang dipakai (dan dikembalikan) dibatasi MAX_SEARCH_LIMIT
+    limit = min(limit, MAX_SEARCH_LIMIT)
+
+    try:
+        index = g.snapshot.index
+        total, results, corrections = index.search.search(query, limit, offset)
+        for result in results:
+            result["name"] = index.records[result["id"]]["name"]
+
+        return jsonify({
+            "query": query,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "corrections": corrections,
+            "results": results,
+        }), 200
+    except Exception as e:
+        print(f"Error in ranked_search: {e}")
+        return jsonify({"message": "Internal server error."}), 500
+
+
+@app.route('/filter', methods=['GET'])
+def filter_exercises():
+    """
+    Filter latihan berdasarkan facet, contoh: /filter?level=beginner&primaryMuscles=abdominals
+    Beberapa nilai dalam satu facet dipisah koma (OR); antar facet digabung dengan 'op' (and/or).
+    """
+    operator = request.args.get('op', 'and').strip().lower()
+    if operator not in ('and', 'or'):
+        return jsonify({"message": "Parameter 'op' must be 'and' or 'or'."}), 400
+
+    selections = {}
+    for facet in FACETS:
+        values = split_param(request.args.getlist(facet))
+        if values:
+            selections[facet] = values
+
+    try:
+        exercises, counts = g.snapshot.index.facets.filter(selections, operator)
+        return jsonify({
+            "filters": selections,
+            "op": operator,
+            "total": len(exercises),
+            "exercises": exercises,
+            "facets": counts,
+        }), 200
+    except Exception as e:
+        print(f"Error in filter_exercises: {e}")
+        return jsonify({"message": "Internal server error."}), 500
+
+
 @app.route('/list_all', methods=['GET'])
 def list_all_exercises():
-    """Mengembalikan semua folder latihan yang ada di direktori exercises."""
+    """
+    Mengembalikan semua latihan yang ada di katalog.
+
+    Tanpa parameter, respons {"exercises": [id, ...]} dikirim dari versi yang sudah dikompres.
+    - fields=name,level,equipment: setiap latihan dikirim sebagai object berisi field tersebut
+    - limit dan cursor: pagination, cursor berikutnya ada di 'next_cursor'
+    - format=ndjson: satu record JSON per baris, dikirim secara streaming
+    """
+    if not any(key in request.args for key in ('fields', 'limit', 'cursor', 'format')):
+        return precompressed_response(g.snapshot.list_all)
+
+    fields = split_param(request.args.getlist('fields'))
+    output_format = request.args.get('format', 'json').strip().lower()
+    try:
+        limit = int_param('limit')
+    except ValueError:
+        return jsonify({"message": "'limit' must be an integer."}), 400
+    start = decode_cursor(request.args['cursor']) if 'cursor' in request.args else 0
+
+    if output_format not in ('json', 'ndjson'):
+        return jsonify({"message": "Parameter 'format' must be 'json' or 'ndjson'."}), 400
+    if start is None:
+        return jsonify({"message": "Invalid 'cursor'."}), 400
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({"message": f"'limit' must be between 1 and {MAX_PAGE_SIZE}."}), 400
+
     try:
-        # Daftar semua folder di dalam EXERCISES_FOLDER
-        folders = [
-            folder_name for folder_name in os.listdir(EXERCISES_FOLDER)
-            if os.path.isdir(os.path.join(EXERCISES_FOLDER, folder_name))
-        ]
-        return jsonify({"exercises": folders}), 200
+        index = g.snapshot.index
+        if limit is None:
+            limit = DEFAULT_PAGE_SIZE if output_format == 'json' else len(index.ids)
+        page_ids = index.ids[start:start + limit]
+        end = start + len(page_ids)
+        next_cursor = encode_cursor(end) if end < len(index.ids) else None
+
+        if output_format == 'ndjson':
+            def generate():
+                for exercise_id in page_ids:
+                    yield json.dumps(project(index.records[exercise_id], fields)) + '\n'
+
+            response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+            if next_cursor:
+                response.headers['X-Next-Cursor'] = next_cursor
+            return response
+
+        if fields:
+            exercises = [project(index.records[exercise_id], fields) for exercise_id in page_ids]
+        else:
+            exercises = page_ids
+        return jsonify({"exercises": exercises, "total": len(index.ids), "next_cursor": next_cursor}), 200
     except Exception as e:
         return jsonify({"message": f"Error occurred: {str(e)}"}), 500
 
 
-@app.route('/exercises/<exercise_name>', methods=['GET'])
-def get_exercise_details(exercise_name):
-    # Menangani kasus huruf kapital yang tidak konsisten
-    exercise_name = exercise_name.strip().lower()
+def precompressed_response(payload):
+    """Respons dari PrecompressedJSON, dipilih sesuai Accept-Encoding tanpa serialisasi ulang."""
+    encoding, body = payload.select(request.accept_encodings)
+
+    response = Response(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        # Setiap encoding adalah representasi berbeda, jadi ETag-nya juga dibedakan
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f"{payload.etag}-{encoding}")
+    else:
+        response.set_etag(payload.etag)
+    return response.make_conditional(request)
 
-    try:
-        # Menentukan path folder latihan
-        exercise_folder = os.path.join(EXERCISES_FOLDER, exercise_name)
 
-        # Memeriksa apakah folder latihan ada
-        if os.path.exists(exercise_folder) and os.path.isdir(exercise_folder):
-            exercise_details = get_exercise_json(exercise_folder)
+@app.route('/exercises/batch', methods=['GET', 'POST'])
+def get_exercises_batch():
+    """
+    Mengambil detail banyak latihan dalam satu request.
+    GET /exercises/batch?ids=Air_Bike,Arm_Circles&fields=name,level
+    POST /exercises/batch dengan body {"ids": [...], "fields": [...]}
+    """
+    if request.method == 'POST':
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict) or not is_string_list(body.get('ids')):
+            return jsonify({"message": "Body must be a JSON object with an 'ids' list of strings."}), 400
+        fields = body.get('fields')
+        if fields is None:
+            fields = []
+        elif not is_string_list(fields):
+            return jsonify({"message": "'fields' must be a list of strings."}), 400
+        ids = body['ids']
+    else:
+        ids = split_param(request.args.getlist('ids'))
+        fields = split_param(request.args.getlist('fields'))
 
-            if exercise_details:
-                return jsonify(exercise_details), 200
+    if not ids:
+        return jsonify({"message": "At least one id is required."}), 400
+    if len(ids) > MAX_BATCH_SIZE:
+        return jsonify({"message": f"At most {MAX_BATCH_SIZE} ids per request."}), 400
+
+    try:
+        index = g.snapshot.index
+        items = []
+        missing = []
+        for requested in ids:
+            exercise_id = index.resolve(requested)
+            if exercise_id:
+                items.append({
+                    "requested": requested,
+                    "found": True,
+                    "exercise": project(index.records[exercise_id], fields),
+                })
             else:
-                return jsonify({"message": "Exercise details not found."}), 404
+                items.append({"requested": requested, "found": False, "message": "Exercise not found."})
+                missing.append(requested)
+
+        return jsonify({"items": items, "missing": missing}), 200
+    except Exception as e:
+        print(f"Error in get_exercises_batch: {e}")
+        return jsonify({"message": "Internal server error."}), 500
+
+
+@app.route('/exercises/<exercise_name>', methods=['GET'])
+def get_exercise_details(exercise_name):
+    try:
+        # Nama dicocokkan tanpa peka huruf besar/kecil ke id folder (PascalCase)
+        exercise_details = g.snapshot.index.get(exercise_name)
+
+        if exercise_details:
+            return jsonify(exercise_details), 200
         else:
             return jsonify({"message": "Exercise not found."}), 404
     except Exception as e:
@@ -87,27 +410,177 @@ def get_exercise_details(exercise_name):
         return jsonify({"message": "Internal server error."}), 500
 
 
+def parse_image_variant():
+    """
+    Membaca parameter w (lebar), q (kualitas) dan fmt (format) untuk varian gambar.
+    Mengembalikan (None, None) jika tidak ada parameter varian, atau (None, pesan error).
+    """
+    if not any(key in request.args for key in ('w', 'q', 'fmt')):
+        return None, None
+
+    fmt = request.args.get('fmt', 'jpeg').strip().lower()
+    fmt = 'jpeg' if fmt == 'jpg' else fmt
+
+    try:
+        width = int_param('w')
+        quality = int_param('q', thumbnails.DEFAULT_QUALITY)
+    except ValueError:
+        return None, "'w' and 'q' must be integers."
+
+    if width is not None and not thumbnails.MIN_WIDTH <= width <= thumbnails.MAX_WIDTH:
+        return None, f"'w' must be between {thumbnails.MIN_WIDTH} and {thumbnails.MAX_WIDTH}."
+    if not 1 <= quality <= 95:
+        return None, "'q' must be between 1 and 95."
+    if fmt not in thumbnails.FORMATS:
+        return None, f"'fmt' must be one of: {', '.join(sorted(thumbnails.FORMATS))}."
+    return (width, quality, fmt), None
+
+
+@app.route('/exercises/<exercise_name>/similar', methods=['GET'])
+def get_similar_exercises(exercise_name):
+    """
+    Latihan paling mirip (alternatif), contoh:
+    /exercises/Barbell_Squat/similar?k=5&same=primaryMuscles&equipment=body only
+    'same' berisi facet yang harus sama dengan latihan acuan; facet lain sebagai parameter
+    menjadi filter seperti di /filter.
+    """
+    try:
+        k = int_param('k', similarity.DEFAULT_K)
+    except ValueError:
+        return jsonify({"message": "'k' must be an integer."}), 400
+    if not 1 <= k <= similarity.MAX_K:
+        return jsonify({"message": f"'k' must be between 1 and {similarity.MAX_K}."}), 400
+
+    same = split_param(request.args.getlist('same'))
+    unknown = [facet for facet in same if facet not in similarity.FACET_FEATURES]
+    if unknown:
+        return jsonify({"message": f"'same' must be among: {', '.join(similarity.FACET_FEATURES)}."}), 400
+
+    filters = {}
+    for facet in similarity.FACET_FEATURES:
+        values = split_param(request.args.getlist(facet))
+        if values:
+            filters[facet] = values
+
+    try:
+        index = g.snapshot.index
+        exercise_id = index.resolve(exercise_name)
+        if not exercise_id:
+            return jsonify({"message": "Exercise not found."}), 404
+
+        results = []
+        for similar_id, score in g.snapshot.similarity.get().similar(exercise_id, k, same, filters):
+            record = index.clean_records[similar_id]
+            results.append({
+                "id": similar_id,
+                "name": record["name"],
+                "score": round(score, 4),
+                "equipment": record.get("equipment"),
+                "primaryMuscles": record.get("primaryMuscles"),
+            })
+
+        return jsonify({
+            "exercise": exercise_id,
+            "k": k,
+            "same": same,
+            "filters": filters,
+            "results": results,
+        }), 200
+    except Exception as e:
+        print(f"Error in get_similar_exercises: {e}")
+        return jsonify({"message": "Internal server error."}), 500
+
+
 @app.route('/exercises/<exercise_name>/images/<image_number>.jpg', methods=['GET'])
 def get_exercise_image(exercise_name, image_number):
-    """Endpoint untuk mengambil gambar latihan (0.jpg atau 1.jpg)."""
+    """
+    Endpoint untuk mengambil gambar latihan (0.jpg atau 1.jpg).
+    Opsional: ?w=320&q=80&fmt=webp untuk varian yang lebih kecil.
+    """
+    variant, error = parse_image_variant()
+    if error:
+        return jsonify({"message": error}), 400
+    if variant and not thumbnails.PIL_AVAILABLE:
+        return jsonify({"message": "Image variants are not available on this server."}), 501
+
     try:
         # Pastikan nama latihan dan nomor gambar valid
-        exercise_name = exercise_name.strip().lower()
+        index = g.snapshot.index
+        exercise_id = index.resolve(exercise_name)
         image_name = f"{image_number}.jpg"
 
-        # Menentukan path gambar latihan
-        image_path = os.path.join(EXERCISES_FOLDER, exercise_name, image_name)
-
-        # Memeriksa apakah gambar ada
-        if os.path.exists(image_path):
-            return send_from_directory(os.path.join(EXERCISES_FOLDER, exercise_name), image_name)
-        else:
+        # Gambar hanya dilayani jika terdaftar di record latihan
+        image_path = index.image_path(exercise_id, image_name) if exercise_id else None
+        if not image_path:
             return jsonify({"message": "Image not found."}), 404
+
+        mimetype = 'image/jpeg'
+        source_path = image_path
+        if variant:
+            width, quality, fmt = variant
+            # Satu stat (mtime sumber) untuk kunci varian; keberadaan file varian baru dicek
+            # di disk jika belum ada di cache memori
+            image_path = thumbnails.derivative_path(source_path, width, quality, fmt)
+            mimetype = thumbnails.FORMATS[fmt][1]
+
+        cached = IMAGE_CACHE.lookup(image_path)
+        if cached is None:
+            if variant:
+                thumbnails.ensure_derivative(source_path, image_path, width, quality, fmt)
+            cached = IMAGE_CACHE.load(image_path)
+        response = Response(cached.data, mimetype=mimetype)
+        response.set_etag(cached.etag)
+        response.last_modified = cached.mtime
+        response.cache_control.public = True
+        response.cache_control.max_age = IMAGE_MAX_AGE
+
+        # Menangani If-None-Match / If-Modified-Since (304) dan Range (206)
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(cached.data))
+    except RequestedRangeNotSatisfiable:
+        # Range di luar ukuran file: 416 dengan ukuran lengkap di Content-Range
+        response = jsonify({"message": "Requested range not satisfiable."})
+        response.status_code = 416
+        response.headers['Content-Range'] = f"bytes */{len(cached.data)}"
+        return response
+    except HTTPException as e:
+        return e
     except Exception as e:
         print(f"Error in get_exercise_image: {e}")
         return jsonify({"message": "Internal server error."}), 500
 
 
+@app.route('/stats', methods=['GET'])
+def get_catalog_stats():
+    """
+    Statistik agregat katalog: value counts, distribusi per facet dan tabulasi silang
+    category x level / category x equipment, dihitung sekali per generation katalog.
+    """
+    try:
+        return precompressed_response(g.snapshot.stats)
+    except Exception as e:
+        print(f"Error in get_catalog_stats: {e}")
+        return jsonify({"message": "Internal server error."}), 500
+
+
+@app.route('/cache_stats', methods=['GET'])
+def get_cache_stats():
+    """Statistik hit/miss cache untuk menentukan ukuran cache yang tepat."""
+    return jsonify({
+        "catalog": {"generation": g.snapshot.generation, "exercises": len(g.snapshot.index)},
+        "images": IMAGE_CACHE.stats(),
+    }), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Latensi, jumlah request/error, byte terkirim dan statistik cache dalam format Prometheus."""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+
 if __name__ == '__main__':
+    # Dengan debug=True, aplikasi berjalan di proses anak reloader werkzeug (WERKZEUG_RUN_MAIN)
+    if LIVE_RELOAD and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_watcher()
+
     # Menjalankan aplikasi Flask
     app.run(debug=True)
@@ -0,0 +1,100 @@
+"""
+Client HTTP bersama untuk API latihan: koneksi dipakai ulang (pool), timeout dan retry,
+serta cache katalog per proses yang divalidasi ulang dengan ETag/If-None-Match.
+
+Halaman chat membaca data latihan dari dataset lokal. Katalog API hanya dipakai untuk
+mengetahui gambar mana yang bisa dimuat browser, jadi API yang mati tidak menghentikan chat.
+"""
+import os
+import time
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+API_BASE_URL = os.environ.get('GOGYM_API_URL', 'http://127.0.0.1:5000').rstrip('/')
+
+# (connect, read) dalam detik
+DEFAULT_TIMEOUT = (2.0, 10.0)
+
+# Retry untuk GET saat koneksi gagal atau server sedang restart
+DEFAULT_RETRIES = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({'GET', 'HEAD'}),
+    raise_on_status=False,
+)
+
+# Selama rentang ini katalog di memori (atau status API tidak bisa dihubungi) dipakai
+# tanpa request sama sekali
+CATALOG_REVALIDATE_SECONDS = float(os.environ.get('GOGYM_CATALOG_REVALIDATE_SECONDS', '60'))
+
+API_FETCH_LATENCY = metrics.REGISTRY.histogram(
+    'gogym_chat_api_fetch_seconds', 'Latency of requests from the chat page to the exercise API.', ('endpoint', 'status')
+)
+
+
+class ApiClient:
+    def __init__(self, base_url=API_BASE_URL, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, pool_size=10):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def image_url(self, exercise_id, image_number=0):
+        return self.url(f"/exercises/{exercise_id}/images/{image_number}.jpg")
+
+    def get(self, path, **kwargs):
+        """GET lewat session bersama; latensi dicatat per endpoint dan status."""
+        started = time.perf_counter()
+        try:
+            response = self.session.get(self.url(path), timeout=self.timeout, **kwargs)
+        except requests.exceptions.RequestException:
+            API_FETCH_LATENCY.observe(time.perf_counter() - started, path, 'error')
+            raise
+        API_FETCH_LATENCY.observe(time.perf_counter() - started, path, str(response.status_code))
+        return response
+
+
+class CatalogCache:
+    """
+    Daftar id latihan dari /list_all yang disimpan per proses. Setelah revalidate_seconds,
+    request berikutnya mengirim If-None-Match; jawaban 304 cukup memperpanjang masa berlaku.
+    Jika API tidak bisa dihubungi, versi lama tetap dipakai; jika belum pernah berhasil,
+    exercise_ids() mengembalikan None dan percobaan berikutnya baru setelah revalidate_seconds.
+    """
+
+    def __init__(self, client, revalidate_seconds=CATALOG_REVALIDATE_SECONDS):
+        self.client = client
+        self.revalidate_seconds = revalidate_seconds
+        self.ids = None
+        self.etag = None
+        self.checked_at = None
+        self.lock = threading.Lock()
+
+    def exercise_ids(self):
+        """frozenset id latihan yang dilayani API, atau None jika API belum pernah bisa dihubungi."""
+        with self.lock:
+            if self.checked_at is not None and time.monotonic() - self.checked_at < self.revalidate_seconds:
+                return self.ids
+
+            headers = {'If-None-Match': self.etag} if self.etag else {}
+            try:
+                response = self.client.get('/list_all', headers=headers)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                    self.ids = frozenset(response.json()['exercises'])
+                    self.etag = response.headers.get('ETag')
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                print(f"Exercise API unavailable, {'using cached catalog' if self.ids else 'hiding images'}: {e}")
+            self.checked_at = time.monotonic()
+            return self.ids
@@ -0,0 +1,166 @@
+"""
+Mode serving ASGI untuk API latihan (uvicorn + starlette).
+
+Route yang paling sering dipanggil halaman chat (/list_all, /stats, detail latihan dan
+gambar asli) dilayani langsung di event loop; pembacaan gambar yang belum ada di cache
+dijalankan di thread pool sehingga tidak memblokir request lain. Route lain diteruskan
+ke aplikasi Flask di api.py lewat WSGIMiddleware, jadi perilakunya tetap sama.
+
+    python asgi.py --workers 4 --port 8000
+    uvicorn asgi:app --workers 4 --port 8000
+"""
+import re
+import os
+import time
+import argparse
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from uvicorn.middleware.wsgi import WSGIMiddleware
+from werkzeug.http import http_date, parse_accept_header, parse_date, parse_etags
+
+import api
+
+# Ukuran thread pool untuk route Flask yang diteruskan
+WSGI_WORKERS = int(os.environ.get('GOGYM_ASGI_WSGI_THREADS', '16'))
+
+FLASK_APP = WSGIMiddleware(api.app, workers=WSGI_WORKERS)
+
+
+def is_not_modified(request, etag, last_modified=None):
+    """Evaluasi If-None-Match (diutamakan) dan If-Modified-Since seperti make_conditional di Flask."""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        return parse_etags(if_none_match).contains_weak(etag)
+    since = parse_date(request.headers.get('if-modified-since'))
+    return since is not None and last_modified is not None and int(last_modified) <= since.timestamp()
+
+
+def not_modified_response(headers):
+    return Response(status_code=304, headers=headers)
+
+
+def precompressed_response(request, payload, generation):
+    """Versi async dari api.precompressed_response."""
+    encoding, body = payload.select(parse_accept_header(request.headers.get('accept-encoding')))
+    etag = f"{payload.etag}-{encoding}" if encoding else payload.etag
+    headers = {'ETag': f'"{etag}"', 'Vary': 'Accept-Encoding', 'X-Catalog-Generation': str(generation)}
+    if is_not_modified(request, etag):
+        return not_modified_response(headers)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, media_type='application/json', headers=headers)
+
+
+async def list_all(request, snapshot):
+    # Pagination, projection dan NDJSON tetap ditangani Flask
+    if request.query_params:
+        return None
+    return precompressed_response(request, snapshot.list_all, snapshot.generation)
+
+
+async def stats(request, snapshot):
+    return precompressed_response(request, snapshot.stats, snapshot.generation)
+
+
+async def exercise_details(request, snapshot, exercise_name):
+    exercise_details = snapshot.index.get(exercise_name)
+    headers = {'X-Catalog-Generation': str(snapshot.generation)}
+    if exercise_details:
+        return JSONResponse(exercise_details, headers=headers)
+    return JSONResponse({"message": "Exercise not found."}, status_code=404, headers=headers)
+
+
+async def exercise_image(request, snapshot, exercise_name, image_number):
+    # Varian (w/q/fmt) dan request Range jarang dipakai, jadi diteruskan ke Flask
+    if request.query_params or 'range' in request.headers:
+        return None
+
+    exercise_id = snapshot.index.resolve(exercise_name)
+    image_path = snapshot.index.image_path(exercise_id, f"{image_number}.jpg") if exercise_id else None
+    if not image_path:
+        return JSONResponse({"message": "Image not found."}, status_code=404)
+
+    cached = api.IMAGE_CACHE.lookup(image_path)
+    if cached is None:
+        try:
+            cached = await anyio.to_thread.run_sync(api.IMAGE_CACHE.load, image_path)
+        except OSError as e:
+            print(f"Error in exercise_image: {e}")
+            return JSONResponse({"message": "Internal server error."}, status_code=500)
+
+    headers = {
+        'ETag': f'"{cached.etag}"',
+        'Last-Modified': http_date(cached.mtime),
+        'Cache-Control': f"public, max-age={api.IMAGE_MAX_AGE}",
+        'Accept-Ranges': 'bytes',
+        'X-Catalog-Generation': str(snapshot.generation),
+    }
+    if is_not_modified(request, cached.etag, cached.mtime):
+        return not_modified_response(headers)
+    return Response(cached.data, media_type='image/jpeg', headers=headers)
+
+
+# (pola path, nama route seperti di Flask untuk metrik, handler);
+# handler mengembalikan None untuk meneruskan request ke Flask
+ROUTES = (
+    (re.compile(r'^/list_all$'), '/list_all', list_all),
+    (re.compile(r'^/stats$'), '/stats', stats),
+    (
+        re.compile(r'^/exercises/(?P<exercise_name>[^/]+)/images/(?P<image_number>[^/]+)\.jpg$'),
+        '/exercises/<exercise_name>/images/<image_number>.jpg',
+        exercise_image,
+    ),
+    (re.compile(r'^/exercises/(?!batch$)(?P<exercise_name>[^/]+)$'), '/exercises/<exercise_name>', exercise_details),
+)
+
+
+async def lifespan(receive, send):
+    watcher = None
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            if api.LIVE_RELOAD:
+                watcher = api.start_watcher()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if watcher is not None:
+                watcher.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+
+    if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+        for pattern, route, handler in ROUTES:
+            match = pattern.match(scope['path'])
+            if match:
+                started = time.perf_counter()
+                # Snapshot dipilih sekali per request, sama seperti g.snapshot di api.py
+                response = await handler(Request(scope, receive), api.SNAPSHOT, **match.groupdict())
+                if response is not None:
+                    await response(scope, receive, send)
+                    duration = time.perf_counter() - started
+                    api.record_request(route, scope['method'], response.status_code, duration, len(response.body))
+                    return
+                break
+
+    await FLASK_APP(scope, receive, send)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the exercise API with uvicorn.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('GOGYM_ASGI_WORKERS', '1')))
+    args = parser.parse_args()
+
+    # Setiap worker memuat artifact dataset (python dataset_artifact.py) saat start,
+    # sehingga semua worker melayani data dengan content hash yang sama
+    uvicorn.run('asgi:app', host=args.host, port=args.port, workers=args.workers, log_level='warning')
@@ -0,0 +1,334 @@
+"""
+Benchmark API, pipeline chat (tanpa LLM sungguhan) dan persiapan data EDA pada katalog
+berukuran 1x, 10x dan 100x (latihan sintetis hasil salinan katalog asli).
+
+    python bench.py --output bench/baseline.json
+    python bench.py --scales 1 10 --iterations 200 --output bench/after.json
+    python bench.py --url http://127.0.0.1:8000 --output bench/after.json   # + load generator
+    python bench.py --compare bench/baseline.json bench/after.json --threshold 0.15
+
+Mode compare keluar dengan status 1 jika ada regresi di atas threshold.
+"""
+import gc
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+import subprocess
+from urllib.parse import quote
+
+import pandas as pd
+from langchain.chains import LLMChain
+from langchain.prompts import PromptTemplate
+
+import api
+import loadgen
+from chatme import CACHE_HISTORY_WINDOW, PROMPT_TEMPLATE, SAMPLE_QUESTION, local_answer
+from cleaning import clean_record
+from dataset import clean_dataframe
+from exercise_index import ExerciseIndex, load_records
+from history import HistoryManager, count_tokens
+from intent import HOW_TO_PATTERN, IntentClassifier
+from llm_cache import make_key
+from name_matcher import NameMatcher
+from planner import WorkoutPlanner
+from retrieval import DEFAULT_K, ExerciseRetriever
+from stats import CatalogStats
+from streaming import StreamHandler
+from tests.fakes import FakeStreamingLLM
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_ITERATIONS = 300
+
+# tracemalloc memperlambat kode, jadi peak memory diukur di putaran terpisah yang lebih pendek
+MEMORY_ITERATIONS = 20
+
+# Metrik yang dibandingkan: nama -> arah yang lebih baik
+COMPARED_METRICS = {
+    "p50_ms": "lower",
+    "p95_ms": "lower",
+    "p99_ms": "lower",
+    "throughput_per_s": "higher",
+    "peak_kib": "lower",
+}
+
+QUESTIONS = (
+    "Give me a 4 week beginner plan with dumbbells",
+    "How to do barbell squats?",
+    "I don't have any equipment, give me a 2 week training session that suits me!",
+    "best hamstring stretch for runners",
+    "Provide cardio training sessions for a month!",
+    "How can I make pushups harder?",
+    "Is it okay to train abs every day?",
+    "3+3",
+    "list beginner chest exercises",
+)
+
+SEARCH_QUERIES = ("hamstring stretch", "barbell squat", "dumbell curl", "kettlebell swing", "chest press machine")
+
+
+def synthetic_records(records, scale):
+    """Katalog asli ditambah (scale - 1) salinan dengan id dan nama unik."""
+    result = list(records)
+    for copy in range(1, scale):
+        for record in records:
+            clone = dict(record)
+            clone['id'] = f"{record['id']}_v{copy}"
+            clone['name'] = f"{record['name']} V{copy}"
+            clone['images'] = [f"{clone['id']}/{image.split('/')[-1]}" for image in record.get('images', [])]
+            result.append(clone)
+    return result
+
+
+def summarize(latencies, peak_bytes):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "count": len(latencies),
+        "total_s": round(total, 4),
+        "throughput_per_s": round(len(latencies) / total, 1) if total else 0.0,
+        "p50_ms": round(loadgen.percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(loadgen.percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(loadgen.percentile(latencies, 0.99) * 1000, 3),
+        "peak_kib": round(peak_bytes / 1024, 1),
+    }
+
+
+def measure(func, iterations):
+    """Menjalankan func(i) sebanyak iterations kali; latensi per panggilan dan peak memory."""
+    gc.collect()
+    latencies = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    for i in range(min(iterations, MEMORY_ITERATIONS)):
+        func(i)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return summarize(latencies, peak)
+
+
+def measure_once(func):
+    """Untuk operasi mahal (build index, pembersihan penuh): satu kali, dengan peak memory."""
+    gc.collect()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return summarize([elapsed], peak)
+
+
+def api_scenarios(records):
+    """(nama, path per iterasi, header) untuk route API."""
+    real_ids = [record['id'] for record in records if '_v' not in record['id']]
+    return (
+        ("search_q", lambda i: f"/search?q={quote(SEARCH_QUERIES[i % len(SEARCH_QUERIES)])}", {}),
+        ("search_substring", lambda i: "/search?exercise=curl", {}),
+        ("list_all", lambda i: "/list_all", {'Accept-Encoding': 'gzip'}),
+        ("list_all_page", lambda i: f"/list_all?fields=name,level&limit=100&cursor={api.encode_cursor(i * 100 % len(records))}", {}),
+        ("exercise_details", lambda i: f"/exercises/{records[i * 7919 % len(records)]['id']}", {}),
+        ("image", lambda i: f"/exercises/{real_ids[i * 31 % len(real_ids)]}/images/{i % 2}.jpg", {}),
+        ("filter", lambda i: "/filter?level=beginner&equipment=dumbbell,barbell", {}),
+    )
+
+
+def bench_api(records, iterations):
+    """Route Flask lewat test client, dengan snapshot katalog sintetis."""
+    results = {"index_build": measure_once(lambda: ExerciseIndex(records))}
+    api.SNAPSHOT = api.CatalogSnapshot(ExerciseIndex(records))
+    api.IMAGE_CACHE.clear()
+    client = api.app.test_client()
+
+    for name, path, headers in api_scenarios(records):
+        def request(i, path=path, headers=headers):
+            response = client.get(path(i), headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path(i)} returned {response.status_code}")
+        results[name] = measure(request, iterations)
+    return results
+
+
+class NullPlaceholder:
+    """Pengganti st.empty() untuk StreamHandler."""
+
+    def markdown(self, text):
+        pass
+
+
+def bench_chat(records, iterations):
+    """
+    Satu giliran chat seperti di chatme.run(): klasifikasi intent dan jawaban lokal
+    (chatme.local_answer: penolakan, how-to, daftar latihan, planner), lalu untuk sisanya
+    LLM palsu yang men-stream jawaban tetap: konteks riwayat, retrieval, kunci cache,
+    prompt, stream, pencocokan nama dan riwayat.
+    """
+    clean = [clean_record(record) for record in records]
+    retriever = ExerciseRetriever(ExerciseIndex(clean))
+    index = retriever.index
+    results = {"matcher_build": measure_once(lambda: NameMatcher(clean))}
+    matcher = NameMatcher(clean)
+    results["classifier_build"] = measure_once(lambda: IntentClassifier(index.records.values(), matcher, index.search))
+    classifier = IntentClassifier(index.records.values(), matcher, index.search)
+    planner = WorkoutPlanner(index)
+
+    names = [record['name'] for record in clean[:12]]
+    answer = "\n".join(f"Day {day}: {names[day]} 3x12, {names[day + 5]} 3x10" for day in range(1, 6))
+    llm_prompt = PromptTemplate(template=PROMPT_TEMPLATE, input_variables=["question", "sample", "exercises"])
+    llm_chain = LLMChain(llm=FakeStreamingLLM(responses=[answer]), prompt=llm_prompt)
+    history = HistoryManager()
+    historical = []
+
+    def turn(i):
+        question = QUESTIONS[i % len(QUESTIONS)]
+        intent = classifier.classify(question)
+        response, _ = local_answer(question, intent, index, planner)
+
+        if response is None:
+            full_question = f"{history.context()}\nUser: {question}\nAI:"
+            previous_questions = [entry for role, entry in historical if role == "user"]
+            retrieved = retriever.retrieve(" ".join(previous_questions[-1:] + [question]), k=DEFAULT_K)
+            chain_inputs = {
+                "question": full_question,
+                "sample": SAMPLE_QUESTION,
+                "exercises": retriever.format_context(retrieved),
+            }
+            make_key(question, [entry for _, entry in historical[-CACHE_HISTORY_WINDOW:]], "bench", "fake", k=DEFAULT_K)
+            count_tokens(llm_prompt.format(**chain_inputs))
+
+        history.add("user", question)
+
+        if response is None:
+            handler = StreamHandler(NullPlaceholder())
+            response = llm_chain.run(chain_inputs, callbacks=[handler])
+            handler.finish(response)
+            if intent.exercise_id is None and HOW_TO_PATTERN.search(question.lower()):
+                matcher.best_match(response)
+        if intent.exercise_id is None:
+            matcher.find_all(response)
+
+        history.add("assistant", response)
+        historical.extend((("user", question), ("assistant", response)))
+
+    results["turn"] = measure(turn, iterations)
+    return results
+
+
+def bench_eda(records):
+    """Persiapan data halaman EDA tanpa memo: pembersihan DataFrame dan statistik untuk figure."""
+    return {
+        "clean_dataframe": measure_once(lambda: clean_dataframe(pd.DataFrame(records))),
+        "catalog_stats": measure_once(lambda: CatalogStats(records).to_dict()),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales=DEFAULT_SCALES, iterations=DEFAULT_ITERATIONS, url=None):
+    base_records = load_records()
+    results = {}
+    for scale in scales:
+        records = synthetic_records(base_records, scale)
+        print(f"Scale {scale}x ({len(records)} exercises)")
+        groups = {
+            "api": bench_api(records, iterations),
+            "chat": bench_chat(records, iterations),
+            "eda": bench_eda(records),
+        }
+        for group, group_results in groups.items():
+            for name, metrics in group_results.items():
+                results[f"{group}.{name}@{scale}x"] = metrics
+
+    if url:
+        # Server eksternal memakai katalognya sendiri, jadi tidak diberi label skala
+        summary = loadgen.run(url, concurrency=16, duration=10)
+        results["loadgen.chat_page"] = {
+            "count": summary["requests"],
+            "throughput_per_s": summary["throughput_rps"],
+            "p50_ms": summary["p50_ms"],
+            "p95_ms": summary["p95_ms"],
+            "p99_ms": summary["p99_ms"],
+        }
+
+    return {
+        "meta": {
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scales": list(scales),
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """List (benchmark, metrik, nilai lama, nilai baru, perubahan relatif) yang memburuk melebihi threshold."""
+    regressions = []
+    for name, metrics in current["results"].items():
+        old_metrics = baseline["results"].get(name)
+        if not old_metrics:
+            continue
+        for metric, better in COMPARED_METRICS.items():
+            old, new = old_metrics.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (better == "lower" and change > threshold) or (better == "higher" and change < -threshold):
+                regressions.append((name, metric, old, new, change))
+    return regressions
+
+
+def print_table(report):
+    print(f"{'benchmark':45} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'per s':>10} {'peak KiB':>10}")
+    for name, metrics in report["results"].items():
+        print(
+            f"{name:45} {metrics['p50_ms']:>10} {metrics['p95_ms']:>10} {metrics['p99_ms']:>10} "
+            f"{metrics['throughput_per_s']:>10} {metrics.get('peak_kib', '-'):>10}"
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the API, chat pipeline and EDA data prep.")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES))
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--url', help="also run the load generator against a running server")
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'))
+    parser.add_argument('--threshold', type=float, default=0.15, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as f:
+            baseline_report = json.load(f)
+        with open(args.compare[1], 'r', encoding='utf-8') as f:
+            current_report = json.load(f)
+        found = compare(baseline_report, current_report, args.threshold)
+        for name, metric, old, new, change in found:
+            print(f"REGRESSION {name} {metric}: {old} -> {new} ({change:+.1%})")
+        print(f"{len(found)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1 if found else 0)
+
+    report = run(args.scales, args.iterations, args.url)
+    print_table(report)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
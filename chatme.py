@@ -1,51 +1,51 @@
+import os
+import time
 import streamlit as st
-import requests
+import hashlib
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from langchain.chat_models import ChatOpenAI
 
-def run():
-    # Judul aplikasi
-    st.title("GoGym: Workout Recommender 🤖")
-    st.write(
-        """
-        Your intelligent fitness companion for personalized workout plans and weekly gym schedules. 
-        Just type your fitness goals, level, or specific preferences, and let the AI handle the rest.
-        """
-    )
-    # Membuat garis pemisah
-    st.markdown("---")
-    
-    # Inisialisasi OpenAI Chat Model
-    try:
-        # Set API Key
-        api_key = st.secrets["OPENAI_API_KEY"]
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-    except Exception as e:
-        st.error(f"Error initializing the AI model: {e}")
-        st.stop()
+from retrieval import ExerciseRetriever, DEFAULT_K
+from exercise_index import ExerciseIndex
+from dataset import load_clean_records
+from llm_cache import ResponseCache, make_key
+from history import HistoryManager, count_tokens
+from streaming import StreamHandler
+from name_matcher import NameMatcher
+from api_client import ApiClient, CatalogCache
+from planner import WorkoutPlanner
+from intent import IntentClassifier, OUT_OF_SCOPE, HOW_TO, FACET_LOOKUP, HOW_TO_PATTERN
+import metrics
 
-    # Get exercises data via API
-    try:
-        api_url = "http://127.0.0.1:5000/list_all"  # API endpoint for exercises list
-        response = requests.get(api_url)
-    
-        if response.status_code == 200:
-            data = response.json()  # Assumes the API returns a JSON with exercises data
-            exercises = data['exercises']  # Extract the exercise names
-        else:
-            st.error(f"Failed to retrieve data from API. Status code: {response.status_code}")
-            st.stop()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching data from the API: {e}")
-        st.stop()
+# Jumlah pesan terakhir yang ikut menentukan kunci cache jawaban
+CACHE_HISTORY_WINDOW = 4
+
+# Metrik sisi chat; diekspos di http://127.0.0.1:<GOGYM_CHAT_METRICS_PORT>/metrics jika port diisi
+METRICS_PORT = int(os.environ.get('GOGYM_CHAT_METRICS_PORT', '0'))
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000)
+
+LLM_LATENCY = metrics.REGISTRY.histogram(
+    'gogym_chat_llm_duration_seconds', 'Time to produce an answer, by response cache result.', ('cache',), LLM_BUCKETS
+)
+FIRST_TOKEN_LATENCY = metrics.REGISTRY.histogram(
+    'gogym_chat_llm_first_token_seconds', 'Time until the first streamed token.', (), LLM_BUCKETS
+)
+PROMPT_TOKENS = metrics.REGISTRY.histogram('gogym_chat_prompt_tokens', 'Prompt tokens per turn.', (), TOKEN_BUCKETS)
+COMPLETION_TOKENS = metrics.REGISTRY.histogram('gogym_chat_completion_tokens', 'Answer tokens per turn.', (), TOKEN_BUCKETS)
+TURNS = metrics.REGISTRY.counter('gogym_chat_turns_total', 'Chat turns by outcome.', ('outcome',))
+LOCAL_ANSWER_LATENCY = metrics.REGISTRY.histogram(
+    'gogym_chat_local_answer_seconds', 'Time to answer a turn without the LLM, by source.', ('source',)
+)
+INTENTS = metrics.REGISTRY.counter('gogym_chat_intents_total', 'Chat questions by classified intent.', ('intent',))
 
-    # Prompt for LLM
-    prompt = """
+# Prompt for LLM (di level modul supaya bisa dipakai ulang oleh bench.py)
+PROMPT_TEMPLATE = """
     You are a highly intelligent AI assistant and a fitness expert. 
     Your job is to recommend weekly workout sessions tailored to the user's preferences and goals.
 
-    Use the following list of exercise names:
+    Use the following exercises from our catalog (name and key attributes), selected as the most relevant to the user's question:
     {exercises}
 
     Sample question: {sample}
@@ -65,50 +65,192 @@ def run():
     - Make sure the instructions are clear and easy to follow, ensuring the user understands how to perform the exercise correctly and safely.
     
     If the user asks a question OUTSIDE the scope of exercises and workout plan or if the user asks something that seems like a math question (e.g., "3+3"), respond with: "Sorry, I can only assist with questions related to gym workouts and exercises."
-    Or if the user asks about an exercise not listed in {exercises}, respond with: "Unfortunately, we don't provide information for this exercise."
+    Or if the user asks about an exercise not listed above, respond with: "Unfortunately, we don't provide information for this exercise."
 
     Respond in a friendly and motivational tone.
     """
 
+# Jawaban untuk pertanyaan di luar topik, sama dengan instruksi di prompt
+REFUSAL = "Sorry, I can only assist with questions related to gym workouts and exercises."
+
+# Jumlah latihan yang ditampilkan untuk pertanyaan daftar latihan per facet
+MAX_LOOKUP_RESULTS = 15
+
+# Sample question for context (can be dynamic if needed)
+SAMPLE_QUESTION = "What is a good workout for building strength with dumbbells?"
+
+# Versi template ikut menjadi kunci cache, jadi perubahan prompt otomatis membatalkan cache lama
+PROMPT_VERSION = hashlib.sha1(PROMPT_TEMPLATE.encode('utf-8')).hexdigest()[:12]
+
+
+@st.cache_resource
+def get_llm_chain():
+    """Model, prompt dan chain dibuat sekali per proses; callback streaming diberikan per panggilan."""
+    # Set API Key
+    api_key = st.secrets["OPENAI_API_KEY"]
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7, streaming=True)
+
     # Correctly using the variables `question` and `sample`
     llm_prompt = PromptTemplate(
-        template=prompt,
+        template=PROMPT_TEMPLATE,
         input_variables=["question", "sample", "exercises"]
     )
+    return llm, llm_prompt, LLMChain(llm=llm, prompt=llm_prompt, verbose=True)
+
+
+@st.cache_resource
+def get_api_client():
+    """Client API latihan dengan session (pool koneksi, timeout, retry) bersama untuk semua sesi."""
+    return ApiClient()
+
+
+@st.cache_resource
+def get_catalog_cache():
+    """Katalog id dari API, divalidasi ulang dengan ETag; menentukan gambar mana yang ditampilkan."""
+    return CatalogCache(get_api_client())
+
+
+@st.cache_resource
+def get_retriever():
+    """Index retrieval dibangun sekali per proses dari dataset lokal yang sudah dibersihkan."""
+    return ExerciseRetriever(ExerciseIndex(load_clean_records()))
+
+
+@st.cache_resource
+def get_name_matcher():
+    """Automaton Aho-Corasick atas semua nama latihan, dibangun sekali per proses."""
+    return NameMatcher(get_retriever().index.records.values())
+
+
+@st.cache_resource
+def get_planner():
+    """Perencana lokal memakai index facet yang sama dengan retriever."""
+    return WorkoutPlanner(get_retriever().index)
+
+
+@st.cache_resource
+def get_intent_classifier():
+    """Klasifikasi intent lokal; model naive Bayes dilatih sekali per proses."""
+    index = get_retriever().index
+    return IntentClassifier(index.records.values(), get_name_matcher(), index.search)
+
+
+def how_to_answer(record):
+    """Langkah-langkah latihan langsung dari instructions di katalog."""
+    lines = [
+        f"**How to do {record['name']}**",
+        "",
+        f"Level: {record.get('level')} · Equipment: {record.get('equipment')} · "
+        f"Primary muscles: {', '.join(record.get('primaryMuscles') or [])}",
+        "",
+    ]
+    lines += [f"{step}. {instruction}" for step, instruction in enumerate(record['instructions'], 1)]
+    lines += ["", "Keep every rep controlled and stop if you feel pain. You've got this! 💪"]
+    return "\n".join(lines)
+
+
+def lookup_answer(index, selections):
+    """Daftar latihan yang cocok dengan facet yang disebut, atau None jika tidak ada."""
+    exercise_ids, _ = index.facets.filter(selections)
+    if not exercise_ids:
+        return None
+    filters = "; ".join(f"{facet}: {', '.join(values)}" for facet, values in selections.items())
+    lines = [f"**{len(exercise_ids)} exercises match** ({filters}).", ""]
+    for exercise_id in exercise_ids[:MAX_LOOKUP_RESULTS]:
+        record = index.records[exercise_id]
+        lines.append(f"- {record['name']} ({record.get('equipment')}, {record.get('level')})")
+    if len(exercise_ids) > MAX_LOOKUP_RESULTS:
+        lines += ["", f"Showing the first {MAX_LOOKUP_RESULTS}. Add a level or equipment to narrow the list."]
+    return "\n".join(lines)
+
+
+def local_answer(prompt, intent, index, planner):
+    """(jawaban, sumber) untuk pertanyaan yang tidak butuh LLM, atau (None, None)."""
+    if intent.label == OUT_OF_SCOPE:
+        return REFUSAL, "refusal"
+    if intent.label == HOW_TO and index.records[intent.exercise_id].get('instructions'):
+        return how_to_answer(index.records[intent.exercise_id]), "how_to"
+    if intent.label == FACET_LOOKUP:
+        response = lookup_answer(index, intent.selections)
+        if response:
+            return response, "lookup"
+    plan = planner.plan_for(prompt)
+    if plan is not None:
+        return plan.to_markdown(), "planner"
+    return None, None
+
+
+@st.cache_resource
+def get_metrics_server():
+    """Server /metrics untuk proses Streamlit, dijalankan sekali per proses jika port diatur."""
+    return metrics.serve(METRICS_PORT) if METRICS_PORT else None
+
+
+@st.cache_resource
+def get_response_cache():
+    """Cache jawaban LLM di SQLite lokal, dipakai bersama oleh semua sesi."""
+    cache = ResponseCache()
+    metrics.REGISTRY.gauge(
+        'gogym_chat_response_cache_hit_ratio', 'LLM response cache hit ratio.', lambda: {(): cache.stats()['hit_ratio']}
+    )
+    return cache
+
+
+def run():
+    # Judul aplikasi
+    st.title("GoGym: Workout Recommender 🤖")
+    st.write(
+        """
+        Your intelligent fitness companion for personalized workout plans and weekly gym schedules. 
+        Just type your fitness goals, level, or specific preferences, and let the AI handle the rest.
+        """
+    )
+    # Membuat garis pemisah
+    st.markdown("---")
+    
+    # Inisialisasi OpenAI Chat Model (dibuat sekali per proses)
+    try:
+        llm, llm_prompt, llm_chain = get_llm_chain()
+    except Exception as e:
+        st.error(f"Error initializing the AI model: {e}")
+        st.stop()
+
+    # Data latihan dibaca dari dataset lokal; API hanya untuk gambar yang dimuat browser.
+    # Katalog API di-cache per proses, jadi rerun biasa tidak melakukan request sama sekali
+    api_client = get_api_client()
+    catalog_cache = get_catalog_cache()
+
+    get_metrics_server()
+
+    # Retrieval: hanya latihan yang relevan yang dikirim ke LLM
+    retriever = get_retriever()
+
+    # Pencocokan nama latihan di jawaban AI (automaton dibangun sekali per proses)
+    name_matcher = get_name_matcher()
+    catalog_index = retriever.index
+    catalog = catalog_index.records
+    retrieval_k = st.sidebar.slider("Exercises sent to the AI (k)", min_value=5, max_value=100, value=DEFAULT_K)
+    show_retrieval = st.sidebar.checkbox("Show retrieved exercises")
+    show_cache_stats = st.sidebar.checkbox("Show response cache stats")
+    show_prompt_size = st.sidebar.checkbox("Show prompt size per turn")
+    show_timings = st.sidebar.checkbox("Show response timings")
+    answer_locally = st.sidebar.checkbox("Answer simple questions locally", value=True)
+    planner = get_planner()
+    classifier = get_intent_classifier()
+
+    response_cache = get_response_cache()
 
     # Inisialisasi percakapan
     if "historical" not in st.session_state:
         st.session_state.historical = []
 
-    # LLM Chain
-    llm_chain = LLMChain(llm=llm, prompt=llm_prompt, verbose=True)
-
-    # Sample question for context (can be dynamic if needed)
-    sample_question = "What is a good workout for building strength with dumbbells?"
-    
-    # def extract_exercise_name(response, exercises):
-    #     """
-    #     This function checks if the response contains the name of an exercise from the list
-    #     and returns the name if found. It assumes the exercise name is directly mentioned.
-    #     """
-    #     for exercise in exercises:
-    #         if exercise.lower() in response.lower():
-    #             return exercise
-    #     return None 
-    def extract_exercise_name(response, exercises):
+    def extract_exercise_name(response):
         """
-        This function checks if the response contains the name of an exercise from the list
-        and returns the name if found. It assumes the exercise name is directly mentioned.
+        This function returns the id of the longest exercise name mentioned in the response,
+        or None if no exercise from the catalog is mentioned.
         """
-        # Mengubah nama exercise dalam response dan exercises menjadi PascalCase
-        response_pascal = to_pascal_case(response)
-
-        for exercise in exercises:
-            # Ubah nama exercise dalam daftar menjadi PascalCase
-            exercise_pascal = to_pascal_case(exercise)
-            if exercise_pascal.lower() in response_pascal.lower():
-                return exercise_pascal
-        return None
+        match = name_matcher.best_match(response)
+        return match.id if match else None
 
 
     def display_images(exercise_name):
@@ -116,25 +258,37 @@ def run():
         This function displays images related to a specific exercise.
         It will try to show two images (i=0 and i=1) for the given exercise.
         """
+        served = catalog_cache.exercise_ids()
+        if served is None or exercise_name not in served:
+            st.caption("Exercise images are unavailable right now.")
+            return
         try:
             for i in range(2):  # Two images per exercise (i=0 and i=1)
-                img_url = f"http://127.0.0.1:5000/exercises/{exercise_name}/images/{i}.jpg"
+                img_url = api_client.image_url(exercise_name, i)
                 exercise_name_img = exercise_name.lower()
                 exercise_name_img = exercise_name.replace("_", " ")
                 st.image(img_url, caption=f"Step {i+1} - {exercise_name_img} ", use_column_width=True)
         except Exception as e:
             st.error(f"Error loading images for {exercise_name}: {e}")
-            # Fungsi untuk mengubah string menjadi PascalCase
-    def to_pascal_case(text):
-        words = text.split()  # Pisahkan berdasarkan spasi
-        return '_'.join(word.capitalize() for word in words)  # Gabungkan dan kapitalisasi setiap kata
-  
-    def should_display_images(question):
+
+    def link_mentioned_exercises(response):
         """
-        This function checks if the user's question contains keywords like 'caranya' or 'how to'.
-        If true, images will be displayed.
+        This function lists every exercise mentioned in the response, in order,
+        with a link to its image so the whole plan can be illustrated.
         """
-        return "caranya" in question.lower() or "how to" in question.lower() or "cara" in question.lower()
+        mentioned = []
+        for match in name_matcher.find_all(response):
+            if match.id not in mentioned:
+                mentioned.append(match.id)
+        if len(mentioned) < 2:
+            return
+        served = catalog_cache.exercise_ids() or frozenset()
+        with st.expander(f"Exercises in this answer ({len(mentioned)})"):
+            st.markdown("\n".join(
+                f"- [{catalog[exercise_id]['name']}]({api_client.image_url(exercise_id)})"
+                if exercise_id in served else f"- {catalog[exercise_id]['name']}"
+                for exercise_id in mentioned
+            ))
 
     if "openai_model" not in st.session_state:
         st.session_state["openai_model"] = "gpt-4o-mini"
@@ -142,6 +296,19 @@ def run():
     if "historical" not in st.session_state:
         st.session_state.historical = []
 
+    # Riwayat yang dikirim ke LLM dibatasi budget token; pesan lama diringkas
+    if "history_manager" not in st.session_state:
+        st.session_state.history_manager = HistoryManager()
+        for entry in st.session_state.historical:
+            st.session_state.history_manager.add(entry["role"], entry["message"])
+    history = st.session_state.history_manager
+
+    if "prompt_sizes" not in st.session_state:
+        st.session_state.prompt_sizes = []
+
+    if "turn_timings" not in st.session_state:
+        st.session_state.turn_timings = []
+
     # Display chat messages from history on app rerun
     for message in st.session_state.historical:
         with st.chat_message(message["role"]):
@@ -150,39 +317,107 @@ def run():
     # Tombol submit untuk memulai percakapan
     if prompt := st.chat_input("Enter your fitness-related question here"):
         try:
-            # Generate response based on the question and historical context
-            conversation_context = "\n".join([f"{entry['message']}" for entry in st.session_state.historical])
-            full_question = f"{conversation_context}\nUser: {prompt}\nAI:"
-            
-            # Generate the AI response, passing the fetched exercises data
-            response = llm_chain.run({
-                "question": full_question,
-                "sample": sample_question,
-                "exercises": ", ".join(exercises)  # Pass the exercises list as a string
-            })
-            
-            # Save user input and AI response in historical list
+            # Pertanyaan di luar topik, how-to, daftar latihan dan rencana sederhana dijawab
+            # lokal dalam milidetik; hanya sisanya yang dikirim ke LLM
+            started = time.perf_counter()
+            intent = classifier.classify(prompt)
+            INTENTS.inc(intent.label)
+            local_response, source = local_answer(prompt, intent, catalog_index, planner) if answer_locally else (None, None)
+
+            if local_response is None:
+                # Generate response based on the question and the token-budgeted history
+                conversation_context = history.context()
+                full_question = f"{conversation_context}\nUser: {prompt}\nAI:"
+
+                # Ambil top-k latihan yang relevan; pertanyaan user sebelumnya ikut dipakai untuk pertanyaan lanjutan
+                previous_questions = [entry["message"] for entry in st.session_state.historical if entry["role"] == "user"]
+                retrieval_query = " ".join(previous_questions[-1:] + [prompt])
+                retrieved = retriever.retrieve(retrieval_query, k=retrieval_k)
+                exercises_context = retriever.format_context(retrieved)
+
+                if show_retrieval:
+                    with st.sidebar.expander(f"Retrieved {len(retrieved)} exercises ({len(exercises_context)} chars)", expanded=True):
+                        st.text(exercises_context)
+
+                # Pertanyaan yang sama dengan konteks yang sama dijawab dari cache
+                history_window = [entry["message"] for entry in st.session_state.historical[-CACHE_HISTORY_WINDOW:]]
+                cache_key = make_key(prompt, history_window, PROMPT_VERSION, llm.model_name, k=retrieval_k)
+
+                chain_inputs = {
+                    "question": full_question,
+                    "sample": SAMPLE_QUESTION,
+                    "exercises": exercises_context
+                }
+                prompt_tokens = count_tokens(llm_prompt.format(**chain_inputs))
+
+            # Save user input in historical list and display the user message once
             st.session_state.historical.append({"role": "user", "message": prompt})
-            
-            # Display the user message once
+            history.add("user", prompt)
             with st.chat_message("user"):
                 st.markdown(prompt)
-            
-            # Display the assistant response once
+
+            # Display the assistant response, streamed token by token as it is generated
             with st.chat_message("assistant"):
-                st.markdown(response)
-                
-                # Ubah nama exercise dalam response menjadi PascalCase
-                exercise_name = extract_exercise_name(response, exercises)
-                if exercise_name and should_display_images(prompt):
-                    # Ubah nama exercise yang diekstrak menjadi PascalCase
-                    exercise_name_pascal = to_pascal_case(exercise_name)
-                    display_images(exercise_name_pascal)    
+                if local_response is not None:
+                    response = local_response
+                    st.markdown(response)
+                    cache_hit = False
+                    timings = {"total_time": time.perf_counter() - started, "time_to_first_token": None, "source": source}
+                    st.session_state.turn_timings.append(timings)
+                    LOCAL_ANSWER_LATENCY.observe(timings["total_time"], source)
+                else:
+                    placeholder = st.empty()
+                    stream_handler = StreamHandler(placeholder)
+
+                    # Generate the AI response, passing only the retrieved exercises
+                    response, cache_hit = response_cache.get_or_generate(
+                        cache_key, lambda: llm_chain.run(chain_inputs, callbacks=[stream_handler])
+                    )
+                    timings = stream_handler.finish(response)
+                    timings["cached"] = cache_hit
+                    st.session_state.turn_timings.append(timings)
+
+                    LLM_LATENCY.observe(timings["total_time"], "hit" if cache_hit else "miss")
+                    if timings["time_to_first_token"] is not None:
+                        FIRST_TOKEN_LATENCY.observe(timings["time_to_first_token"])
+                    PROMPT_TOKENS.observe(prompt_tokens)
+                    COMPLETION_TOKENS.observe(count_tokens(response))
+
+                # Nama latihan dan gambar diproses setelah stream selesai; pertanyaan how-to yang
+                # dijawab LLM memakai latihan terpanjang yang disebut di jawaban
+                exercise_name = intent.exercise_id
+                if exercise_name is None and local_response is None and HOW_TO_PATTERN.search(prompt.lower()):
+                    exercise_name = extract_exercise_name(response)
+                if exercise_name:
+                    display_images(exercise_name)
+                elif source != "refusal":
+                    link_mentioned_exercises(response)
 
             # Add assistant response to chat history
             st.session_state.historical.append({"role": "assistant", "message": response})  
+            history.add("assistant", response)
+            if local_response is None:
+                st.session_state.prompt_sizes.append(prompt_tokens)
+
+            if show_prompt_size and local_response is None:
+                st.sidebar.metric("Prompt tokens (this turn)", prompt_tokens)
+                st.sidebar.line_chart(st.session_state.prompt_sizes)
+                st.sidebar.json(history.stats())
+
+            if show_timings:
+                st.sidebar.json(timings)
+
+            if show_cache_stats:
+                if local_response is not None:
+                    st.sidebar.caption(f"Answered locally ({source})")
+                else:
+                    st.sidebar.caption("Answered from cache" if cache_hit else "Answered by the AI model")
+                st.sidebar.json(response_cache.stats())
+
+            TURNS.inc(source if local_response is not None else "ok")
 
         except Exception as e:
+            TURNS.inc("error")
             st.error(f"Error occurred: {e}")
 
 
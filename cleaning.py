@@ -0,0 +1,53 @@
+"""
+Aturan pembersihan dataset latihan tanpa dependensi pandas,
+dipakai oleh pipeline EDA (dataset.py) dan oleh API.
+"""
+import copy
+
+# Nilai 'force' untuk latihan yang kolom force-nya kosong
+FORCE_BY_NAME = {
+    **dict.fromkeys([
+        "Balance Board", "Conan's Wheel", "Farmer's Walk", "Rickshaw Carry", "Lying Prone Quadriceps", "Yoke Walk"
+    ], "static"),
+    **dict.fromkeys([
+        "Bicycling", "Bicycling, Stationary", "Elliptical Trainer", "Jogging, Treadmill", "Push-Up Wide",
+        "Recumbent Bike", "Rope Jumping", "Running, Treadmill", "Skating", "Smith Machine Decline Press",
+        "Stairmaster", "Step Mill", "Trail Running/Walking", "Walking, Treadmill", "Carioca Quick Step",
+        "Inchworm", "Linear Acceleration Wall Drill", "Moving Claw Series"
+    ], "push"),
+    **dict.fromkeys([
+        "Band Assisted Pull-Up", "Incline Inner Biceps Curl", "Internal Rotation with Band", "Rowing, Stationary",
+        "Single Dumbbell Raise"
+    ], "pull"),
+}
+
+# Latihan tanpa equipment di dataset yang sebenarnya hanya memakai berat badan
+BODY_ONLY_NAMES = frozenset([
+    "Ankle Circles", "Ankle On The Knee", "Arm Circles", "Bodyweight Walking Lunge",
+    "Calf Stretch Elbows Against Wall", "Calf Stretch Hands Against Wall", "Cat Stretch",
+    "Chair Lower Back Stretch", "Child's Pose", "Chin To Chest Stretch", "Crossover Reverse Lunge",
+    "Dancer's Stretch", "Decline Push-Up", "Elbow Circles", "Elbows Back", "Groin and Back Stretch",
+    "Hamstring Stretch", "Hug Knees To Chest", "Inverted Row", "Knee Across The Body",
+    "Kneeling Arm Drill", "Kneeling Forearm Stretch", "Kneeling Hip Flexor", "Leg-Up Hamstring Stretch",
+    "Looking At Ceiling", "Middle Back Stretch", "On Your Side Quad Stretch", "One Arm Against Wall",
+    "One Half Locust", "One Knee To Chest", "Overhead Stretch", "Pelvic Tilt Into Bridge",
+    "Prone Manual Hamstring", "Runner's Stretch", "Scapular Pull-Up", "Seated Calf Stretch",
+    "Seated Floor Hamstring Stretch", "Seated Hamstring", "Seated Overhead Stretch", "Shoulder Circles",
+    "Shoulder Raise", "Shoulder Stretch", "Side-Lying Floor Stretch", "Side Lying Groin Stretch",
+    "Side Neck Stretch", "Side Wrist Pull", "Spinal Stretch", "Standing Gastrocnemius Calf Stretch",
+    "Standing Hip Flexors", "Standing Lateral Stretch", "Standing Soleus And Achilles Stretch",
+    "Standing Toe Touches", "The Straddle", "Tricep Side Stretch", "Triceps Stretch",
+    "Upper Back-Leg Grab", "Upper Back Stretch", "Upward Stretch", "Windmills"
+])
+
+
+def clean_record(record):
+    """Mengisi nilai kosong force, equipment dan mechanic untuk satu record (struktur list tetap)."""
+    record = copy.deepcopy(record)
+    if record.get('force') is None:
+        record['force'] = FORCE_BY_NAME.get(record['name'], 'unknown')
+    if record.get('equipment') is None:
+        record['equipment'] = 'body only' if record['name'] in BODY_ONLY_NAMES else 'other'
+    if record.get('mechanic') is None:
+        record['mechanic'] = 'unknown'
+    return record
@@ -0,0 +1,125 @@
+"""
+Pipeline pembersihan dataset latihan yang dipakai bersama oleh halaman EDA dan chat.
+
+Hasil pembersihan di-memo per mtime file sumber (artifact dataset atau exercise.json) dan disimpan sebagai snapshot
+Parquet di .cache/, sehingga pemuatan berikutnya tidak perlu membersihkan ulang.
+"""
+import os
+import hashlib
+
+import pandas as pd
+
+from exercise_index import BASE_DIR, EXERCISE_JSON, ARTIFACT_PATH, dataset_source, load_records
+from dataset_artifact import read_artifact_meta
+from cleaning import FORCE_BY_NAME, BODY_ONLY_NAMES, clean_record
+
+# Naikkan jika aturan pembersihan berubah supaya snapshot lama tidak dipakai
+PIPELINE_VERSION = 1
+
+SNAPSHOT_DIR = os.path.join(BASE_DIR, '.cache')
+
+# Memo hasil pembersihan: (path, mtime_ns) -> DataFrame / list record / versi
+_frames = {}
+_records = {}
+_versions = {}
+
+
+def source_key(path):
+    return path, os.stat(path).st_mtime_ns
+
+
+def dataset_version(path=EXERCISE_JSON):
+    """Hash isi dataset dan versi pipeline; berubah setiap kali data atau aturan pembersihan berubah."""
+    path = dataset_source(path)
+    key = source_key(path)
+    if key not in _versions:
+        if path == ARTIFACT_PATH:
+            # Isi artifact sudah di-hash saat build
+            digest = hashlib.sha1(read_artifact_meta(path)['content_hash'].encode())
+        else:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read())
+        digest.update(str(PIPELINE_VERSION).encode())
+        _versions.clear()
+        _versions[key] = digest.hexdigest()[:16]
+    return _versions[key]
+
+
+def clean_dataframe(df):
+    """Versi vektor dari pembersihan untuk EDA, ditambah perataan kolom list."""
+    df = df.copy()
+
+    # Fill missing values in 'force', 'equipment' and 'mechanic' with dict/set lookups
+    df['force'] = df['force'].fillna(df['name'].map(FORCE_BY_NAME)).fillna('unknown')
+    df['equipment'] = df['equipment'].where(
+        df['equipment'].notna(),
+        df['name'].isin(BODY_ONLY_NAMES).map({True: 'body only', False: 'other'}),
+    )
+    df['mechanic'] = df['mechanic'].fillna('unknown')
+
+    # Fill empty lists in the 'secondaryMuscles' column with 'none'
+    empty_secondary = df['secondaryMuscles'].str.len() == 0
+    df.loc[empty_secondary, 'secondaryMuscles'] = pd.Series([['none']] * empty_secondary.sum(), index=df.index[empty_secondary])
+
+    # Changing the type of the column 'primaryMuscles' to a non-list format
+    single_primary = df['primaryMuscles'].str.len() == 1
+    df.loc[single_primary, 'primaryMuscles'] = df.loc[single_primary, 'primaryMuscles'].str[0]
+
+    # Changing the type of the column 'instructions' to a non-list format
+    df['instructions'] = df['instructions'].str.join(' ')
+    return df
+
+
+def snapshot_path(path, mtime_ns):
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{mtime_ns}|{PIPELINE_VERSION}".encode()).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, f"exercise_clean-{key}.parquet")
+
+
+def read_snapshot(path):
+    try:
+        return pd.read_parquet(path)
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def write_snapshot(df, path):
+    """Menyimpan snapshot Parquet; dilewati jika pyarrow/fastparquet tidak terpasang."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"Skipping dataset snapshot {path}: {e}")
+
+
+def restore_lists(df):
+    # Parquet mengembalikan kolom list sebagai numpy array
+    for column in ('secondaryMuscles', 'images'):
+        df[column] = df[column].map(list)
+    return df
+
+
+def load_clean_dataframe(path=EXERCISE_JSON):
+    """DataFrame yang sudah dibersihkan, di-memo per mtime file sumber."""
+    key = source_key(dataset_source(path))
+    if key not in _frames:
+        snapshot = snapshot_path(*key)
+        df = read_snapshot(snapshot) if os.path.exists(snapshot) else None
+        if df is not None:
+            df = restore_lists(df)
+        else:
+            df = clean_dataframe(pd.DataFrame(load_records(path)))
+            write_snapshot(df, snapshot)
+        _frames.clear()
+        _frames[key] = df
+    return _frames[key].copy()
+
+
+def load_clean_records(path=EXERCISE_JSON):
+    """Record latihan dengan nilai kosong yang sudah diisi, untuk dipakai sisi chat/API."""
+    key = source_key(dataset_source(path))
+    if key not in _records:
+        _records.clear()
+        _records[key] = [clean_record(record) for record in load_records(path)]
+    return _records[key]
@@ -0,0 +1,202 @@
+"""
+Compiler dataset: exercise.json dan folder gambar exercises/ dikompilasi menjadi
+satu file SQLite berversi (id index, content hash, metadata gambar).
+
+    python dataset_artifact.py                  # build ke .cache/exercises.sqlite3
+    python dataset_artifact.py --workers 8 --output /tmp/exercises.sqlite3
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Naikkan jika skema artifact berubah
+ARTIFACT_FORMAT = 1
+
+REQUIRED_FIELDS = ('id', 'name', 'level', 'category', 'primaryMuscles', 'secondaryMuscles', 'instructions', 'images')
+
+# Gambar lebih kecil dari ini dianggap rusak
+MIN_IMAGE_BYTES = 1024
+
+
+def jpeg_size(data):
+    """(lebar, tinggi) dari header JPEG, atau None jika bukan JPEG yang valid."""
+    if data[:2] != b'\xff\xd8':
+        return None
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            position += 1
+            continue
+        marker = data[position + 1]
+        if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            position += 1 if marker == 0xFF else 2
+            continue
+        length = int.from_bytes(data[position + 2:position + 4], 'big')
+        # Marker SOF (kecuali DHT, JPG dan DAC) berisi dimensi gambar
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[position + 5:position + 7], 'big')
+            width = int.from_bytes(data[position + 7:position + 9], 'big')
+            return width, height
+        position += 2 + length
+    return None
+
+
+def inspect_image(job):
+    """Validasi satu gambar; dijalankan paralel di process pool."""
+    exercise_id, image, path = job
+    if not os.path.exists(path):
+        return exercise_id, image, None, f"missing image {image}"
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    size = jpeg_size(data)
+    info = {
+        "bytes": len(data),
+        "width": size[0] if size else None,
+        "height": size[1] if size else None,
+        "sha1": hashlib.sha1(data).hexdigest(),
+    }
+    if len(data) < MIN_IMAGE_BYTES:
+        return exercise_id, image, info, f"image {image} is too small ({len(data)} bytes)"
+    if size is None:
+        return exercise_id, image, info, f"image {image} is not a readable JPEG"
+    return exercise_id, image, info, None
+
+
+def validate_records(records):
+    """Error struktur record: field wajib dan id unik."""
+    errors = []
+    seen = set()
+    for position, record in enumerate(records):
+        missing = [field for field in REQUIRED_FIELDS if field not in record]
+        if missing:
+            errors.append(f"record {position} ({record.get('id')}): missing fields {', '.join(missing)}")
+        if record.get('id') in seen:
+            errors.append(f"record {position}: duplicate id {record['id']}")
+        seen.add(record.get('id'))
+    return errors
+
+
+def content_hash(records, images):
+    """Hash isi record (JSON kanonik) dan isi semua gambar."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(records, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+    for key in sorted(images):
+        if images[key]:
+            digest.update(f"{key[0]}/{key[1]}:{images[key]['sha1']}".encode())
+    return digest.hexdigest()
+
+
+def build(records, exercises_folder, output_path, workers=None):
+    """Validasi dataset lalu menulis artifact SQLite secara atomik. Mengembalikan (meta, errors)."""
+    errors = validate_records(records)
+
+    jobs = [
+        (record['id'], image, os.path.join(exercises_folder, image))
+        for record in records
+        for image in record.get('images', [])
+    ]
+    images = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for exercise_id, image, info, error in executor.map(inspect_image, jobs, chunksize=64):
+            images[(exercise_id, image)] = info
+            if error:
+                errors.append(f"{exercise_id}: {error}")
+
+    meta = {
+        "format": str(ARTIFACT_FORMAT),
+        "content_hash": content_hash(records, images),
+        "record_count": str(len(records)),
+        "image_count": str(sum(1 for info in images.values() if info)),
+        "built_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+    if errors:
+        return meta, errors
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    connection = sqlite3.connect(temp_path)
+    with connection:
+        connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        connection.execute(
+            "CREATE TABLE exercises (position INTEGER NOT NULL, id TEXT PRIMARY KEY, name TEXT NOT NULL, record TEXT NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE images (exercise_id TEXT NOT NULL, image TEXT NOT NULL, bytes INTEGER, width INTEGER,"
+            " height INTEGER, sha1 TEXT, PRIMARY KEY (exercise_id, image))"
+        )
+        connection.execute("CREATE INDEX idx_exercises_name ON exercises (name COLLATE NOCASE)")
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        connection.executemany(
+            "INSERT INTO exercises VALUES (?, ?, ?, ?)",
+            [(position, record['id'], record['name'], json.dumps(record)) for position, record in enumerate(records)],
+        )
+        connection.executemany(
+            "INSERT INTO images VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (exercise_id, image, info['bytes'], info['width'], info['height'], info['sha1'])
+                for (exercise_id, image), info in images.items()
+            ],
+        )
+    connection.close()
+    os.replace(temp_path, output_path)
+    return meta, []
+
+
+def _read_meta(connection, path):
+    meta = dict(connection.execute("SELECT key, value FROM meta"))
+    if meta.get('format') != str(ARTIFACT_FORMAT):
+        raise ValueError(f"Unsupported artifact format {meta.get('format')} in {path}")
+    return meta
+
+
+def read_artifact_meta(path):
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return _read_meta(connection, path)
+    finally:
+        connection.close()
+
+
+def read_artifact(path):
+    """Membaca (records, meta) dari artifact, record berurutan seperti di exercise.json."""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        meta = _read_meta(connection, path)
+        records = [json.loads(row[0]) for row in connection.execute("SELECT record FROM exercises ORDER BY position")]
+    finally:
+        connection.close()
+    return records, meta
+
+
+if __name__ == '__main__':
+    from exercise_index import ARTIFACT_PATH, EXERCISE_JSON, EXERCISES_FOLDER
+
+    parser = argparse.ArgumentParser(description="Compile exercise.json and exercise images into one artifact.")
+    parser.add_argument('--source', default=EXERCISE_JSON)
+    parser.add_argument('--exercises', default=EXERCISES_FOLDER)
+    parser.add_argument('--output', default=ARTIFACT_PATH)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.source, 'r', encoding='utf-8') as f:
+        source_records = json.load(f)
+
+    started = time.perf_counter()
+    artifact_meta, build_errors = build(source_records, args.exercises, args.output, args.workers)
+    if build_errors:
+        for error in build_errors:
+            print(f"Error: {error}")
+        raise SystemExit(f"Validation failed with {len(build_errors)} error(s); artifact not written.")
+
+    print(
+        f"Wrote {args.output}: {artifact_meta['record_count']} exercises, {artifact_meta['image_count']} images, "
+        f"content hash {artifact_meta['content_hash'][:16]} ({time.perf_counter() - started:.2f}s)"
+    )
@@ -1,13 +1,11 @@
-# Import libraries
-import pandas as pd
-
 # Library for model deployment interface
 import streamlit as st
 
-# Visualization
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
+# Shared cleaning pipeline
+from dataset import load_clean_dataframe
+
+# Visualization (cached PNG renders)
+from eda_figures import FIGURES
 
 # Create a function to run the streamlit interface
 def run():
@@ -18,69 +16,8 @@ def run():
     # st.image('CustomerChurnBanner_EDA.jpg')
 
     # Dataframe section
-    # Load dataset
-    df = pd.read_json('exercise.json')
-
-    # Dataset cleaning
-    # Creating a function to handle missing value on column 'force'
-    def categorize_force(exercise_name):
-        if exercise_name in [
-            "Balance Board", "Conan's Wheel", "Farmer's Walk", "Rickshaw Carry", "Lying Prone Quadriceps", "Yoke Walk"
-        ]:
-            return "static"
-        elif exercise_name in [
-            "Bicycling", "Bicycling, Stationary", "Elliptical Trainer", "Jogging, Treadmill", "Push-Up Wide",
-            "Recumbent Bike", "Rope Jumping", "Running, Treadmill", "Skating", "Smith Machine Decline Press", 
-            "Stairmaster", "Step Mill", "Trail Running/Walking", "Walking, Treadmill", "Carioca Quick Step",
-            "Inchworm", "Linear Acceleration Wall Drill", "Moving Claw Series"
-        ]:
-            return "push"
-        elif exercise_name in [
-            "Band Assisted Pull-Up", "Incline Inner Biceps Curl", "Internal Rotation with Band", "Rowing, Stationary",
-            "Single Dumbbell Raise"
-        ]:
-            return "pull"
-        else:
-            return "unknown"  # Fallback for unrecognized exercises
-
-    # Fill missing values in the 'force' column using said function
-    df['force'] = df.apply(lambda row: categorize_force(row['name']) if pd.isnull(row['force']) else row['force'], axis=1)
-
-    # Creating a function to handle missing value on column 'equipment'
-    def categorize_equipment(exercise_name):
-        body_only = [
-            "Ankle Circles", "Ankle On The Knee", "Arm Circles", "Bodyweight Walking Lunge",
-            "Calf Stretch Elbows Against Wall", "Calf Stretch Hands Against Wall", "Cat Stretch",
-            "Chair Lower Back Stretch", "Child's Pose", "Chin To Chest Stretch", "Crossover Reverse Lunge",
-            "Dancer's Stretch", "Decline Push-Up", "Elbow Circles", "Elbows Back", "Groin and Back Stretch",
-            "Hamstring Stretch", "Hug Knees To Chest", "Inverted Row", "Knee Across The Body",
-            "Kneeling Arm Drill", "Kneeling Forearm Stretch", "Kneeling Hip Flexor", "Leg-Up Hamstring Stretch",
-            "Looking At Ceiling", "Middle Back Stretch", "On Your Side Quad Stretch", "One Arm Against Wall",
-            "One Half Locust", "One Knee To Chest", "Overhead Stretch", "Pelvic Tilt Into Bridge",
-            "Prone Manual Hamstring", "Runner's Stretch", "Scapular Pull-Up", "Seated Calf Stretch",
-            "Seated Floor Hamstring Stretch", "Seated Hamstring", "Seated Overhead Stretch", "Shoulder Circles",
-            "Shoulder Raise", "Shoulder Stretch", "Side-Lying Floor Stretch", "Side Lying Groin Stretch",
-            "Side Neck Stretch", "Side Wrist Pull", "Spinal Stretch", "Standing Gastrocnemius Calf Stretch",
-            "Standing Hip Flexors", "Standing Lateral Stretch", "Standing Soleus And Achilles Stretch",
-            "Standing Toe Touches", "The Straddle", "Tricep Side Stretch", "Triceps Stretch",
-            "Upper Back-Leg Grab", "Upper Back Stretch", "Upward Stretch", "Windmills"
-        ]
-        return "body only" if exercise_name in body_only else "other"
-
-    # Fill missing values in the 'equipment' column using said function
-    df['equipment'] = df['equipment'].apply(lambda x: categorize_equipment(x) if pd.isna(x) else x)
-
-    # Fill missing values in the 'mechanic' column with unkown
-    df['mechanic'] = df['mechanic'].fillna('unknown')
-
-    # Fill empty lists in the 'secondaryMuscles' column with 'none'
-    df['secondaryMuscles'] = df['secondaryMuscles'].apply(lambda x: ['none'] if isinstance(x, list) and len(x) == 0 else x)
-
-    # Changing the type of the column 'primaryMuscles' to a non-list format
-    df['primaryMuscles'] = df['primaryMuscles'].apply(lambda x: x[0] if isinstance(x, list) and len(x) == 1 else x)
-
-    # Changing the type of the column 'instructions' to a non-list format
-    df['instructions'] = df['instructions'].apply(lambda x: ' '.join(x) if isinstance(x, list) else x)
+    # Load the cleaned dataset (memoized per file version, see dataset.py for the cleaning rules)
+    df = load_clean_dataframe()
 
 
     # Description
@@ -104,25 +41,8 @@ def run():
     # Option
     option = st.selectbox('Select One Column', ('force', 'level', 'mechanic', 'category'))
 
-    # Prepare the data
-    if option == 'category':  # Only modify for the 'category' column
-        modified_df = df.copy()
-        modified_df['category_for_pie'] = modified_df['category'].replace(
-            ['strongman', 'olympic weightlifting', 'powerlifting'], 
-            'competition exercises'
-        )
-        counts = modified_df['category_for_pie'].value_counts()
-    else:
-        counts = df[option].value_counts()
-
-    # Visualization
-    fig = plt.figure(figsize=(7, 7))
-    plt.pie(counts, labels=counts.index, autopct='%1.2f%%', startangle=90)
-    plt.title('Pie Chart of Different Column Categories')
-    plt.axis('equal')
-
-    # Show the plot
-    st.pyplot(fig)
+    # Show the plot (rendered once per dataset version, see eda_figures.py)
+    st.image(FIGURES.get('pie', option), use_column_width=True)
 
     # Observation
     if option == 'force':
@@ -181,28 +101,8 @@ def run():
     # Visualization
     st.write('### Exercise Level Percentage by Category')
 
-    # Ensure 'level' is ordered with "expert" at the top
-    df['level'] = pd.Categorical(df['level'], categories=['beginner', 'intermediate', 'expert'], ordered=True)
-
-    # Calculate the ratio of levels within each category
-    category_ratio = df.groupby('category')['level'].value_counts(normalize=True).unstack()
-
-    # Create a figure and axis explicitly
-    fig1, ax = plt.subplots(figsize=(10, 6))
-
-    # Plot the stacked bar chart with 'expert' at the top
-    category_ratio.plot(kind='bar', stacked=True, ax=ax)
-
-    # Customize the plot
-    ax.set_title('Proportion of Exercise Levels by Category')
-    ax.set_xlabel('Exercise Category')
-    ax.set_ylabel('Proportion')
-    ax.legend(title='Level', loc='upper right')
-
-    plt.tight_layout()  # Adjust layout
-
     # Show the plot
-    st.pyplot(fig1)
+    st.image(FIGURES.get('level_by_category'), use_column_width=True)
 
     # Insights
     st.write('**Background**:\n'
@@ -224,23 +124,8 @@ def run():
     # Description
     st.write('In this word cloud, we are only looking at the strength exercises as it is the most prominant kind of exercises shown in the dataset.')
 
-    # Step 1: Filter the DataFrame for the 'Strength' category
-    strength_instructions = df[df['category'] == 'strength']['instructions']
-
-    # Combine all instructions into one large string for the word cloud
-    all_instructions = ' '.join(strength_instructions)
-
-    # Step 2: Generate the word cloud
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_instructions)
-
-    # Step 3: Plot the word cloud
-    fig2 = plt.figure(figsize=(10, 6))
-    plt.imshow(wordcloud, interpolation='bilinear')
-    plt.axis('off')  # Remove axes
-    plt.title('Word Cloud of Strength Instructions', fontsize=16)
-
-    # If using Streamlit, display the plot
-    st.pyplot(fig2)
+    # Show the word cloud
+    st.image(FIGURES.get('strength_wordcloud'), use_column_width=True)
 
     # Insights
     st.write('**Observation**:\n'
@@ -255,35 +140,17 @@ def run():
     # Visualization
     st.write('### Heatmap of Category vs Equipment (in terms of percentage)')
 
-    # Step 1: Group by category and equipment, counting occurrences
-    heatmap_data = df.groupby(['category', 'equipment']).size().unstack(fill_value=0)
-
-    # Step 2: Convert counts to ratios
-    heatmap_data_ratio = heatmap_data.div(heatmap_data.sum(axis=1), axis=0)
-
-    # Step 3: Plot the heatmap
-    fig3 = plt.figure(figsize=(12, 8))
-    sns.heatmap(heatmap_data_ratio, annot=True, fmt=".2f", cmap="Blues", cbar_kws={'label': 'Proportion'})
-
-    # Step 4: Add labels and title
-    plt.title('Proportion Heatmap of Category vs Equipment', fontsize=16)
-    plt.xlabel('Equipment', fontsize=12)
-    plt.ylabel('Category', fontsize=12)
-    plt.xticks(rotation=45, ha='right')
-    plt.yticks(rotation=0)
-    plt.tight_layout()
-
     # Show the heatmap
-    st.pyplot(fig3)
+    st.image(FIGURES.get('category_equipment_heatmap'), use_column_width=True)
 
     # Insights
     st.write('**Observation**:\n'
     '- Cardio exercises predominantly use machine (64%) and other equipment (36%), which indicates that the cardio exercises suggested in this dataset make use of several equipments.\n'
     '- Olympic weightlifting exclusively relies on barbells and no other equipment, which aligns with the nature of Olympic weightlifting focusing on compound barbell movements.\n'
-    '- Plyometrics exercises commonly uses a combination of either body only (21%), medicine ball (25%), and other types of equipment not mentioned (51%).\n'
+    '- Plyometrics exercises commonly uses a combination of either body only (23%), medicine ball (25%), and other types of equipment not mentioned (49%).\n'
     '- Powerlifting dominantly uses barbells (82%) as expected, given the emphasis on compound exercises like squat, bench press, and deadlift.\n'
     '- Strength training, unlike any other categories in this dataset, utilizies almost every single equipment in the dataset, indicating its variety in equipment usage.\n'
-    '- Stretching primarily relies on other types of equipment (61%) and body only (19%).\n'
+    '- Stretching primarily relies on body only (62%) and other types of equipment (26%).\n'
     '- Exclusively relies on "other" equipment (100%), likely due to the specialized nature of strongman training using stones or yokes or any kind of heavy object.\n'
     '\n**Insights**:\n'
     '- The heatmap highlights clear trends in equipment usage for different exercise categories. For example, cardio and stretching focus on minimal or no equipment, while Olympic weightlifting and powerlifting rely heavily on barbells.\n'
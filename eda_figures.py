@@ -0,0 +1,173 @@
+"""
+Figure EDA yang dirender sekali per versi dataset lalu disimpan sebagai PNG.
+
+Pre-render semua figure (misalnya saat deploy):
+    python eda_figures.py
+"""
+import io
+import os
+import threading
+
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+from wordcloud import WordCloud
+
+from exercise_index import BASE_DIR
+from dataset import load_clean_records, dataset_version
+from stats import CatalogStats
+
+FIGURE_DIR = os.environ.get('GOGYM_FIGURE_DIR', os.path.join(BASE_DIR, '.cache', 'figures'))
+
+# Naikkan jika tampilan figure berubah supaya PNG lama di disk tidak dipakai
+RENDER_VERSION = 2
+
+# Pilihan kolom untuk pie chart di halaman EDA
+PIE_OPTIONS = ('force', 'level', 'mechanic', 'category')
+
+
+def pie_chart(stats, option):
+    counts = pd.Series(stats['value_counts'][option])
+    if option == 'category':  # Only modify for the 'category' column
+        counts = counts.rename(lambda category: 'competition exercises' if category in (
+            'strongman', 'olympic weightlifting', 'powerlifting'
+        ) else category).groupby(level=0).sum().sort_values(ascending=False)
+
+    fig = Figure(figsize=(7, 7))
+    ax = fig.subplots()
+    ax.pie(counts, labels=counts.index, autopct='%1.2f%%', startangle=90)
+    ax.set_title('Pie Chart of Different Column Categories')
+    ax.axis('equal')
+    return fig
+
+
+def crosstab_frame(stats, name):
+    """Tabulasi silang dari statistik katalog sebagai DataFrame kecil (baris x kolom)."""
+    return pd.DataFrame(stats['crosstabs'][name]).T.fillna(0).sort_index().sort_index(axis=1)
+
+
+def level_by_category_chart(stats):
+    # Ratio of levels within each category, with "expert" at the top of the stack
+    counts = crosstab_frame(stats, 'category_x_level').reindex(columns=['beginner', 'intermediate', 'expert'])
+    category_ratio = counts.div(counts.sum(axis=1), axis=0)
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    category_ratio.plot(kind='bar', stacked=True, ax=ax)
+    ax.set_title('Proportion of Exercise Levels by Category')
+    ax.set_xlabel('Exercise Category')
+    ax.set_ylabel('Proportion')
+    ax.legend(title='Level', loc='upper right')
+    fig.tight_layout()
+    return fig
+
+
+def strength_wordcloud_chart(records):
+    # Combine all instructions of strength exercises into one large string for the word cloud
+    all_instructions = ' '.join(
+        ' '.join(record['instructions']) for record in records if record['category'] == 'strength'
+    )
+    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(all_instructions)
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title('Word Cloud of Strength Instructions', fontsize=16)
+    return fig
+
+
+def category_equipment_heatmap(stats):
+    # Convert category x equipment counts to ratios per category
+    heatmap_data = crosstab_frame(stats, 'category_x_equipment')
+    heatmap_data_ratio = heatmap_data.div(heatmap_data.sum(axis=1), axis=0)
+
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    sns.heatmap(heatmap_data_ratio, annot=True, fmt=".2f", cmap="Blues", cbar_kws={'label': 'Proportion'}, ax=ax)
+    ax.set_title('Proportion Heatmap of Category vs Equipment', fontsize=16)
+    ax.set_xlabel('Equipment', fontsize=12)
+    ax.set_ylabel('Category', fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    ax.tick_params(axis='y', labelrotation=0)
+    fig.tight_layout()
+    return fig
+
+
+# chart -> (fungsi builder, sumber data: 'stats' atau 'records', menerima option atau tidak)
+CHARTS = {
+    'pie': (pie_chart, 'stats', True),
+    'level_by_category': (level_by_category_chart, 'stats', False),
+    'strength_wordcloud': (strength_wordcloud_chart, 'records', False),
+    'category_equipment_heatmap': (category_equipment_heatmap, 'stats', False),
+}
+
+
+def render_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    return buffer.getvalue()
+
+
+class FigureCache:
+    """Cache PNG di memori dan di disk, dengan kunci (chart, option, versi dataset)."""
+
+    def __init__(self, figure_dir=FIGURE_DIR):
+        self.figure_dir = figure_dir
+        self.memory = {}
+        self.lock = threading.Lock()
+
+    def path(self, chart, option, version):
+        suffix = f"-{option}" if option else ""
+        return os.path.join(self.figure_dir, f"{chart}{suffix}-{version}-r{RENDER_VERSION}.png")
+
+    def get(self, chart, option=None):
+        """PNG untuk sebuah chart; dirender hanya jika belum ada di memori maupun di disk."""
+        version = dataset_version()
+        key = (chart, option, version)
+        png = self.memory.get(key)
+        if png is not None:
+            return png
+
+        with self.lock:
+            png = self.memory.get(key)
+            if png is None:
+                path = self.path(chart, option, version)
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        png = f.read()
+                else:
+                    png = self.render(chart, option)
+                    os.makedirs(self.figure_dir, exist_ok=True)
+                    temp_path = f"{path}.{os.getpid()}.tmp"
+                    with open(temp_path, 'wb') as f:
+                        f.write(png)
+                    os.replace(temp_path, path)
+                self.memory[key] = png
+        return png
+
+    def render(self, chart, option=None):
+        builder, source, takes_option = CHARTS[chart]
+        records = load_clean_records()
+        data = CatalogStats(records).to_dict() if source == 'stats' else records
+        fig = builder(data, option) if takes_option else builder(data)
+        return render_png(fig)
+
+    def prerender(self):
+        """Merender semua chart dan semua pilihan pie chart."""
+        rendered = []
+        for chart, (_, _, takes_option) in CHARTS.items():
+            for option in (PIE_OPTIONS if takes_option else (None,)):
+                self.get(chart, option)
+                rendered.append(self.path(chart, option, dataset_version()))
+        return rendered
+
+
+FIGURES = FigureCache()
+
+
+if __name__ == '__main__':
+    for path in FIGURES.prerender():
+        print(f"Rendered {path}")
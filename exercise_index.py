@@ -0,0 +1,211 @@
+import os
+import json
+
+from cleaning import clean_record
+from dataset_artifact import read_artifact
+from facet_index import FacetIndex
+from search_index import SearchIndex
+from stats import CatalogStats
+
+# Lokasi dataset relatif terhadap file ini, supaya tidak bergantung pada working directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EXERCISE_JSON = os.path.join(BASE_DIR, 'exercise.json')
+EXERCISES_FOLDER = os.path.join(BASE_DIR, 'exercises')
+
+# Artifact hasil `python dataset_artifact.py`; dipakai jika ada dan tidak lebih lama dari exercise.json
+ARTIFACT_PATH = os.environ.get('GOGYM_DATASET_ARTIFACT', os.path.join(BASE_DIR, '.cache', 'exercises.sqlite3'))
+
+
+def get_exercise_json(exercise_folder):
+    """Mencari file .json dalam folder latihan dan mengembalikan isi JSON."""
+    try:
+        json_file = os.path.join(exercise_folder, f"{os.path.basename(exercise_folder)}.json")
+        if os.path.exists(json_file):
+            with open(json_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+    except Exception as e:
+        print(f"Error reading JSON file in {exercise_folder}: {e}")
+        return None
+
+
+def dataset_source(json_path=EXERCISE_JSON):
+    """
+    File yang menjadi sumber dataset: artifact hasil kompilasi jika ada dan masih baru,
+    selain itu json_path.
+    """
+    if json_path != EXERCISE_JSON or not os.path.exists(ARTIFACT_PATH):
+        return json_path
+    if os.path.exists(json_path) and os.stat(json_path).st_mtime_ns > os.stat(ARTIFACT_PATH).st_mtime_ns:
+        print(f"{ARTIFACT_PATH} is older than {json_path}; run `python dataset_artifact.py` to rebuild it.")
+        return json_path
+    return ARTIFACT_PATH
+
+
+def load_records(json_path=EXERCISE_JSON, exercises_folder=EXERCISES_FOLDER):
+    """
+    Membaca semua record latihan sekali saja.
+    Artifact dataset dipakai jika ada, lalu exercise.json, dan terakhir setiap folder
+    di exercises/ dibaca satu per satu.
+    """
+    source = dataset_source(json_path)
+    if source == ARTIFACT_PATH:
+        return read_artifact(source)[0]
+
+    if os.path.exists(json_path):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    records = []
+    for folder_name in sorted(os.listdir(exercises_folder)):
+        folder_path = os.path.join(exercises_folder, folder_name)
+        if not os.path.isdir(folder_path):
+            continue
+        record = get_exercise_json(folder_path)
+        if record:
+            record.setdefault('id', folder_name)
+            records.append(record)
+    return records
+
+
+def dataset_paths(json_path=EXERCISE_JSON, exercises_folder=EXERCISES_FOLDER):
+    """
+    File yang dibaca load_records, untuk dipantau reloader: artifact dan json_path, ditambah
+    JSON per folder hanya jika keduanya tidak ada (saat itu folder menjadi sumber dataset).
+    """
+    paths = [json_path, ARTIFACT_PATH]
+    if any(os.path.exists(path) for path in paths) or not os.path.isdir(exercises_folder):
+        return paths
+    for folder_name in os.listdir(exercises_folder):
+        paths.append(os.path.join(exercises_folder, folder_name, f"{folder_name}.json"))
+    return paths
+
+
+def normalize_name(name):
+    """Kunci nama yang tidak peka huruf besar/kecil dan spasi/underscore."""
+    return ' '.join(name.replace('_', ' ').split()).casefold()
+
+
+class ExerciseIndex:
+    """
+    Index in-memory untuk seluruh katalog latihan, dibangun sekali saat startup.
+
+    - records: id -> record hasil parse (dikirim apa adanya oleh API)
+    - clean_records: id -> record setelah cleaning.clean_record; sumber nilai facet dan
+      matriks kemiripan, supaya /filter, /similar, /stats dan chat memakai kosakata yang sama
+    - ids: urutan id seperti di dataset
+    - name_to_id: nama/id yang dinormalisasi -> id
+    - list_payload: payload siap kirim untuk /list_all
+    - search: inverted index BM25 untuk pencarian teks penuh
+    - facets: bitmap per nilai facet untuk /filter
+    - stats: statistik agregat untuk /stats
+    - generation: naik setiap kali snapshot baru dibuat lewat updated()
+
+    Index tidak pernah diubah setelah dibangun; perubahan dataset menghasilkan index baru.
+    """
+
+    def __init__(self, records, exercises_folder=EXERCISES_FOLDER):
+        self.exercises_folder = exercises_folder
+        self.generation = 0
+        self.records = {}
+        self.ids = []
+
+        for record in records:
+            exercise_id = record['id']
+            self.records[exercise_id] = record
+            self.ids.append(exercise_id)
+
+        self.clean_records = {exercise_id: clean_record(record) for exercise_id, record in self.records.items()}
+        self._build_lookups()
+        self.search = SearchIndex(self.ids, self.records)
+        self.facets = FacetIndex(self.ids, self.clean_records)
+        self.stats = CatalogStats(self.records.values())
+
+    def _build_lookups(self):
+        self.name_to_id = {}
+        for exercise_id in self.ids:
+            for alias in (exercise_id, self.records[exercise_id].get('name', '')):
+                if alias:
+                    self.name_to_id.setdefault(normalize_name(alias), exercise_id)
+
+        # Dipakai /search (substring) dan /list_all, dihitung sekali saja
+        self.lowered_ids = [(exercise_id.lower(), exercise_id) for exercise_id in self.ids]
+        self.list_payload = {"exercises": list(self.ids)}
+
+    @classmethod
+    def load(cls, json_path=EXERCISE_JSON, exercises_folder=EXERCISES_FOLDER):
+        return cls(load_records(json_path, exercises_folder), exercises_folder)
+
+    def diff(self, records):
+        """Perubahan dari index ini ke list record baru: id -> record baru, atau None jika dihapus."""
+        new_records = {record['id']: record for record in records}
+        changes = {
+            exercise_id: record for exercise_id, record in new_records.items()
+            if self.records.get(exercise_id) != record
+        }
+        changes.update({exercise_id: None for exercise_id in self.ids if exercise_id not in new_records})
+        return changes
+
+    def updated(self, changes, order=None):
+        """
+        Index baru dengan perubahan diterapkan (id -> record, atau None untuk menghapus).
+        Record yang tidak berubah, hasil tokenisasi, bitmap facet dan statistik dipakai
+        ulang, jadi hanya latihan yang berubah yang diproses ulang.
+
+        order adalah urutan id di dataset baru; tanpa order, id baru ditaruh di akhir.
+        """
+        index = ExerciseIndex.__new__(ExerciseIndex)
+        index.exercises_folder = self.exercises_folder
+        index.generation = self.generation + 1
+        index.records = dict(self.records)
+        index.clean_records = dict(self.clean_records)
+        index.ids = [exercise_id for exercise_id in self.ids if changes.get(exercise_id, True) is not None]
+
+        for exercise_id, record in changes.items():
+            if record is None:
+                index.records.pop(exercise_id, None)
+                index.clean_records.pop(exercise_id, None)
+                continue
+            if exercise_id not in index.records:
+                index.ids.append(exercise_id)
+            index.records[exercise_id] = record
+            index.clean_records[exercise_id] = clean_record(record)
+
+        if order is not None:
+            index.ids = list(order)
+
+        changed_ids = [exercise_id for exercise_id, record in changes.items() if record is not None]
+        index._build_lookups()
+        index.search = SearchIndex(index.ids, index.records, previous=self.search)
+        index.facets = self.facets.updated(index.ids, index.clean_records, self.clean_records, changed_ids)
+        index.stats = self.stats.copy()
+        for exercise_id in changes:
+            index.stats.update(self.records.get(exercise_id), index.records.get(exercise_id))
+        return index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resolve(self, name):
+        """Mengembalikan id latihan untuk nama apa pun (id folder atau nama asli), atau None."""
+        if name in self.records:
+            return name
+        return self.name_to_id.get(normalize_name(name))
+
+    def get(self, name):
+        exercise_id = self.resolve(name)
+        return self.records.get(exercise_id) if exercise_id else None
+
+    def search_ids(self, query):
+        """Pencarian substring pada id latihan (perilaku lama /search)."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        return [exercise_id for lowered, exercise_id in self.lowered_ids if query in lowered]
+
+    def image_path(self, exercise_id, image_name):
+        """Path absolut gambar jika terdaftar di record latihan, selain itu None."""
+        record = self.records.get(exercise_id)
+        if not record or f"{exercise_id}/{image_name}" not in record.get('images', []):
+            return None
+        return os.path.join(self.exercises_folder, exercise_id, image_name)
@@ -0,0 +1,116 @@
+from collections import defaultdict
+
+# Kolom kategorikal yang bisa dipakai sebagai filter
+FACETS = ('level', 'equipment', 'category', 'force', 'mechanic', 'primaryMuscles', 'secondaryMuscles')
+
+# Nilai pengganti untuk kolom yang kosong di dataset
+MISSING_VALUE = 'unknown'
+
+
+def facet_values(record, facet):
+    """Mengembalikan semua nilai (huruf kecil) sebuah facet untuk satu record."""
+    value = record.get(facet)
+    if isinstance(value, list):
+        return [item.lower() for item in value]
+    return [value.lower() if value else MISSING_VALUE]
+
+
+def popcount(bitmap):
+    return bin(bitmap).count('1')
+
+
+def iter_bits(bitmap):
+    """Posisi bit yang aktif, dari yang terkecil."""
+    while bitmap:
+        lowest = bitmap & -bitmap
+        yield lowest.bit_length() - 1
+        bitmap ^= lowest
+
+
+class FacetIndex:
+    """
+    Bitmap (integer Python) untuk setiap nilai facet.
+
+    Bit ke-i aktif jika latihan ke-i punya nilai tersebut, jadi filter AND/OR
+    antar facet cukup dengan operasi & dan | pada integer.
+    """
+
+    def __init__(self, ids, records):
+        self.ids = list(ids)
+        self.all_bits = (1 << len(self.ids)) - 1
+        self.bitmaps = {facet: defaultdict(int) for facet in FACETS}
+
+        for position, exercise_id in enumerate(self.ids):
+            bit = 1 << position
+            for facet in FACETS:
+                for value in facet_values(records[exercise_id], facet):
+                    self.bitmaps[facet][value] |= bit
+
+        self.bitmaps = {facet: dict(values) for facet, values in self.bitmaps.items()}
+
+    def updated(self, ids, records, old_records, changed_ids):
+        """
+        Index untuk katalog baru. Jika latihan lama tetap di posisi yang sama (hanya
+        diubah atau ditambah di akhir), cukup bit latihan yang berubah yang diperbarui.
+        """
+        ids = list(ids)
+        if ids[:len(self.ids)] != self.ids:
+            return FacetIndex(ids, records)
+
+        index = FacetIndex.__new__(FacetIndex)
+        index.ids = ids
+        index.all_bits = (1 << len(ids)) - 1
+        index.bitmaps = {facet: dict(values) for facet, values in self.bitmaps.items()}
+        positions = {exercise_id: position for position, exercise_id in enumerate(ids)}
+
+        for exercise_id in changed_ids:
+            bit = 1 << positions[exercise_id]
+            for facet, values in index.bitmaps.items():
+                if exercise_id in old_records:
+                    for value in set(facet_values(old_records[exercise_id], facet)):
+                        values[value] &= ~bit
+                        if not values[value]:
+                            del values[value]
+                for value in facet_values(records[exercise_id], facet):
+                    values[value] = values.get(value, 0) | bit
+        return index
+
+    def match(self, facet, values):
+        """Bitmap latihan yang punya salah satu nilai (OR) dari facet."""
+        bitmap = 0
+        for value in values:
+            bitmap |= self.bitmaps[facet].get(value.lower(), 0)
+        return bitmap
+
+    def combine(self, selections, operator='and', skip=None):
+        """Menggabungkan filter antar facet dengan AND atau OR; facet `skip` diabaikan."""
+        bitmaps = [self.match(facet, values) for facet, values in selections.items() if facet != skip]
+        if not bitmaps:
+            return self.all_bits
+
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = (result & bitmap) if operator == 'and' else (result | bitmap)
+        return result
+
+    def counts(self, selections, operator='and'):
+        """
+        Jumlah latihan per nilai facet untuk drill-down.
+        Untuk filter AND, hitungan sebuah facet mengabaikan filter facet itu sendiri
+        sehingga klien tetap melihat alternatif nilai lain di facet yang sama.
+        """
+        counts = {}
+        for facet, values in self.bitmaps.items():
+            if operator == 'and':
+                base = self.combine(selections, operator, skip=facet)
+            else:
+                base = self.combine(selections, operator)
+            facet_counts = {value: popcount(bitmap & base) for value, bitmap in values.items()}
+            counts[facet] = {value: count for value, count in sorted(facet_counts.items()) if count}
+        return counts
+
+    def filter(self, selections, operator='and'):
+        """Mengembalikan (id hasil, hitungan per facet) untuk kombinasi filter."""
+        result = self.combine(selections, operator)
+        ids = [self.ids[position] for position in iter_bits(result)]
+        return ids, self.counts(selections, operator)
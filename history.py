@@ -0,0 +1,125 @@
+import os
+import re
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Batas token riwayat percakapan yang dikirim ke LLM setiap giliran
+DEFAULT_TOKEN_BUDGET = int(os.environ.get('GOGYM_HISTORY_TOKEN_BUDGET', '1500'))
+
+# Jumlah pesan terakhir yang tidak dilipat ke ringkasan; jika tetap melewati budget,
+# pesan ini dipotong (yang paling lama lebih dulu)
+MIN_RECENT_MESSAGES = 2
+
+# Penanda di akhir pesan yang dipotong agar muat di budget
+TRUNCATION_MARKER = ' ...'
+
+# Porsi budget yang boleh dipakai ringkasan percakapan lama
+SUMMARY_SHARE = 0.3
+
+# Panjang maksimum (kata) satu pesan lama di dalam ringkasan
+SUMMARY_WORDS_PER_MESSAGE = 25
+
+ROLE_LABELS = {"user": "User", "assistant": "AI"}
+
+_encoding = None
+
+
+def count_tokens(text):
+    """Menghitung token secara lokal; memakai tiktoken jika terpasang, kalau tidak perkiraan ~4 karakter per token."""
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        return len(_encoding.encode(text))
+    return max(1, (len(text) + 3) // 4) if text else 0
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Awal teks ditambah TRUNCATION_MARKER yang muat dalam max_tokens token, atau '' jika tidak muat."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    # Pencarian biner panjang prefix, supaya tepat untuk tiktoken maupun perkiraan karakter
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle].rstrip() + TRUNCATION_MARKER) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + TRUNCATION_MARKER if low else ''
+
+
+def summarize_message(role, message):
+    """Ringkasan satu baris dari sebuah pesan: kalimat pertama, dipotong ke beberapa kata."""
+    first_sentence = re.split(r'(?<=[.!?])\s|\n', message.strip(), maxsplit=1)[0]
+    words = first_sentence.split()
+    if len(words) > SUMMARY_WORDS_PER_MESSAGE:
+        first_sentence = ' '.join(words[:SUMMARY_WORDS_PER_MESSAGE]) + ' ...'
+    return f"{ROLE_LABELS.get(role, role)}: {first_sentence}"
+
+
+class HistoryManager:
+    """
+    Riwayat percakapan dengan budget token.
+
+    Pesan terbaru dikirim apa adanya; pesan lama yang melewati budget dilipat satu per satu
+    ke ringkasan bergulir (rolling summary), sehingga ringkasan diperbarui secara
+    inkremental tanpa dibuat ulang dari awal. Pesan terbaru yang sendirian sudah melewati
+    budget dipotong, jadi riwayat tidak pernah lebih dari token_budget.
+    """
+
+    def __init__(self, token_budget=DEFAULT_TOKEN_BUDGET, summarizer=summarize_message):
+        self.token_budget = token_budget
+        self.summarizer = summarizer
+        self.recent = []
+        self.summary_lines = []
+        self.summary_tokens = 0
+
+    def add(self, role, message):
+        self.recent.append({"role": role, "message": message, "tokens": count_tokens(message)})
+        self._compact()
+
+    def _compact(self):
+        while self.recent_tokens() + self.summary_tokens > self.token_budget and len(self.recent) > MIN_RECENT_MESSAGES:
+            oldest = self.recent.pop(0)
+            line = self.summarizer(oldest["role"], oldest["message"])
+            self.summary_lines.append(line)
+            self.summary_tokens += count_tokens(line)
+
+        # Ringkasan juga dibatasi; baris paling lama dibuang lebih dulu
+        summary_budget = int(self.token_budget * SUMMARY_SHARE)
+        while self.summary_lines and self.summary_tokens > summary_budget:
+            self.summary_tokens -= count_tokens(self.summary_lines.pop(0))
+
+        # Pesan terbaru yang terlalu panjang dipotong, yang paling lama lebih dulu
+        for entry in list(self.recent):
+            excess = self.recent_tokens() + self.summary_tokens - self.token_budget
+            if excess <= 0:
+                break
+            entry["message"] = truncate_to_tokens(entry["message"], max(0, entry["tokens"] - excess))
+            entry["tokens"] = count_tokens(entry["message"])
+            if not entry["message"]:
+                self.recent.remove(entry)
+
+    def recent_tokens(self):
+        return sum(entry["tokens"] for entry in self.recent)
+
+    def context(self):
+        """Teks riwayat untuk prompt: ringkasan percakapan lama lalu pesan terbaru."""
+        parts = []
+        if self.summary_lines:
+            parts.append("Summary of earlier conversation:\n" + '\n'.join(self.summary_lines))
+        parts.extend(f"{ROLE_LABELS.get(entry['role'], entry['role'])}: {entry['message']}" for entry in self.recent)
+        return '\n'.join(parts)
+
+    def stats(self):
+        return {
+            "token_budget": self.token_budget,
+            "recent_messages": len(self.recent),
+            "recent_tokens": self.recent_tokens(),
+            "summary_lines": len(self.summary_lines),
+            "summary_tokens": self.summary_tokens,
+        }
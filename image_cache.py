@@ -0,0 +1,122 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Ukuran maksimum cache gambar (MB), bisa diubah lewat environment variable
+DEFAULT_MAX_MB = int(os.environ.get('GOGYM_IMAGE_CACHE_MB', '64'))
+
+
+class CachedFile:
+    """Isi file beserta metadata yang dibutuhkan untuk HTTP caching."""
+
+    __slots__ = ('data', 'etag', 'mtime')
+
+    def __init__(self, data, etag, mtime):
+        self.data = data
+        self.etag = etag
+        self.mtime = mtime
+
+
+class FileCache:
+    """
+    Cache LRU untuk isi file yang dibatasi total ukuran byte.
+
+    ETag (sha1 isi file) dihitung sekali saat file masuk cache. Cache hit tidak
+    menyentuh disk sama sekali; panggil clear() jika file di disk berubah.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        """Mengembalikan CachedFile untuk path, membaca dari disk jika belum ada di cache."""
+        entry = self.lookup(path)
+        return entry if entry is not None else self.load(path)
+
+    def lookup(self, path):
+        """CachedFile jika path ada di cache, selain itu None; tidak pernah menyentuh disk."""
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def load(self, path):
+        """Membaca file dari disk dan menyimpannya di cache."""
+        with open(path, 'rb') as f:
+            data = f.read()
+            mtime = os.fstat(f.fileno()).st_mtime
+        entry = CachedFile(data, hashlib.sha1(data).hexdigest(), mtime)
+
+        with self.lock:
+            self._store(path, entry)
+        return entry
+
+    def _store(self, path, entry):
+        old = self.entries.pop(path, None)
+        if old is not None:
+            self.current_bytes -= len(old.data)
+
+        # File yang lebih besar dari kapasitas cache tidak disimpan
+        if len(entry.data) > self.max_bytes:
+            return
+
+        self.entries[path] = entry
+        self.current_bytes += len(entry.data)
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.current_bytes -= len(evicted.data)
+            self.evictions += 1
+
+    def discard(self, paths):
+        """Membuang entri untuk file yang berubah di disk."""
+        with self.lock:
+            for path in paths:
+                entry = self.entries.pop(path, None)
+                if entry is not None:
+                    self.current_bytes -= len(entry.data)
+
+    def discard_stale(self):
+        """
+        Membuang entri yang file-nya berubah atau terhapus di disk (mtime berbeda) dan
+        mengembalikan path-nya. Hanya file yang ada di cache yang di-stat.
+        """
+        with self.lock:
+            cached = [(path, entry.mtime) for path, entry in self.entries.items()]
+        stale = []
+        for path, mtime in cached:
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    stale.append(path)
+            except FileNotFoundError:
+                stale.append(path)
+        self.discard(stale)
+        return stale
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
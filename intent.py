@@ -0,0 +1,357 @@
+"""
+Klasifikasi intent pertanyaan chat secara lokal (di bawah satu milidetik), supaya LLM
+hanya dipanggil untuk pertanyaan yang memang butuh jawaban bebas.
+
+Aturan regex menangani kasus yang jelas (soal matematika, "how to <latihan>", permintaan
+rencana, daftar latihan per facet). Sisanya diputuskan model naive Bayes multinomial yang
+dilatih saat start dari kalimat templat berisi kosakata katalog (nama latihan, otot,
+equipment) dan contoh pertanyaan di luar topik.
+"""
+import re
+import math
+import random
+from collections import Counter, defaultdict, namedtuple
+
+from search_index import SearchIndex, tokenize
+from name_matcher import NameMatcher
+import planner
+
+OUT_OF_SCOPE = 'out_of_scope'
+HOW_TO = 'how_to'
+FACET_LOOKUP = 'facet_lookup'
+PLAN = 'plan'
+# Pertanyaan fitness lain yang tetap dijawab LLM
+GENERAL = 'general'
+
+LABELS = (OUT_OF_SCOPE, HOW_TO, FACET_LOOKUP, PLAN, GENERAL)
+
+# Hasil klasifikasi; exercise_id untuk HOW_TO, selections ({facet: [nilai]}) untuk FACET_LOOKUP
+Intent = namedtuple('Intent', ['label', 'confidence', 'exercise_id', 'selections'], defaults=(None, None))
+
+# Ekspresi aritmetika seperti "3+3", "what is 12 * 7?", "hitung 5 x 4"
+MATH = re.compile(
+    r"^\s*(?:what\s+is|what's|whats|calculate|compute|solve|hitung|berapa)?\s*"
+    r"[-+(]*\d+(?:\.\d+)?\s*(?:[-+*/^x×÷]\s*[-+(]*\d+(?:\.\d+)?\s*\)*\s*)+=?\s*\??\s*$"
+)
+HOW_TO_PATTERN = re.compile(
+    r"\b(how\s+(?:to|do\s+(?:i|you)|should\s+i|can\s+i)|caranya|cara|instructions?|steps?|"
+    r"proper\s+form|technique|perform|teach\s+me)\b"
+)
+LOOKUP_PATTERN = re.compile(
+    r"\b(list|show|find|daftar)\b.*\b(exercises?|moves|stretch(?:es)?)\b"
+    r"|\b(which|what|any)\s+(?:\S+\s+){0,3}(exercises?|moves|stretch(?:es)?)\b"
+    r"|\b(exercises?|stretch(?:es)?)\s+(for|that|targeting|using|with)\b"
+)
+
+# Kata pengisi pertanyaan how-to yang dibuang sebelum sisa kalimat dicocokkan ke nama latihan
+HOW_TO_FILLER = {
+    'how', 'to', 'do', 'does', 'doing', 'i', 'you', 'we', 'a', 'an', 'the', 'perform', 'performing', 'exercise',
+    'exercises', 'instruction', 'instructions', 'for', 'of', 'on', 'give', 'me', 'show', 'tell', 'can', 'could',
+    'would', 'please', 'step', 'steps', 'proper', 'correct', 'form', 'technique', 'teach', 'explain', 'should',
+    'correctly', 'properly', 'what', 'is', 'are', 'caranya', 'cara', 'melakukan', 'gerakan', 'yang', 'benar',
+    'provide', 'and', 'with', 'image', 'images', 'picture', 'pictures',
+}
+# Nomor daftar di awal pertanyaan yang disalin dari daftar, misalnya "7. How do you ..."
+LIST_NUMBER = re.compile(r"^\s*\d+[.)]\s+")
+# Nama umum tanpa variasi -> latihan katalog yang paling dasar ("how to squat" -> Barbell Squat)
+HOW_TO_ALIASES = {
+    'squat': 'Barbell_Squat', 'push up': 'Pushups', 'press up': 'Pushups', 'pull up': 'Pullups',
+    'chin up': 'Chin-Up', 'deadlift': 'Barbell_Deadlift', 'bench press': 'Barbell_Bench_Press_-_Medium_Grip',
+    'bench': 'Barbell_Bench_Press_-_Medium_Grip', 'lunge': 'Dumbbell_Lunges', 'dip': 'Dips_-_Triceps_Version',
+    'bicep curl': 'Dumbbell_Bicep_Curl', 'biceps curl': 'Dumbbell_Bicep_Curl', 'curl': 'Dumbbell_Bicep_Curl',
+    'overhead press': 'Standing_Military_Press', 'military press': 'Standing_Military_Press',
+    'shoulder press': 'Standing_Military_Press', 'hip thrust': 'Barbell_Hip_Thrust', 'sit up': 'Sit-Up',
+    'mountain climber': 'Mountain_Climbers', 'bodyweight squat': 'Bodyweight_Squat', 'air squat': 'Bodyweight_Squat',
+    'rdl': 'Romanian_Deadlift', 'crunch': 'Crunches',
+}
+# Skor BM25 minimum agar hasil teratas dipakai sebagai latihan yang ditanyakan
+HOW_TO_MIN_SCORE = 6.0
+
+
+def compact_name(text):
+    """Kunci nama tanpa spasi/tanda baca dan tanpa s jamak: "Push-Up", "push ups", "Pushups" -> "pushup"."""
+    key = re.sub(r"[^a-z0-9]", '', text.lower())
+    return key[:-1] if len(key) > 3 and key.endswith('s') and not key.endswith('ss') else key
+
+
+# Kata domain selain otot/equipment/kategori katalog; pertanyaan yang menyebut salah satunya
+# (atau nama latihan lengkap) tidak pernah ditolak
+FITNESS_WORDS = {
+    'workout', 'exercise', 'gym', 'train', 'training', 'muscle', 'strength', 'cardio', 'rep', 'set',
+    'fitness', 'weight', 'fat', 'body', 'stretch', 'plan', 'routine', 'lift', 'lifting', 'warm', 'rest',
+    'sore', 'soreness', 'protein', 'run', 'running', 'abs', 'core', 'arm', 'leg', 'back', 'chest', 'shoulder',
+    'latihan', 'olahraga', 'otot', 'squat', 'pushup', 'pullup', 'deadlift', 'bench', 'yoga', 'hiit', 'calisthenic',
+}
+
+# Model hanya menolak jika cukup yakin dan tidak ada kata domain sama sekali
+OUT_OF_SCOPE_THRESHOLD = 0.75
+
+MUSCLE_ALIASES = {
+    'abs': ('abdominals',), 'core': ('abdominals',), 'quads': ('quadriceps',), 'hams': ('hamstrings',),
+    'lats': ('lats',), 'back': ('lats', 'middle back', 'lower back'), 'legs': ('quadriceps', 'hamstrings', 'glutes', 'calves'),
+    'arms': ('biceps', 'triceps', 'forearms'), 'shoulders': ('shoulders',), 'traps': ('traps',),
+}
+CATEGORY_WORDS = {
+    'cardio': 'cardio', 'stretch': 'stretching', 'stretching': 'stretching', 'plyometric': 'plyometrics',
+    'plyometrics': 'plyometrics', 'powerlifting': 'powerlifting', 'strongman': 'strongman',
+    'olympic': 'olympic weightlifting',
+}
+
+OUT_OF_SCOPE_EXAMPLES = (
+    "what is the weather like today", "tell me a joke", "who is the president of the united states",
+    "write a python function to sort a list", "what is the capital of france", "recipe for spaghetti carbonara",
+    "translate this sentence to french", "what is the stock price of apple", "recommend a good movie",
+    "how do i fix my laptop", "what time is it in tokyo", "who won the world cup", "explain quantum physics",
+    "write me a poem about the sea", "how do i cook rice", "what is the meaning of life", "solve this equation for x",
+    "what is the square root of 144", "how many planets are in the solar system", "book a flight to bali",
+    "what is bitcoin", "help me with my homework", "write an email to my boss", "what is the best phone to buy",
+    "who wrote harry potter", "how does the internet work", "siapa presiden indonesia", "resep nasi goreng",
+    "what is two plus two", "calculate my taxes", "tell me about the history of rome", "sing a song",
+    "what language should i learn to code", "how to make money online", "what is the population of china",
+)
+GENERAL_EXAMPLES = (
+    "hi", "hello there", "thanks", "thank you so much", "can you help me", "what can you do",
+    "is it okay to train every day", "how many sets should i do", "should i do cardio before weights",
+    "how long should i rest between sets", "why are my muscles sore after training", "how do i lose belly fat",
+    "what should i eat after a workout", "is it better to lift heavy or light", "how often should i stretch",
+    "what is progressive overload", "how much protein do i need to build muscle", "can i train abs every day",
+    "what is the difference between strength and hypertrophy", "how do i stay motivated to go to the gym",
+    "make it harder", "can you replace the second exercise", "what about the rest days", "is that enough for beginners",
+    "how can i make my workouts harder", "how do i progress on squats", "what can i do instead of pull ups",
+)
+HOW_TO_TEMPLATES = (
+    "how to do {name}", "how do i perform {name}", "instructions for {name}", "what is the proper form for {name}",
+    "steps to do {name}", "caranya {name}", "cara melakukan {name}", "explain the {name} technique",
+    "teach me the {name}", "how should i do {name} correctly",
+)
+LOOKUP_TEMPLATES = (
+    "list {muscle} exercises", "show me exercises for {muscle}", "which exercises use {equipment}",
+    "{level} exercises for {muscle}", "what {equipment} exercises are there", "exercises that target {muscle}",
+    "give me {category} exercises", "find {equipment} exercises for {muscle}", "any {muscle} stretches",
+)
+PLAN_TEMPLATES = (
+    "give me a {days}-day {focus} plan", "{days} week workout program for a {level}", "weekly workout schedule",
+    "provide training sessions for a month", "{focus} routine {days} days a week", "make me a {level} workout plan",
+    "i don't have any equipment give me a {days} week training session", "monthly {focus} training plan",
+)
+OUT_OF_SCOPE_TEMPLATES = (
+    "what is the {topic}", "tell me about {topic}", "how do i {task}", "how to {task}", "can you {task}", "help me {task}",
+    "write a {artifact} about {topic}", "who is the best {person}", "explain {topic} to me", "what do you think about {topic}",
+)
+OUT_OF_SCOPE_TOPICS = (
+    'weather tomorrow', 'latest news', 'election results', 'stock market', 'bitcoin price', 'movie of the year',
+    'capital of japan', 'history of europe', 'python programming', 'javascript', 'machine learning', 'climate change',
+    'football score', 'world cup', 'music charts', 'best pizza in town', 'exchange rate', 'solar system', 'harry potter',
+    'politics', 'my car insurance', 'interest rates', 'the meaning of life', 'global economy', 'video games',
+)
+OUT_OF_SCOPE_TASKS = (
+    'fix my laptop', 'cook pasta', 'bake a cake', 'book a hotel', 'learn guitar', 'write code', 'file my taxes',
+    'translate a letter', 'repair my car', 'invest money', 'plant tomatoes', 'install windows', 'write an essay',
+    'solve this math problem', 'make a website', 'apply for a visa', 'clean my house', 'pass my exam',
+    'make money online', 'make a cake', 'make coffee', 'build a website', 'create a logo', 'give a presentation',
+)
+OUT_OF_SCOPE_ARTIFACTS = ('poem', 'story', 'song', 'essay', 'email', 'joke', 'script', 'report')
+OUT_OF_SCOPE_PEOPLE = ('singer', 'actor', 'football player', 'president', 'movie director', 'programmer')
+FOCUS_WORDS = ('strength', 'cardio', 'stretching', 'full body', 'upper body', 'leg', 'muscle building')
+
+# Jumlah kalimat templat per label untuk data latih
+EXAMPLES_PER_TEMPLATE = 12
+
+
+def build_examples(records, seed=0):
+    """Kalimat latih (label, teks) yang dibuat deterministik dari kosakata katalog."""
+    rng = random.Random(seed)
+    names = sorted(record['name'] for record in records)
+    muscles = sorted({muscle for record in records for muscle in record.get('primaryMuscles') or []})
+    equipment = sorted({record['equipment'] for record in records if record.get('equipment')})
+    categories = sorted({record['category'] for record in records if record.get('category')})
+
+    def fill(template):
+        return template.format(
+            name=rng.choice(names), muscle=rng.choice(muscles), equipment=rng.choice(equipment),
+            category=rng.choice(categories), level=rng.choice(planner.LEVELS), days=rng.randint(2, 6),
+            focus=rng.choice(FOCUS_WORDS), topic=rng.choice(OUT_OF_SCOPE_TOPICS), task=rng.choice(OUT_OF_SCOPE_TASKS),
+            artifact=rng.choice(OUT_OF_SCOPE_ARTIFACTS), person=rng.choice(OUT_OF_SCOPE_PEOPLE),
+        )
+
+    examples = [(OUT_OF_SCOPE, text) for text in OUT_OF_SCOPE_EXAMPLES]
+    examples += [(GENERAL, text) for text in GENERAL_EXAMPLES]
+    generated = (
+        (OUT_OF_SCOPE, OUT_OF_SCOPE_TEMPLATES), (HOW_TO, HOW_TO_TEMPLATES),
+        (FACET_LOOKUP, LOOKUP_TEMPLATES), (PLAN, PLAN_TEMPLATES),
+    )
+    for label, templates in generated:
+        for template in templates:
+            examples += [(label, fill(template)) for _ in range(EXAMPLES_PER_TEMPLATE if '{' in template else 1)]
+    return examples
+
+
+class NaiveBayes:
+    """
+    Naive Bayes multinomial dengan Laplace smoothing atas token search_index.tokenize.
+    Prior dibuat seragam karena jumlah kalimat templat per label tidak mencerminkan trafik.
+    Jumlah token tiap label juga disamakan (diskalakan ke label terbesar), supaya label
+    dengan data latih sedikit tidak menang hanya karena kata asing lebih murah di sana
+    dan label dengan banyak templat tidak mendominasi kata umum seperti "make".
+    """
+
+    def __init__(self, examples, alpha=1.0):
+        counts = defaultdict(Counter)
+        for label, text in examples:
+            counts[label].update(tokenize(text))
+        target = max(sum(label_counts.values()) for label_counts in counts.values())
+        for label, label_counts in counts.items():
+            scale = target / sum(label_counts.values())
+            counts[label] = Counter({token: count * scale for token, count in label_counts.items()})
+
+        self.vocabulary = {token for label_counts in counts.values() for token in label_counts}
+        self.priors = {label: math.log(1 / len(counts)) for label in counts}
+        self.log_likelihood = {}
+        self.unknown = {}
+        for label, label_counts in counts.items():
+            denominator = sum(label_counts.values()) + alpha * (len(self.vocabulary) + 1)
+            self.log_likelihood[label] = {token: math.log((count + alpha) / denominator) for token, count in label_counts.items()}
+            self.unknown[label] = math.log(alpha / denominator)
+
+    def predict(self, text):
+        """(label, probabilitas) dengan probabilitas posterior tertinggi."""
+        tokens = tokenize(text)
+        scores = {
+            label: prior + sum(self.log_likelihood[label].get(token, self.unknown[label]) for token in tokens)
+            for label, prior in self.priors.items()
+        }
+        best = max(scores, key=scores.get)
+        total = sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, 1.0 / total
+
+
+class IntentClassifier:
+    def __init__(self, records, matcher=None, search=None):
+        records = list(records)
+        self.matcher = matcher or NameMatcher(records)
+        if search is None:
+            search = SearchIndex([record['id'] for record in records], {record['id']: record for record in records})
+        self.search = search
+
+        # Kunci nama ringkas -> id, dari nama dan id katalog ditambah alias nama umum
+        self.compact_names = {}
+        for record in records:
+            for name in (record['name'], record['id']):
+                self.compact_names.setdefault(compact_name(name), record['id'])
+        known = {record['id'] for record in records}
+        for alias, exercise_id in HOW_TO_ALIASES.items():
+            if exercise_id in known:
+                self.compact_names.setdefault(compact_name(alias), exercise_id)
+        self.model = NaiveBayes(build_examples(records))
+        self.muscles = sorted({muscle for record in records for muscle in record.get('primaryMuscles') or []})
+
+        # Token nama latihan tidak dipakai di sini karena banyak yang umum ("car", "world");
+        # nama latihan lengkap dicek lewat matcher
+        self.domain_words = set(FITNESS_WORDS)
+        for record in records:
+            for field in ('equipment', 'category'):
+                self.domain_words.update(tokenize(record.get(field) or ''))
+        for muscle in self.muscles:
+            self.domain_words.update(tokenize(muscle))
+
+    def selections(self, lowered):
+        """Nilai facet yang disebut di teks, untuk FacetIndex.filter."""
+        selections = {}
+        muscles = [muscle for muscle in self.muscles if re.search(rf"\b{muscle}\b", lowered)]
+        for alias, values in MUSCLE_ALIASES.items():
+            if re.search(rf"\b{alias}\b", lowered):
+                muscles += [value for value in values if value not in muscles]
+        if muscles:
+            selections['primaryMuscles'] = muscles
+
+        if planner.NO_EQUIPMENT.search(lowered):
+            selections['equipment'] = ['body only']
+        else:
+            equipment = [value for word, value in planner.EQUIPMENT_WORDS if re.search(rf"\b{re.escape(word)}", lowered)]
+            if equipment:
+                selections['equipment'] = list(dict.fromkeys(equipment))
+
+        level = next((name for name, pattern in planner.LEVEL_PATTERNS if pattern.search(lowered)), None)
+        if level:
+            selections['level'] = [level]
+
+        categories = [value for word, value in CATEGORY_WORDS.items() if re.search(rf"\b{word}\b", lowered)]
+        if categories:
+            selections['category'] = list(dict.fromkeys(categories))
+        return selections
+
+    def how_to_exercise(self, text):
+        """
+        Id latihan yang ditanyakan di pertanyaan how-to, atau None.
+
+        Urutannya: tepat satu nama katalog disebut persis dan sisanya hanya kata pengisi;
+        sisa kalimat setelah kata pengisi dibuang cocok dengan nama/alias ringkas
+        ("push up" -> Pushups); terakhir hasil BM25 teratas yang namanya memuat semua kata
+        query, tanpa koreksi typo dan di atas HOW_TO_MIN_SCORE.
+        """
+        text = LIST_NUMBER.sub('', text)
+        matches = self.matcher.find_all(text)
+        if matches:
+            # Selain nama latihan hanya boleh ada kata pengisi; "how can i make pushups harder"
+            # atau "how do i replace barbell squat" butuh jawaban LLM, bukan instruksi katalog
+            rest = text
+            for match in reversed(matches):
+                rest = rest[:match.start] + ' ' + rest[match.end:]
+            leftover = [word for word in re.findall(r"[a-z0-9]+", rest.lower()) if word not in HOW_TO_FILLER]
+            exercise_ids = {match.id for match in matches}
+            return exercise_ids.pop() if len(exercise_ids) == 1 and not leftover else None
+
+        words = [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in HOW_TO_FILLER]
+        if not words:
+            return None
+        phrase = ' '.join(words)
+        exercise_id = self.compact_names.get(compact_name(phrase))
+        if exercise_id:
+            return exercise_id
+
+        terms = set(tokenize(phrase))
+        _, results, corrections = self.search.search(phrase, 10)
+        if not terms or corrections:
+            return None
+        candidates = [
+            (len(self.search.analyzed[result['id']][2]), -result['score'], result['id'])
+            for result in results
+            if result['score'] >= HOW_TO_MIN_SCORE and terms <= self.search.analyzed[result['id']][2]
+        ]
+        return min(candidates)[2] if candidates else None
+
+    def classify(self, text):
+        lowered = text.lower().strip()
+        if not lowered:
+            return Intent(GENERAL, 1.0)
+        if MATH.match(lowered):
+            return Intent(OUT_OF_SCOPE, 1.0)
+
+        if HOW_TO_PATTERN.search(lowered) and not planner.PLAN_NOUNS.search(lowered):
+            exercise_id = self.how_to_exercise(text)
+            if exercise_id:
+                return Intent(HOW_TO, 1.0, exercise_id)
+
+        if planner.parse_request(text) is not None:
+            return Intent(PLAN, 1.0)
+
+        if LOOKUP_PATTERN.search(lowered):
+            selections = self.selections(lowered)
+            if selections:
+                return Intent(FACET_LOOKUP, 1.0, selections=selections)
+
+        label, confidence = self.model.predict(text)
+        if label == OUT_OF_SCOPE:
+            # Penolakan hanya jika tidak ada satu pun kata domain; kasus ragu diteruskan ke LLM
+            in_domain = self.domain_words.intersection(tokenize(text)) or self.matcher.find_all(text)
+            if confidence < OUT_OF_SCOPE_THRESHOLD or in_domain:
+                return Intent(GENERAL, 1.0 - confidence)
+            return Intent(OUT_OF_SCOPE, confidence)
+        if label == HOW_TO:
+            # Tanpa kata tanya "how to" dan satu nama latihan (aturan di atas), misalnya
+            # "good morning", jawabannya diserahkan ke LLM
+            return Intent(GENERAL, confidence)
+        if label == FACET_LOOKUP:
+            selections = self.selections(lowered)
+            return Intent(FACET_LOOKUP, confidence, selections=selections) if selections else Intent(GENERAL, confidence)
+        return Intent(label, confidence)
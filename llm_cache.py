@@ -0,0 +1,120 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from exercise_index import BASE_DIR
+
+DEFAULT_PATH = os.environ.get('GOGYM_LLM_CACHE_PATH', os.path.join(BASE_DIR, '.cache', 'llm_cache.sqlite3'))
+DEFAULT_TTL_SECONDS = int(os.environ.get('GOGYM_LLM_CACHE_TTL', str(7 * 24 * 60 * 60)))
+DEFAULT_MAX_ENTRIES = int(os.environ.get('GOGYM_LLM_CACHE_MAX_ENTRIES', '5000'))
+
+
+def normalize_question(question):
+    """Huruf kecil, spasi dirapikan dan tanda baca di akhir dibuang."""
+    question = ' '.join(question.lower().split())
+    return re.sub(r'[\s?!.]+$', '', question)
+
+
+def make_key(question, history, prompt_version, model, **extra):
+    """
+    Kunci cache: hash dari pertanyaan yang dinormalisasi, jendela riwayat percakapan,
+    versi template prompt, nama model dan parameter lain yang memengaruhi jawaban.
+    """
+    material = {
+        "question": normalize_question(question),
+        "history": [' '.join(message.split()) for message in history],
+        "prompt_version": prompt_version,
+        "model": model,
+        "extra": extra,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Cache jawaban LLM di SQLite lokal dengan TTL, batas jumlah entry (eviksi LRU)
+    dan statistik hit-rate.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+
+    def get(self, key):
+        """Jawaban yang tersimpan untuk key, atau None jika belum ada atau sudah kedaluwarsa."""
+        now = time.time()
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, response):
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        # Buang entry kedaluwarsa, lalu entry yang paling lama tidak diakses jika melebihi batas
+        self.connection.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        self.connection.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def get_or_generate(self, key, generate):
+        """Mengembalikan (jawaban, cache_hit); generate() hanya dipanggil saat cache miss."""
+        response = self.get(key)
+        if response is not None:
+            return response, True
+        response = generate()
+        self.set(key, response)
+        return response, False
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self.lock:
+            entries = self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
@@ -0,0 +1,115 @@
+"""
+Load generator lokal untuk membandingkan server API (Flask dev server vs ASGI).
+
+Setiap koneksi mensimulasikan halaman chat: satu request /list_all diikuti beberapa
+request gambar dan detail latihan, dengan koneksi keep-alive.
+
+    python loadgen.py --url http://127.0.0.1:5000 --concurrency 32 --duration 10
+    python loadgen.py --url http://127.0.0.1:8000 --concurrency 32 --duration 10 --json
+"""
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+from urllib.parse import quote, urlsplit
+
+from exercise_index import load_records
+
+# Jumlah request gambar dan detail per request /list_all
+IMAGES_PER_PAGE = 4
+DETAILS_PER_PAGE = 2
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    position = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[position]
+
+
+def page_paths(records, rng):
+    """Urutan path untuk satu kunjungan halaman chat."""
+    paths = ['/list_all']
+    for record in rng.sample(records, IMAGES_PER_PAGE):
+        paths.append(f"/exercises/{quote(record['id'])}/images/{rng.randint(0, 1)}.jpg")
+    for record in rng.sample(records, DETAILS_PER_PAGE):
+        paths.append(f"/exercises/{quote(record['id'])}")
+    return paths
+
+
+def worker(url, records, deadline, seed, results):
+    parts = urlsplit(url)
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    latencies, errors, received = [], 0, 0
+
+    while time.perf_counter() < deadline:
+        for path in page_paths(records, rng):
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+                response = connection.getresponse()
+                received += len(response.read())
+                if response.status >= 400:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    connection.close()
+    results.append((latencies, errors, received))
+
+
+def run(url, concurrency, duration, seed=0):
+    records = load_records()
+    results = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(url, records, deadline, seed + i, results))
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "duration": round(elapsed, 2),
+        "requests": len(latencies),
+        "errors": sum(result[1] for result in results),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "bytes": sum(result[2] for result in results),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate chat-page-like load against the exercise API.")
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print the result as JSON")
+    args = parser.parse_args()
+
+    summary = run(args.url, args.concurrency, args.duration, args.seed)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(
+            f"{summary['url']}: {summary['requests']} requests in {summary['duration']}s "
+            f"({summary['throughput_rps']} req/s, {summary['errors']} errors) "
+            f"p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, p99 {summary['p99_ms']} ms"
+        )
@@ -0,0 +1,222 @@
+"""
+Metrik ringan (counter, histogram, gauge) dengan output format teks Prometheus,
+tanpa dependensi tambahan. Dipakai oleh api.py (route /metrics) dan chatme.py.
+"""
+import os
+import io
+import time
+import random
+import pstats
+import cProfile
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bucket latensi request HTTP (detik)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names, values, extra=()):
+    pairs = [f'{name}="{escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self.lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+
+
+class Histogram:
+    """Histogram kumulatif per kombinasi label; observe() hanya bisect dan beberapa penjumlahan."""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        position = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                # [hitungan per bucket (+Inf di akhir), jumlah nilai]
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self.lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self.series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                label_text = format_labels(self.labelnames, labels, [('le', format_value(bound))])
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {format_value(total)}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class Gauge:
+    """Gauge yang nilainya dibaca saat /metrics dipanggil: callback -> {label tuple: nilai}."""
+
+    def __init__(self, name, documentation, callback, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in sorted(self.callback().items()):
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _register(self, metric):
+        with self.lock:
+            # Modul yang di-import ulang (misalnya oleh Streamlit) memakai metrik yang sudah ada
+            return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback, labelnames=()):
+        with self.lock:
+            # Callback selalu diganti dengan yang terbaru
+            self.metrics[name] = Gauge(name, documentation, callback, labelnames)
+            return self.metrics[name]
+
+    def render(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class SlowRequestProfiler:
+    """
+    Profiling cProfile untuk sebagian kecil request (sample_rate). Jika request yang
+    diprofil lebih lambat dari threshold_ms, fungsi terberat dicetak dan file .prof
+    disimpan di output_dir untuk dibuka dengan snakeviz/pstats.
+    """
+
+    def __init__(self, sample_rate=0.0, threshold_ms=500.0, output_dir=None, top=20):
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+        self.output_dir = output_dir
+        self.top = top
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            sample_rate=float(os.environ.get('GOGYM_PROFILE_SAMPLE_RATE', '0')),
+            threshold_ms=float(os.environ.get('GOGYM_PROFILE_SLOW_MS', '500')),
+            output_dir=os.environ.get('GOGYM_PROFILE_DIR', os.path.join(BASE_DIR, '.cache', 'profiles')),
+        )
+
+    def start(self):
+        """Profiler yang sudah berjalan, atau None jika request ini tidak diambil sampelnya."""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        # cProfile hanya bisa aktif satu per proses, jadi request lain yang bersamaan dilewati
+        if not self.lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            self.lock.release()
+            return None
+        return profiler
+
+    def stop(self, profiler, name, duration):
+        profiler.disable()
+        self.lock.release()
+        if duration * 1000 < self.threshold_ms:
+            return None
+
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(self.top)
+        print(f"Slow request {name} ({duration * 1000:.0f} ms):\n{output.getvalue()}")
+
+        path = None
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            safe_name = ''.join(char if char.isalnum() else '_' for char in name).strip('_')
+            path = os.path.join(self.output_dir, f"{safe_name}-{int(time.time() * 1000)}.prof")
+            profiler.dump_stats(path)
+        return path
+
+
+def serve(port, registry=REGISTRY, host='127.0.0.1'):
+    """Server HTTP kecil di thread daemon yang hanya melayani /metrics (untuk proses non-Flask)."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
@@ -0,0 +1,117 @@
+from collections import deque, namedtuple
+
+# Satu nama latihan yang ditemukan di teks; start/end adalah posisi di teks asli
+Match = namedtuple('Match', ['id', 'start', 'end', 'text'])
+
+
+def normalize(text):
+    """
+    Huruf kecil dengan semua karakter non-alfanumerik menjadi satu spasi.
+    Mengembalikan (teks normal, posisi asli untuk setiap karakter teks normal).
+    """
+    chars = [' ']
+    positions = [-1]
+    for position, char in enumerate(text.lower()):
+        if char.isalnum():
+            chars.append(char)
+            positions.append(position)
+        elif chars[-1] != ' ':
+            chars.append(' ')
+            positions.append(position)
+    if chars[-1] != ' ':
+        chars.append(' ')
+        positions.append(len(text))
+    return ''.join(chars), positions
+
+
+def aliases(record):
+    """Nama, id dan bentuk jamak dari nama latihan."""
+    names = {record['name'], record['id']}
+    for name in list(names):
+        normalized = normalize(name)[0].strip()
+        if normalized and not normalized.endswith('s'):
+            names.add(normalized + 's')
+    return names
+
+
+class NameMatcher:
+    """
+    Automaton Aho-Corasick atas nama latihan yang dinormalisasi.
+
+    Semua nama yang disebut di sebuah teks ditemukan dalam satu kali lintasan,
+    dengan batas kata dijaga lewat spasi di awal dan akhir setiap pola.
+    """
+
+    def __init__(self, records):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for record in records:
+            for alias in aliases(record):
+                pattern = normalize(alias)[0]
+                if pattern.strip():
+                    self._add(pattern, record['id'])
+        self._build_failure_links()
+
+    def _add(self, pattern, exercise_id):
+        state = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        # Alias yang sama untuk dua latihan: latihan pertama yang dipakai
+        if not self.output[state]:
+            self.output[state].append((len(pattern), exercise_id))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, text):
+        """
+        Semua latihan yang disebut di teks, berurutan sesuai posisi.
+        Jika beberapa nama tumpang tindih, nama terpanjang yang dipilih.
+        """
+        normalized, positions = normalize(text)
+        candidates = []
+        state = 0
+        for index, char in enumerate(normalized):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, exercise_id in self.output[state]:
+                # Spasi pembatas di awal dan akhir pola tidak dihitung sebagai bagian nama
+                candidates.append((index - length + 2, index - 1, exercise_id))
+
+        # Nama terpanjang diterima lebih dulu, lalu nama lain yang tidak tumpang tindih
+        covered = bytearray(len(normalized))
+        accepted = []
+        for start, end, exercise_id in sorted(candidates, key=lambda item: (item[0] - item[1], item[0])):
+            if not any(covered[start:end + 1]):
+                covered[start:end + 1] = b'\x01' * (end + 1 - start)
+                accepted.append((start, end, exercise_id))
+
+        matches = []
+        for start, end, exercise_id in sorted(accepted):
+            original_start, original_end = positions[start], positions[end] + 1
+            matches.append(Match(exercise_id, original_start, original_end, text[original_start:original_end]))
+        return matches
+
+    def best_match(self, text):
+        """Nama latihan terpanjang yang disebut di teks, atau None."""
+        matches = self.find_all(text)
+        if not matches:
+            return None
+        return max(matches, key=lambda match: match.end - match.start)
@@ -0,0 +1,422 @@
+"""
+Perencana latihan lokal dan deterministik untuk permintaan rencana baru yang sederhana
+("give me a 5-day strength plan", "create a 2 week beginner plan with no equipment"),
+tanpa memanggil LLM.
+
+Parameter (hari per minggu, durasi, level, equipment, fokus) dibaca dengan regex, lalu
+setiap slot latihan dipilih dari bitmap FacetIndex (otot utama, force, level, equipment,
+kategori). Permintaan yang tidak bisa ditangani mengembalikan None sehingga dijawab LLM.
+"""
+import re
+import hashlib
+from collections import namedtuple
+
+from facet_index import iter_bits
+
+NUMBER_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7}
+# "a"/"an" sengaja tidak dihitung sebagai angka: "3 days a week" atau "2 workouts a day" bukan durasi
+NUMBER = r"\b(\d+|one|two|three|four|five|six|seven)"
+
+PLAN_NOUNS = re.compile(r"\b(plans?|programs?|programmes?|schedules?|routines?|splits?|challenge)\b")
+
+# Hanya permintaan eksplisit (kata kerja membuat + kata benda rencana) yang dijawab perencana
+GENERATION_REQUEST = re.compile(
+    r"\b(create|make|give|build|generate|design|provide|prepare|write|put\s+together|draw\s+up|"
+    r"buat\w*|berikan|kasih)\b.*\b(plans?|programs?|programmes?|schedules?|routines?|splits?|challenge|"
+    r"sessions?|jadwal|program\s+latihan)\b"
+)
+# Permintaan sopan berbentuk pertanyaan ("can you give me a 3-day plan?") tetap dihitung permintaan
+POLITE_REQUEST = re.compile(
+    r"^\s*(please\s+)?(can|could|would|will)\s+you\s+(please\s+)?"
+    r"(create|make|give|build|generate|design|provide|prepare|write|put\s+together|draw\s+up)\b"
+)
+QUESTION = re.compile(
+    r"\?|^\s*(how|what|what's|whats|why|when|which|who|is|are|am|should|can|could|would|will|do|does|did|"
+    r"was|were|apakah|bagaimana|berapa)\b"
+)
+# Rujukan ke percakapan sebelumnya ("make the plan harder", "swap the deadlift in my plan")
+CONTEXT_REFERENCE = re.compile(
+    r"\b(this|that|these|those|my|the|your|our|current|previous|same|above|last|it)\s+(?:\w+\s+){0,2}"
+    r"(plans?|programs?|programmes?|routines?|schedules?|splits?|sessions?|one)\b"
+    r"|\b(swap|replace|change|modify|adjust|harder|easier|instead)\b"
+)
+
+DAYS_PER_WEEK = re.compile(NUMBER + r"\s*(?:-\s*)?(?:days?|times|x)\s*(?:a|per|each|every|/)\s*week")
+N_DAY = re.compile(NUMBER + r"\s*-?\s*days?\b")
+WEEKS = re.compile(NUMBER + r"\s*-?\s*weeks?\b")
+MONTHS = re.compile(NUMBER + r"\s*-?\s*months?\b")
+ONE_MONTH = re.compile(r"\b(a|one|per)\s+month\b|\bmonthly\b")
+
+# Permintaan yang butuh penilaian manusia/LLM (cedera, diet, dll.)
+UNSUPPORTED = re.compile(
+    r"\b(injur\w*|pain\w*|rehab\w*|pregnan\w*|diet\w*|meals?|nutrition|calories?|marathon|surgery|doctor|"
+    r"sport\w*|football|soccer|basketball|tennis|swim\w*)\b"
+)
+
+# Pertanyaan panjang biasanya berisi nuansa yang lebih baik dijawab LLM
+MAX_WORDS = 40
+
+LEVEL_PATTERNS = (
+    ('expert', re.compile(r"\b(advanced|expert|experienced|athlete)\b")),
+    ('intermediate', re.compile(r"\b(intermediate|moderate)\b")),
+    ('beginner', re.compile(r"\b(beginners?|novice|newbie|new to|just start\w*|starting out)\b")),
+)
+
+NO_EQUIPMENT = re.compile(
+    r"\b(no|without|zero)\s+(any\s+)?(equipment|gear|weights)\b|\bbody\s*-?weight\b|\bcalisthenics\b|"
+    r"\bat home\b|\b(don'?t|do not|dont)\s+have\s+(any\s+)?(equipment|weights|gear)\b"
+)
+EQUIPMENT_WORDS = (
+    ('dumbbell', 'dumbbell'), ('barbell', 'barbell'), ('kettlebell', 'kettlebells'), ('cable', 'cable'),
+    ('machine', 'machine'), ('band', 'bands'), ('medicine ball', 'medicine ball'), ('exercise ball', 'exercise ball'),
+    ('stability ball', 'exercise ball'), ('ez bar', 'e-z curl bar'), ('e-z', 'e-z curl bar'), ('foam roll', 'foam roll'),
+)
+
+# Fokus kategori (urutan menentukan prioritas jika beberapa disebut)
+FOCUS_PATTERNS = (
+    ('stretching', re.compile(r"\b(stretch\w*|flexib\w*|mobility|yoga)\b")),
+    ('cardio', re.compile(r"\b(cardio|conditioning|endurance|hiit|stamina|fat loss|lose weight)\b")),
+    ('plyometrics', re.compile(r"\b(plyo\w*|jump\w*|explosive\w*|power)\b")),
+    ('strength', re.compile(r"\b(strength|strong\w*|muscle\w*|hypertrophy|bulk\w*|build\w*)\b")),
+)
+
+# Fokus kelompok otot -> otot utama di dataset
+MUSCLE_FOCUS = (
+    ('upper body', ('chest', 'lats', 'shoulders')),
+    ('lower body', ('quadriceps', 'hamstrings', 'glutes')),
+    ('legs', ('quadriceps', 'hamstrings', 'glutes')),
+    ('arms', ('biceps', 'triceps')),
+    ('back', ('lats', 'middle back')),
+    ('chest', ('chest',)),
+    ('shoulders', ('shoulders',)),
+    ('abs', ('abdominals',)),
+    ('core', ('abdominals',)),
+    ('glutes', ('glutes',)),
+)
+
+LEVELS = ('beginner', 'intermediate', 'expert')
+DEFAULT_DAYS = {'beginner': 3, 'intermediate': 4, 'expert': 5}
+EXERCISES_PER_DAY = {'beginner': 5, 'intermediate': 6, 'expert': 6}
+MAX_WEEKS = 4
+MAX_TRAINING_DAYS = 6
+
+# Kategori latihan beban yang boleh dipakai per level
+STRENGTH_CATEGORIES = {
+    'beginner': ('strength',),
+    'intermediate': ('strength', 'powerlifting'),
+    'expert': ('strength', 'powerlifting', 'olympic weightlifting', 'strongman'),
+}
+
+# Hari latihan dalam satu minggu (hari lain adalah rest day)
+LAYOUTS = {1: (1,), 2: (1, 4), 3: (1, 3, 5), 4: (1, 2, 4, 5), 5: (1, 2, 3, 5, 6), 6: (1, 2, 3, 4, 5, 6)}
+
+# Satu slot latihan: otot utama (None = bebas), force dan kategori (None = kategori rencana)
+Slot = namedtuple('Slot', ['muscles', 'force', 'category'], defaults=(None, None))
+
+SESSIONS = {
+    'full': ('Full body', (
+        Slot(('quadriceps',)), Slot(('chest',), 'push'), Slot(('lats', 'middle back'), 'pull'),
+        Slot(('hamstrings', 'glutes')), Slot(('shoulders',), 'push'), Slot(('abdominals',)),
+    )),
+    'push': ('Push', (
+        Slot(('chest',), 'push'), Slot(('shoulders',), 'push'), Slot(('chest',), 'push'),
+        Slot(('triceps',), 'push'), Slot(('shoulders',), 'push'), Slot(('abdominals',)),
+    )),
+    'pull': ('Pull', (
+        Slot(('lats',), 'pull'), Slot(('middle back',), 'pull'), Slot(('biceps',), 'pull'),
+        Slot(('lats', 'middle back'), 'pull'), Slot(('biceps', 'forearms'), 'pull'), Slot(('lower back', 'traps')),
+    )),
+    'legs': ('Legs', (
+        Slot(('quadriceps',)), Slot(('hamstrings',)), Slot(('glutes',)),
+        Slot(('quadriceps',)), Slot(('calves',)), Slot(('abdominals',)),
+    )),
+    'upper': ('Upper body', (
+        Slot(('chest',), 'push'), Slot(('lats', 'middle back'), 'pull'), Slot(('shoulders',), 'push'),
+        Slot(('middle back', 'lats'), 'pull'), Slot(('biceps',), 'pull'), Slot(('triceps',), 'push'),
+    )),
+    'lower': ('Lower body', (
+        Slot(('quadriceps',)), Slot(('hamstrings',)), Slot(('glutes',)),
+        Slot(('calves',)), Slot(('abdominals',)), Slot(('lower back',)),
+    )),
+    'conditioning': ('Conditioning', (
+        Slot(None, None, 'cardio'), Slot(('quadriceps', 'hamstrings', 'glutes'), None, 'plyometrics'),
+        Slot(None, None, 'plyometrics'), Slot(('abdominals',)), Slot(None, None, 'cardio'), Slot(('shoulders', 'chest'), 'push'),
+    )),
+    'mobility': ('Mobility', (
+        Slot(('hamstrings',), None, 'stretching'), Slot(('quadriceps',), None, 'stretching'),
+        Slot(('chest', 'shoulders'), None, 'stretching'), Slot(('lower back', 'middle back'), None, 'stretching'),
+        Slot(('glutes', 'adductors', 'abductors'), None, 'stretching'), Slot(('calves',), None, 'stretching'),
+    )),
+}
+
+# Rotasi sesi per jumlah hari latihan untuk fokus kekuatan
+SPLITS = {
+    1: ('full',),
+    2: ('full', 'full'),
+    3: ('push', 'pull', 'legs'),
+    4: ('upper', 'lower', 'upper', 'lower'),
+    5: ('push', 'pull', 'legs', 'upper', 'lower'),
+    6: ('push', 'pull', 'legs', 'push', 'pull', 'legs'),
+}
+
+# Skema set x repetisi: (latihan compound, latihan isolation) per level
+STRENGTH_SCHEMES = {
+    'beginner': ('3 x 10-12', '2 x 12-15'),
+    'intermediate': ('4 x 8-10', '3 x 10-12'),
+    'expert': ('5 x 5', '4 x 8-10'),
+}
+CATEGORY_SCHEMES = {
+    'cardio': {'beginner': '15-20 min easy pace', 'intermediate': '20-30 min', 'expert': '8 x 1 min hard / 1 min easy'},
+    'plyometrics': {'beginner': '3 x 6-8', 'intermediate': '4 x 8', 'expert': '5 x 8'},
+    'stretching': {level: '2-3 x 30 s hold per side' for level in LEVELS},
+}
+
+PROGRESSION = (
+    "Week {week}: Week A as written",
+    "Week {week}: Week B, add 1-2 reps per set",
+    "Week {week}: Week A, add ~5% load (or 1 extra set for bodyweight moves)",
+    "Week {week}: Week B, keep the load and aim for the top of each rep range",
+)
+
+PlanRequest = namedtuple('PlanRequest', ['days', 'weeks', 'level', 'equipment', 'focus', 'muscles', 'notes'])
+PlannedExercise = namedtuple('PlannedExercise', ['id', 'name', 'scheme'])
+PlanDay = namedtuple('PlanDay', ['day', 'title', 'exercises'])
+
+
+def parse_number(token):
+    return int(token) if token.isdigit() else NUMBER_WORDS[token]
+
+
+def is_generation_request(lowered):
+    """
+    True hanya untuk permintaan eksplisit membuat rencana baru. Pertanyaan ("is 3 days a week
+    enough?") dan rujukan ke rencana sebelumnya ("make the plan harder") dijawab LLM bersama
+    riwayat percakapan.
+    """
+    if CONTEXT_REFERENCE.search(lowered):
+        return False
+    if QUESTION.search(lowered) and not POLITE_REQUEST.search(lowered):
+        return False
+    return bool(GENERATION_REQUEST.search(lowered))
+
+
+def parse_request(text):
+    """PlanRequest dari pertanyaan user, atau None jika bukan permintaan rencana yang sederhana."""
+    lowered = text.lower()
+    if len(lowered.split()) > MAX_WORDS or UNSUPPORTED.search(lowered):
+        return None
+    if not is_generation_request(lowered):
+        return None
+
+    days_match = DAYS_PER_WEEK.search(lowered)
+    n_day_match = N_DAY.search(lowered)
+    weeks_match = WEEKS.search(lowered)
+    months_match = MONTHS.search(lowered)
+
+    notes = []
+    level = next((name for name, pattern in LEVEL_PATTERNS if pattern.search(lowered)), None)
+    if level is None:
+        level = 'beginner'
+        notes.append("No fitness level given, so this plan assumes beginner. Tell me your level to adjust it.")
+
+    days = None
+    weeks = 1
+    if days_match:
+        days = parse_number(days_match.group(1))
+    elif n_day_match:
+        number = parse_number(n_day_match.group(1))
+        # "5-day plan" berarti hari latihan per minggu, "30 day challenge" berarti durasi
+        if number <= 7:
+            days = number
+        else:
+            weeks = -(-number // 7)
+    if weeks_match:
+        weeks = parse_number(weeks_match.group(1))
+    elif months_match:
+        weeks = parse_number(months_match.group(1)) * 4
+    elif ONE_MONTH.search(lowered):
+        weeks = 4
+
+    if weeks > MAX_WEEKS:
+        notes.append(
+            "Plans are limited to one month. For the following months, repeat this plan while "
+            "progressively increasing repetitions or weights."
+        )
+        weeks = MAX_WEEKS
+    weeks = max(1, weeks)
+
+    if days is None:
+        days = DEFAULT_DAYS[level]
+    if days > MAX_TRAINING_DAYS:
+        notes.append("At least one rest day per week is kept for recovery.")
+    days = min(max(days, 1), MAX_TRAINING_DAYS)
+
+    if NO_EQUIPMENT.search(lowered):
+        equipment = ('body only',)
+    else:
+        named = [value for word, value in EQUIPMENT_WORDS if re.search(rf"\b{re.escape(word)}", lowered)]
+        equipment = tuple(dict.fromkeys(named + ['body only'])) if named else None
+
+    focus = next((name for name, pattern in FOCUS_PATTERNS if pattern.search(lowered)), 'strength')
+    muscles = ()
+    for phrase, group in MUSCLE_FOCUS:
+        if re.search(rf"\b{phrase}\b", lowered):
+            muscles = tuple(dict.fromkeys(muscles + group))
+    return PlanRequest(days, weeks, level, equipment, focus, muscles, tuple(notes))
+
+
+class Plan:
+    def __init__(self, request, weeks_plans):
+        self.request = request
+        # [minggu A, minggu B]; minggu B hanya ada untuk rencana lebih dari satu minggu
+        self.week_plans = weeks_plans
+
+    def exercise_ids(self):
+        return [exercise.id for week in self.week_plans for day in week for exercise in day.exercises]
+
+    def to_markdown(self):
+        request = self.request
+        equipment = ', '.join(request.equipment) if request.equipment else 'any'
+        focus = request.focus + (f" ({', '.join(request.muscles)} focus)" if request.muscles else '')
+        duration = f"{request.weeks}-week" if request.weeks > 1 else "1-week"
+        lines = [
+            f"**{duration} {request.level} {focus} plan** "
+            f"({request.days} training day{'s' if request.days > 1 else ''} per week, equipment: {equipment})",
+            "",
+        ]
+        for note in request.notes:
+            lines.extend([f"_{note}_", ""])
+
+        for label, week in zip(('A', 'B'), self.week_plans):
+            if len(self.week_plans) > 1:
+                lines.append(f"**Week {label}**")
+            for day in week:
+                if day.exercises:
+                    exercises = ', '.join(f"{exercise.name} ({exercise.scheme})" for exercise in day.exercises)
+                    lines.append(f"- Day {day.day} ({day.title}): {exercises}")
+                else:
+                    lines.append(f"- Day {day.day}: Rest day")
+            lines.append("")
+
+        if request.weeks > 1:
+            lines.append("**Progression**")
+            for week in range(1, request.weeks + 1):
+                lines.append(f"- {PROGRESSION[(week - 1) % len(PROGRESSION)].format(week=week)}")
+            lines.append("")
+
+        lines.append("Warm up for 5-10 minutes before each session and keep good form on every rep. You've got this! 💪")
+        return '\n'.join(lines)
+
+
+class WorkoutPlanner:
+    """
+    Menyusun rencana latihan dari ExerciseIndex (record yang sudah dibersihkan).
+    Semua filter memakai bitmap FacetIndex, jadi satu rencana disusun dalam milidetik.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.facets = index.facets
+
+    def candidates(self, mask, used):
+        return [self.facets.ids[position] for position in iter_bits(mask) if self.facets.ids[position] not in used]
+
+    def choose(self, masks, used, rank):
+        """Kandidat terbaik dari mask pertama yang tidak kosong (mask berikutnya lebih longgar)."""
+        for mask in masks:
+            candidates = self.candidates(mask, used)
+            if candidates:
+                return min(candidates, key=rank)
+        return None
+
+    def scheme(self, record, level):
+        category = record.get('category')
+        if category in CATEGORY_SCHEMES:
+            return CATEGORY_SCHEMES[category][level]
+        compound, isolation = STRENGTH_SCHEMES[level]
+        return compound if record.get('mechanic') == 'compound' else isolation
+
+    def sessions(self, request):
+        if request.focus == 'cardio':
+            return ('conditioning',) * request.days
+        if request.focus == 'stretching':
+            return ('mobility',) * request.days
+        if request.focus == 'plyometrics':
+            return tuple('conditioning' if day % 2 == 0 else 'legs' for day in range(request.days))
+        if request.days == 3 and request.level == 'beginner':
+            return ('full',) * 3
+        return SPLITS[request.days]
+
+    def build(self, request):
+        facets = self.facets
+        levels = LEVELS[:LEVELS.index(request.level) + 1]
+        base = facets.match('level', levels)
+        if request.equipment:
+            base &= facets.match('equipment', request.equipment)
+        strength_mask = facets.match('category', STRENGTH_CATEGORIES[request.level])
+        seed = '|'.join(map(str, request[:6]))
+
+        def rank_for(prefer_compound):
+            def rank(exercise_id):
+                record = self.index.records[exercise_id]
+                return (
+                    record.get('level') != request.level,
+                    prefer_compound and record.get('mechanic') != 'compound',
+                    hashlib.md5(f"{seed}|{exercise_id}".encode()).hexdigest(),
+                )
+            return rank
+
+        week_plans = []
+        used = set()
+        for _ in range(2 if request.weeks > 1 else 1):
+            week = []
+            sessions = iter(self.sessions(request))
+            training_days = LAYOUTS[request.days]
+            for day in range(1, 8):
+                if day not in training_days:
+                    week.append(PlanDay(day, 'Rest', []))
+                    continue
+                session = next(sessions)
+                title, slots = SESSIONS[session]
+                slots = list(slots[:EXERCISES_PER_DAY[request.level]])
+                if request.muscles and session not in ('mobility',):
+                    focus_muscle = request.muscles[len(week) % len(request.muscles)]
+                    slots = [Slot((focus_muscle,))] + slots[:-1]
+                if session not in ('mobility',):
+                    # Pendinginan: stretching untuk otot slot pertama
+                    slots.append(Slot(slots[0].muscles, None, 'stretching'))
+
+                exercises = []
+                day_used = set()
+                for position, slot in enumerate(slots):
+                    category_mask = facets.match('category', (slot.category,)) if slot.category else strength_mask
+                    mask = base & category_mask
+                    if slot.muscles:
+                        mask &= facets.match('primaryMuscles', slot.muscles)
+                    masks = [mask & facets.match('force', (slot.force,)), mask] if slot.force else [mask]
+                    rank = rank_for(position < 2 and not slot.category)
+                    # Minggu B memakai variasi lain; jika tidak ada, latihan minggu A boleh dipakai lagi
+                    exercise_id = (
+                        self.choose(masks, used | day_used, rank) or self.choose(masks, day_used, rank)
+                    )
+                    if exercise_id is None:
+                        continue
+                    day_used.add(exercise_id)
+                    record = self.index.records[exercise_id]
+                    exercises.append(PlannedExercise(exercise_id, record['name'], self.scheme(record, request.level)))
+
+                used |= day_used
+                week.append(PlanDay(day, title, exercises))
+            week_plans.append(week)
+        return Plan(request, week_plans)
+
+    def plan_for(self, text):
+        """Rencana untuk pertanyaan user, atau None jika harus dijawab LLM."""
+        request = parse_request(text)
+        if request is None:
+            return None
+        plan = self.build(request)
+        # Tanpa latihan yang cocok (misalnya equipment langka), biarkan LLM yang menjawab
+        if not plan.exercise_ids():
+            return None
+        return plan
@@ -0,0 +1,33 @@
+import json
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class PrecompressedJSON:
+    """
+    Payload JSON yang diserialisasi dan dikompres sekali saja.
+
+    Menyimpan versi asli, gzip dan (jika paket brotli terpasang) brotli,
+    sehingga setiap request cukup memilih byte yang sesuai Accept-Encoding.
+    """
+
+    def __init__(self, payload):
+        self.identity = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self.etag = hashlib.sha1(self.identity).hexdigest()
+        # Urutan menentukan preferensi jika klien menerima keduanya dengan bobot sama
+        self.encodings = {}
+        if brotli is not None:
+            self.encodings['br'] = brotli.compress(self.identity, quality=11)
+        self.encodings['gzip'] = gzip.compress(self.identity, compresslevel=9)
+
+    def select(self, accept_encodings):
+        """Mengembalikan (encoding, bytes) terbaik untuk header Accept-Encoding klien."""
+        encoding = accept_encodings.best_match(list(self.encodings))
+        if encoding is None:
+            return None, self.identity
+        return encoding, self.encodings[encoding]
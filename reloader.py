@@ -0,0 +1,64 @@
+"""
+Watcher dataset berbasis polling mtime, supaya perubahan sumber dataset (artifact,
+exercise.json, atau JSON per folder jika keduanya tidak ada) bisa diterapkan tanpa
+restart API. Hanya file yang memang dibaca load_records yang di-stat setiap interval.
+"""
+import os
+import threading
+
+from exercise_index import dataset_paths
+
+# Jeda antar pemeriksaan (detik)
+DEFAULT_INTERVAL = float(os.environ.get('GOGYM_RELOAD_INTERVAL', '2'))
+
+
+def scan(paths):
+    """path -> mtime_ns untuk file yang ada."""
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return mtimes
+
+
+class DatasetWatcher(threading.Thread):
+    """
+    Thread daemon yang memanggil on_change(path yang berubah) setiap kali file dataset
+    ditambah, diubah atau dihapus. `paths` adalah fungsi yang mengembalikan file yang
+    dipantau (dipanggil ulang setiap interval), dan `on_poll` dipanggil setiap interval,
+    misalnya untuk membuang gambar yang berubah dari cache. Error dicetak dan snapshot
+    lama tetap dipakai.
+    """
+
+    def __init__(self, on_change, interval=DEFAULT_INTERVAL, paths=dataset_paths, on_poll=None):
+        super().__init__(name='dataset-watcher', daemon=True)
+        self.on_change = on_change
+        self.on_poll = on_poll
+        self.interval = interval
+        self.paths = paths
+        self.mtimes = scan(paths())
+        self.stopped = threading.Event()
+
+    def poll(self):
+        """Memeriksa perubahan sekali; mengembalikan set path yang berubah."""
+        mtimes = scan(self.paths())
+        changed = {path for path in mtimes.keys() | self.mtimes.keys() if mtimes.get(path) != self.mtimes.get(path)}
+        self.mtimes = mtimes
+        return changed
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                if self.on_poll is not None:
+                    self.on_poll()
+                changed = self.poll()
+                if changed:
+                    self.on_change(changed)
+            except Exception as e:
+                # Misalnya file yang belum selesai ditulis; selesai ditulis berarti mtime berubah lagi
+                print(f"Error applying dataset changes: {e}")
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,60 @@
+import os
+
+from exercise_index import ExerciseIndex
+
+# Jumlah latihan yang dikirim ke LLM per pertanyaan
+DEFAULT_K = int(os.environ.get('GOGYM_RETRIEVAL_K', '25'))
+
+# Porsi k yang dicadangkan untuk latihan yang mewakili semua otot utama,
+# supaya pertanyaan umum (misalnya rencana latihan sebulan) tetap mendapat variasi
+DIVERSITY_SHARE = 1 / 3
+
+
+def describe(record):
+    """Satu baris ringkas berisi atribut penting latihan untuk prompt."""
+    attributes = [
+        record.get('category'),
+        record.get('level'),
+        record.get('equipment') or 'no equipment listed',
+        f"primary: {', '.join(record.get('primaryMuscles') or []) or '-'}",
+    ]
+    if record.get('force'):
+        attributes.append(f"force: {record['force']}")
+    return f"- {record['name']} ({'; '.join(attr for attr in attributes if attr)})"
+
+
+class ExerciseRetriever:
+    """
+    Memilih latihan yang relevan untuk sebuah pertanyaan memakai index BM25 lokal,
+    sehingga prompt hanya berisi top-k latihan, bukan seluruh katalog.
+    """
+
+    def __init__(self, index=None):
+        self.index = index or ExerciseIndex.load()
+
+        # Latihan cadangan yang mewakili setiap otot utama, dipakai jika hasil pencarian kurang dari k
+        self.fallback_ids = []
+        seen_muscles = set()
+        for exercise_id in self.index.ids:
+            record = self.index.records[exercise_id]
+            muscle = (record.get('primaryMuscles') or [None])[0]
+            if record.get('level') == 'beginner' and muscle not in seen_muscles:
+                seen_muscles.add(muscle)
+                self.fallback_ids.append(exercise_id)
+
+    def retrieve(self, question, k=DEFAULT_K):
+        """Mengembalikan list record latihan paling relevan (maksimal k)."""
+        reserved = min(len(self.fallback_ids), int(k * DIVERSITY_SHARE))
+        _, results, _ = self.index.search.search(question, limit=k - reserved)
+        ids = [result['id'] for result in results]
+
+        for exercise_id in self.fallback_ids:
+            if len(ids) >= k:
+                break
+            if exercise_id not in ids:
+                ids.append(exercise_id)
+        return [self.index.records[exercise_id] for exercise_id in ids]
+
+    def format_context(self, records):
+        """Teks daftar latihan untuk slot {exercises} di prompt."""
+        return '\n'.join(describe(record) for record in records)
@@ -0,0 +1,206 @@
+import re
+import math
+import heapq
+from collections import Counter, defaultdict
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "for", "from", "how", "i", "in",
+    "is", "it", "me", "my", "no", "of", "on", "or", "the", "to", "with", "without", "you", "your",
+}
+
+# Bobot tiap field; nama dan otot lebih penting daripada teks instruksi
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "primaryMuscles": 2.0,
+    "secondaryMuscles": 1.0,
+    "equipment": 2.0,
+    "category": 1.5,
+    "instructions": 1.0,
+}
+
+# Parameter BM25
+K1 = 1.2
+B = 0.75
+
+# Bonus skor sebanding dengan porsi kata nama latihan yang disebut di query,
+# supaya "barbell squat" mengutamakan latihan bernama persis Barbell Squat
+NAME_COVERAGE_WEIGHT = 5.0
+
+# Kata yang tidak dikenal dikoreksi ke kata vocabulary dengan jarak edit (Damerau) terkecil;
+# kemiripan trigram hanya menyaring kandidat dan menjadi pemecah seri
+TRIGRAM_THRESHOLD = 0.45
+MAX_CORRECTIONS = 2
+
+
+def max_edit_distance(term):
+    """Jarak edit maksimum untuk koreksi: 1 untuk kata pendek, 2 untuk kata lainnya."""
+    return 1 if len(term) <= 4 else 2
+
+
+def edit_distance(a, b, limit):
+    """
+    Jarak Damerau-Levenshtein (optimal string alignment): sisip, hapus, ganti dan tukar dua
+    huruf bersebelahan. Berhenti lebih awal dan mengembalikan limit + 1 jika melewati limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def stem(token):
+    """Stemming sederhana untuk bentuk jamak: squats -> squat, lunges -> lunge."""
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Memecah teks menjadi token huruf kecil tanpa stopword."""
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def field_text(value):
+    if isinstance(value, list):
+        return ' '.join(value)
+    return value or ''
+
+
+def analyze(record):
+    """(frekuensi term berbobot per field, term nama) untuk satu record."""
+    freqs = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(field_text(record.get(field))):
+            freqs[token] += weight
+    return freqs, frozenset(tokenize(record.get('name', '')))
+
+
+class SearchIndex:
+    """
+    Inverted index BM25 atas katalog latihan.
+
+    Skor BM25 setiap pasangan (term, dokumen) dihitung saat build, jadi query hanya
+    menjumlahkan posting list dari term yang ada di query. Jika `previous` diberikan,
+    hasil tokenisasi record yang tidak berubah dipakai ulang dan hanya skornya yang
+    dihitung ulang (IDF dan panjang rata-rata bersifat global).
+    """
+
+    def __init__(self, ids, records, previous=None):
+        self.ids = list(ids)
+        self.postings = {}
+        self.trigram_index = defaultdict(set)
+        self.trigram_counts = {}
+
+        # id -> (record, frekuensi term berbobot, term nama); dipakai ulang oleh index berikutnya
+        self.analyzed = {}
+        reusable = previous.analyzed if previous is not None else {}
+
+        term_freqs = []
+        self.name_terms = []
+        for exercise_id in self.ids:
+            record = records[exercise_id]
+            cached = reusable.get(exercise_id)
+            if cached is None or cached[0] is not record:
+                cached = (record,) + analyze(record)
+            self.analyzed[exercise_id] = cached
+            term_freqs.append(cached[1])
+            self.name_terms.append(cached[2])
+
+        doc_count = len(term_freqs)
+        lengths = [sum(freqs.values()) for freqs in term_freqs]
+        avg_length = (sum(lengths) / doc_count) if doc_count else 0.0
+
+        doc_freq = Counter()
+        for freqs in term_freqs:
+            doc_freq.update(freqs.keys())
+
+        raw_postings = defaultdict(list)
+        for doc, freqs in enumerate(term_freqs):
+            norm = K1 * (1 - B + B * lengths[doc] / avg_length)
+            for term, tf in freqs.items():
+                idf = math.log(1 + (doc_count - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                raw_postings[term].append((doc, idf * tf * (K1 + 1) / (tf + norm)))
+
+        self.postings = dict(raw_postings)
+        for term in self.postings:
+            grams = trigrams(term)
+            self.trigram_counts[term] = len(grams)
+            for gram in grams:
+                self.trigram_index[gram].add(term)
+
+    def correct(self, term):
+        """
+        Mencari kata di vocabulary yang paling mirip untuk term yang tidak dikenal: kandidat
+        berbagi minimal satu trigram, diterima jika jarak editnya paling banyak
+        max_edit_distance(term) (huruf tertukar seperti "deadlfit" berjarak 1) atau kemiripan
+        trigramnya minimal TRIGRAM_THRESHOLD. Hanya kandidat dengan jarak edit terkecil yang
+        dipakai, kemiripan trigram menjadi pemecah seri.
+        Mengembalikan [(bobot, kata)], bobot = 1 - jarak / panjang kata terpanjang.
+        """
+        grams = trigrams(term)
+        overlap = Counter()
+        for gram in grams:
+            overlap.update(self.trigram_index.get(gram, ()))
+
+        limit = max_edit_distance(term)
+        candidates = []
+        for candidate, shared in overlap.items():
+            similarity = shared / (len(grams) + self.trigram_counts[candidate] - shared)
+            distance = edit_distance(term, candidate, limit)
+            if distance <= limit or similarity >= TRIGRAM_THRESHOLD:
+                candidates.append((distance, -similarity, candidate))
+        candidates.sort()
+        best = candidates[0][0] if candidates else None
+        return [
+            (1 - distance / max(len(term), len(candidate)), candidate)
+            for distance, _, candidate in candidates[:MAX_CORRECTIONS] if distance == best
+        ]
+
+    def search(self, query, limit=10, offset=0):
+        """
+        Mengembalikan (total, hasil, koreksi) untuk query.
+        hasil berisi dict {"id", "score"} terurut dari skor tertinggi.
+        """
+        scores = defaultdict(float)
+        corrections = {}
+        matched_terms = set()
+
+        for term in set(tokenize(query)):
+            if term in self.postings:
+                weighted = [(1.0, term)]
+            else:
+                weighted = self.correct(term)
+                if weighted:
+                    corrections[term] = [candidate for _, candidate in weighted]
+            for weight, matched in weighted:
+                matched_terms.add(matched)
+                for doc, score in self.postings[matched]:
+                    scores[doc] += weight * score
+
+        for doc in scores:
+            name_terms = self.name_terms[doc]
+            if name_terms:
+                scores[doc] += NAME_COVERAGE_WEIGHT * len(name_terms & matched_terms) / len(name_terms)
+
+        # Hanya halaman yang diminta yang diurutkan penuh
+        top = heapq.nsmallest(offset + limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        results = [{"id": self.ids[doc], "score": round(score, 4)} for doc, score in top[offset:]]
+        return len(scores), results, corrections
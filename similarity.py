@@ -0,0 +1,178 @@
+"""
+Kemiripan antar latihan untuk mencari alternatif ("pengganti barbell squat tanpa alat").
+
+Setiap latihan direpresentasikan sebagai satu baris matriks NumPy: one-hot facet (otot,
+equipment, force, mechanic, level, kategori) ditambah TF-IDF dari instructions. Baris
+dinormalisasi L2, jadi skor cosine semua latihan terhadap satu latihan cukup satu
+perkalian matriks-vektor, lalu top-k diambil dengan argpartition.
+"""
+import os
+import math
+import threading
+from collections import Counter
+
+import numpy as np
+
+from facet_index import facet_values
+from search_index import tokenize
+
+# Bobot tiap blok fitur sebelum normalisasi akhir
+FEATURE_WEIGHTS = {
+    'primaryMuscles': 3.0,
+    'secondaryMuscles': 1.0,
+    'equipment': 1.5,
+    'force': 1.5,
+    'mechanic': 1.0,
+    'level': 0.5,
+    'category': 0.5,
+    'instructions': 2.0,
+}
+FACET_FEATURES = tuple(feature for feature in FEATURE_WEIGHTS if feature != 'instructions')
+
+# Term instruksi yang dipakai: muncul di minimal MIN_DF latihan, maksimal MAX_TERMS term terbanyak
+MIN_DF = 2
+MAX_TERMS = int(os.environ.get('GOGYM_SIMILAR_MAX_TERMS', '1000'))
+
+DEFAULT_K = 10
+MAX_K = 50
+
+# Daftar tetangga yang dihitung di muka untuk semua latihan (GOGYM_SIMILAR_PRECOMPUTE=1)
+PRECOMPUTE = os.environ.get('GOGYM_SIMILAR_PRECOMPUTE', '0') == '1'
+PRECOMPUTED_K = MAX_K
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores, k):
+    """Posisi k skor tertinggi (urut menurun); skor -inf tidak pernah dikembalikan."""
+    valid = int(np.isfinite(scores).sum())
+    k = min(k, valid)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+class SimilarityIndex:
+    """
+    Matriks fitur katalog (float32, satu baris per latihan) beserta kolom one-hot tiap
+    nilai facet, yang juga dipakai untuk constraint ("same primary muscle, body only").
+    """
+
+    def __init__(self, ids, records, precompute=PRECOMPUTE):
+        self.ids = list(ids)
+        self.positions = {exercise_id: position for position, exercise_id in enumerate(self.ids)}
+        # {facet: {nilai: matriks boolean}} untuk constraint
+        self.columns = {}
+        blocks = []
+
+        for facet in FACET_FEATURES:
+            values = [facet_values(records[exercise_id], facet) for exercise_id in self.ids]
+            vocabulary = sorted({value for row in values for value in row})
+            column_of = {value: column for column, value in enumerate(vocabulary)}
+            onehot = np.zeros((len(self.ids), len(vocabulary)), dtype=np.float32)
+            for position, row in enumerate(values):
+                for value in row:
+                    onehot[position, column_of[value]] = 1.0
+            self.columns[facet] = {value: onehot[:, column] > 0 for value, column in column_of.items()}
+            blocks.append(normalize_rows(onehot) * FEATURE_WEIGHTS[facet])
+
+        blocks.append(self._tfidf(records) * FEATURE_WEIGHTS['instructions'])
+        self.matrix = normalize_rows(np.hstack(blocks)).astype(np.float32)
+
+        self.neighbours = self.precompute() if precompute else None
+
+    def _tfidf(self, records):
+        documents = [
+            Counter(tokenize(' '.join(records[exercise_id].get('instructions') or [])))
+            for exercise_id in self.ids
+        ]
+        document_frequency = Counter(term for document in documents for term in document)
+        terms = [term for term, df in document_frequency.most_common(MAX_TERMS) if df >= MIN_DF]
+        column_of = {term: column for column, term in enumerate(terms)}
+
+        count = len(self.ids)
+        idf = np.array([math.log((1 + count) / (1 + document_frequency[term])) + 1 for term in terms], dtype=np.float32)
+        tfidf = np.zeros((count, len(terms)), dtype=np.float32)
+        for position, document in enumerate(documents):
+            for term, frequency in document.items():
+                column = column_of.get(term)
+                if column is not None:
+                    # TF sublinear supaya instruksi panjang tidak mendominasi
+                    tfidf[position, column] = 1 + math.log(frequency)
+        return normalize_rows(tfidf * idf)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def precompute(self, k=PRECOMPUTED_K):
+        """Top-k tetangga setiap latihan: satu perkalian matriks lalu argpartition per baris."""
+        scores = self.matrix @ self.matrix.T
+        np.fill_diagonal(scores, -np.inf)
+        k = min(k, len(self.ids) - 1)
+        if k <= 0:
+            return np.empty((len(self.ids), 0), dtype=np.int64)
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind='stable')
+        return np.take_along_axis(candidates, order, axis=1)
+
+    def mask(self, position, same=(), filters=None):
+        """
+        Latihan yang memenuhi constraint: `same` berisi facet yang harus sama nilainya
+        (minimal satu nilai yang sama) dengan latihan acuan, `filters` berisi
+        {facet: [nilai]} (OR dalam satu facet, AND antar facet). None jika tanpa constraint.
+        """
+        if not same and not filters:
+            return None
+        allowed = np.ones(len(self.ids), dtype=bool)
+        for facet in same:
+            shared = np.zeros(len(self.ids), dtype=bool)
+            for column in self.columns[facet].values():
+                if column[position]:
+                    shared |= column
+            allowed &= shared
+        for facet, values in (filters or {}).items():
+            selected = np.zeros(len(self.ids), dtype=bool)
+            for value in values:
+                column = self.columns[facet].get(value.lower())
+                if column is not None:
+                    selected |= column
+            allowed &= selected
+        return allowed
+
+    def similar(self, exercise_id, k=DEFAULT_K, same=(), filters=None):
+        """[(id, skor)] latihan paling mirip, tanpa latihan acuan itu sendiri."""
+        position = self.positions[exercise_id]
+        allowed = self.mask(position, same, filters)
+
+        if allowed is None and self.neighbours is not None and k <= self.neighbours.shape[1]:
+            positions = self.neighbours[position, :k]
+            scores = self.matrix[positions] @ self.matrix[position]
+        else:
+            scores = self.matrix @ self.matrix[position]
+            scores[position] = -np.inf
+            if allowed is not None:
+                scores[~allowed] = -np.inf
+            positions = top_k(scores, k)
+            scores = scores[positions]
+        return [(self.ids[found], float(score)) for found, score in zip(positions, scores)]
+
+
+class LazySimilarity:
+    """SimilarityIndex yang baru dibangun saat pertama dipakai (sekali per snapshot katalog)."""
+
+    def __init__(self, index):
+        self.index = index
+        self.similarity = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        if self.similarity is None:
+            with self.lock:
+                if self.similarity is None:
+                    self.similarity = SimilarityIndex(self.index.ids, self.index.clean_records)
+        return self.similarity
@@ -0,0 +1,84 @@
+from collections import Counter
+
+from cleaning import clean_record
+
+# Kolom yang dihitung value_counts-nya
+COUNTED_COLUMNS = ('force', 'level', 'mechanic', 'category', 'equipment', 'primaryMuscles', 'secondaryMuscles')
+
+# Pasangan kolom untuk tabulasi silang (baris, kolom)
+CROSSTABS = (('category', 'level'), ('category', 'equipment'))
+
+
+def column_values(record, column):
+    value = record.get(column)
+    if isinstance(value, list):
+        return value if value else ['none']
+    return [value]
+
+
+class CatalogStats:
+    """
+    Statistik agregat katalog (value counts, tabulasi silang, distribusi) yang dihitung
+    sekali dan bisa diperbarui per record. Nilai kosong diisi dengan aturan yang sama
+    dengan halaman EDA sebelum dihitung.
+    """
+
+    def __init__(self, records=()):
+        self.total = 0
+        self.value_counts = {column: Counter() for column in COUNTED_COLUMNS}
+        self.crosstabs = {pair: Counter() for pair in CROSSTABS}
+        for record in records:
+            self.add(record)
+
+    def _apply(self, record, sign):
+        record = clean_record(record)
+        self.total += sign
+        for column, counts in self.value_counts.items():
+            for value in column_values(record, column):
+                counts[value] += sign
+        for (row, column), counts in self.crosstabs.items():
+            counts[(record.get(row), record.get(column))] += sign
+
+    def add(self, record):
+        self._apply(record, 1)
+
+    def remove(self, record):
+        self._apply(record, -1)
+        # Buang nilai yang hitungannya sudah nol
+        for counts in list(self.value_counts.values()) + list(self.crosstabs.values()):
+            for key in [key for key, count in counts.items() if count <= 0]:
+                del counts[key]
+
+    def update(self, old_record, new_record):
+        """Memperbarui statistik untuk satu record yang berubah (old/new boleh None)."""
+        if old_record is not None:
+            self.remove(old_record)
+        if new_record is not None:
+            self.add(new_record)
+
+    def copy(self):
+        stats = CatalogStats()
+        stats.total = self.total
+        stats.value_counts = {column: Counter(counts) for column, counts in self.value_counts.items()}
+        stats.crosstabs = {pair: Counter(counts) for pair, counts in self.crosstabs.items()}
+        return stats
+
+    def to_dict(self):
+        crosstabs = {}
+        for (row, column), counts in self.crosstabs.items():
+            table = {}
+            for (row_value, column_value), count in sorted(counts.items()):
+                table.setdefault(row_value, {})[column_value] = count
+            crosstabs[f"{row}_x_{column}"] = table
+
+        return {
+            "total": self.total,
+            "value_counts": {
+                column: dict(counts.most_common()) for column, counts in self.value_counts.items()
+            },
+            "distributions": {
+                column: {value: round(count / self.total, 4) for value, count in counts.most_common()}
+                for column, counts in self.value_counts.items()
+            } if self.total else {},
+            "crosstabs": crosstabs,
+        }
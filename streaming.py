@@ -0,0 +1,37 @@
+import time
+
+from langchain.callbacks.base import BaseCallbackHandler
+
+
+class StreamHandler(BaseCallbackHandler):
+    """
+    Menampilkan token jawaban LLM ke placeholder Streamlit begitu token datang,
+    sekaligus mencatat time-to-first-token dan total waktu generate.
+    """
+
+    def __init__(self, placeholder, cursor="▌"):
+        self.placeholder = placeholder
+        self.cursor = cursor
+        self.text = ""
+        self.started_at = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+
+    def on_llm_new_token(self, token, **kwargs):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.text += token
+        self.placeholder.markdown(self.text + self.cursor)
+
+    def finish(self, response):
+        """Menampilkan jawaban final tanpa kursor dan mengembalikan catatan waktu giliran ini."""
+        self.finished_at = time.perf_counter()
+        self.placeholder.markdown(response)
+        return self.timings()
+
+    def timings(self):
+        end = self.finished_at or time.perf_counter()
+        return {
+            "time_to_first_token": round(self.first_token_at - self.started_at, 4) if self.first_token_at else None,
+            "total_time": round(end - self.started_at, 4),
+        }
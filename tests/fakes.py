@@ -0,0 +1,38 @@
+"""Pengganti LLM untuk test dan benchmark, supaya tidak perlu API key atau jaringan."""
+import re
+import time
+from typing import Any, List, Optional
+
+from langchain.llms.base import LLM
+
+
+class FakeStreamingLLM(LLM):
+    """LLM lokal: mengembalikan jawaban tetap bergiliran dan men-stream-nya kata per kata."""
+
+    responses: List[str]
+    delay: float = 0.0
+    index: int = 0
+
+    @property
+    def _llm_type(self):
+        return "fake-streaming"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        response = self.responses[self.index % len(self.responses)]
+        self.index += 1
+        if run_manager:
+            for token in re.findall(r"\S+\s*|\s+", response):
+                if self.delay:
+                    time.sleep(self.delay)
+                run_manager.on_llm_new_token(token)
+        return response
+
+
+class RecordingPlaceholder:
+    """Placeholder Streamlit palsu yang menyimpan setiap teks yang ditampilkan."""
+
+    def __init__(self):
+        self.rendered = []
+
+    def markdown(self, text):
+        self.rendered.append(text)
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+os.environ.setdefault('GOGYM_LIVE_RELOAD', '0')
+import api  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def client():
+    return api.app.test_client()
+
+
+@pytest.mark.parametrize('body', [
+    {"ids": "Air_Bike"}, {"ids": [None]}, {"ids": [1]},
+    {"ids": ["Air_Bike"], "fields": "name"}, {"ids": ["Air_Bike"], "fields": [1]},
+])
+def test_batch_rejects_non_string_lists(client, body):
+    assert client.post('/exercises/batch', json=body).status_code == 400
+
+
+def test_batch_projects_fields(client):
+    response = client.post('/exercises/batch', json={"ids": ["Air_Bike", "Nope"], "fields": ["name"]})
+    assert response.status_code == 200
+    assert response.get_json()["items"][0]["exercise"] == {"id": "Air_Bike", "name": "Air Bike"}
+    assert response.get_json()["missing"] == ["Nope"]
+
+
+@pytest.mark.parametrize('url', [
+    '/search?q=squat&limit=abc', '/search?q=squat&offset=x', '/exercises/Barbell_Squat/similar?k=abc',
+    '/exercises/Barbell_Squat/images/0.jpg?q=abc', '/list_all?limit=abc',
+])
+def test_non_integer_parameters_are_rejected(client, url):
+    assert client.get(url).status_code == 400
+
+
+def test_search_reports_clamped_limit(client):
+    assert client.get('/search?q=squat&limit=500').get_json()["limit"] == api.MAX_SEARCH_LIMIT
+
+
+def test_unsatisfiable_range_is_json(client):
+    full = client.get('/exercises/Barbell_Squat/images/0.jpg')
+    response = client.get('/exercises/Barbell_Squat/images/0.jpg', headers={'Range': f'bytes={len(full.data) + 10}-'})
+    assert response.status_code == 416
+    assert response.get_json() == {"message": "Requested range not satisfiable."}
+    assert response.headers['Content-Range'] == f"bytes */{len(full.data)}"
+
+
+def test_partial_range(client):
+    response = client.get('/exercises/Barbell_Squat/images/0.jpg', headers={'Range': 'bytes=0-9'})
+    assert response.status_code == 206
+    assert len(response.data) == 10
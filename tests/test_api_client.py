@@ -0,0 +1,63 @@
+import requests
+
+from api_client import CatalogCache
+
+
+class StubResponse:
+    def __init__(self, status_code, payload=None, etag=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = {'ETag': etag} if etag else {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(self.status_code)
+
+    def json(self):
+        return self.payload
+
+
+class StubClient:
+    """Mengembalikan respons berurutan dan mencatat header setiap request."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, path, headers=None):
+        self.requests.append((path, headers))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_revalidates_with_etag():
+    client = StubClient(StubResponse(200, {"exercises": ["A", "B"]}, etag='"v1"'), StubResponse(304))
+    cache = CatalogCache(client, revalidate_seconds=0)
+    assert cache.exercise_ids() == {"A", "B"}
+    assert cache.exercise_ids() == {"A", "B"}
+    assert client.requests[1] == ('/list_all', {'If-None-Match': '"v1"'})
+
+
+def test_no_request_within_revalidate_window():
+    client = StubClient(StubResponse(200, {"exercises": ["A"]}))
+    cache = CatalogCache(client, revalidate_seconds=60)
+    cache.exercise_ids()
+    cache.exercise_ids()
+    assert len(client.requests) == 1
+
+
+def test_outage_keeps_last_catalog():
+    client = StubClient(StubResponse(200, {"exercises": ["A"]}), requests.exceptions.ConnectionError())
+    cache = CatalogCache(client, revalidate_seconds=0)
+    assert cache.exercise_ids() == {"A"}
+    assert cache.exercise_ids() == {"A"}
+
+
+def test_outage_before_first_fetch_is_not_retried_every_rerun():
+    client = StubClient(requests.exceptions.ConnectionError())
+    cache = CatalogCache(client, revalidate_seconds=60)
+    assert cache.exercise_ids() is None
+    assert cache.exercise_ids() is None
+    assert len(client.requests) == 1
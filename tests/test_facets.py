@@ -0,0 +1,20 @@
+from exercise_index import ExerciseIndex, load_records
+
+
+def test_filter_counts_match_stats():
+    # Index dari record mentah: facet tetap memakai nilai hasil cleaning seperti /stats
+    index = ExerciseIndex(load_records())
+    value_counts = index.stats.to_dict()['value_counts']
+    for facet in ('equipment', 'force', 'mechanic', 'level', 'category'):
+        for value, count in value_counts[facet].items():
+            exercise_ids, _ = index.facets.filter({facet: [value]})
+            assert len(exercise_ids) == count, (facet, value)
+
+
+def test_updated_index_keeps_clean_values():
+    records = load_records()
+    index = ExerciseIndex(records)
+    changed = dict(records[0], equipment=None, name='Arm Circles')
+    updated = index.updated({changed['id']: changed})
+    assert updated.records[changed['id']]['equipment'] is None
+    assert changed['id'] in updated.facets.filter({'equipment': ['body only']})[0]
@@ -0,0 +1,37 @@
+from history import HistoryManager, count_tokens, truncate_to_tokens, TRUNCATION_MARKER
+
+
+def long_message(words):
+    return ' '.join(f"word{index}." for index in range(words))
+
+
+def test_budget_holds_with_oversized_recent_messages():
+    for budget in (50, 200, 1500):
+        history = HistoryManager(token_budget=budget)
+        for turn in range(20):
+            history.add("user" if turn % 2 == 0 else "assistant", long_message(3000 if turn % 3 else 5))
+            assert history.recent_tokens() + history.summary_tokens <= budget
+
+
+def test_newest_message_is_kept_when_it_fits():
+    history = HistoryManager(token_budget=200)
+    history.add("assistant", long_message(3000))
+    history.add("user", "How many sets should I do?")
+    assert history.recent[-1]["message"] == "How many sets should I do?"
+    assert history.recent[0]["message"].endswith(TRUNCATION_MARKER)
+
+
+def test_truncate_to_tokens():
+    text = long_message(500)
+    assert truncate_to_tokens("short", 10) == "short"
+    truncated = truncate_to_tokens(text, 40)
+    assert count_tokens(truncated) <= 40
+    assert text.startswith(truncated[:-len(TRUNCATION_MARKER)])
+    assert truncate_to_tokens(text, 0) == ''
+
+
+def test_budget_holds_with_long_summary_lines():
+    history = HistoryManager(token_budget=100, summarizer=lambda role, message: f"{role}: {message}")
+    for turn in range(10):
+        history.add("user", long_message(40 + turn * 10))
+        assert history.recent_tokens() + history.summary_tokens <= history.token_budget
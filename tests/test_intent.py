@@ -0,0 +1,62 @@
+import pytest
+
+from dataset import load_clean_records
+from exercise_index import ExerciseIndex
+from intent import GENERAL, HOW_TO, OUT_OF_SCOPE, IntentClassifier, build_examples
+
+
+@pytest.fixture(scope='module')
+def records():
+    return load_clean_records()
+
+
+@pytest.fixture(scope='module')
+def classifier(records):
+    index = ExerciseIndex(records)
+    return IntentClassifier(index.records.values(), search=index.search)
+
+
+@pytest.mark.parametrize('question, exercise_id', [
+    ("how to squat", 'Barbell_Squat'),
+    ("How do I do a push up?", 'Pushups'),
+    ('How do you perform a "Push-Up" exercise?', 'Pushups'),
+    ("Can you give me the instructions for Squats?", 'Barbell_Squat'),
+    ("how to do the bench press", 'Barbell_Bench_Press_-_Medium_Grip'),
+    ("caranya deadlift", 'Barbell_Deadlift'),
+    ("How to do barbell squats?", 'Barbell_Squat'),
+    ('7. How do you perform a "Push-Up" exercise? (Provide instructions and images)', 'Pushups'),
+])
+def test_how_to_resolves_common_phrasings(classifier, question, exercise_id):
+    intent = classifier.classify(question)
+    assert (intent.label, intent.exercise_id) == (HOW_TO, exercise_id)
+
+
+@pytest.mark.parametrize('question', [
+    "how do I bake bread", "how to lose weight", "how many sets should i do",
+    # Nama latihan disebut, tetapi pertanyaannya bukan cara melakukan latihan itu
+    "How can I make pushups harder?", "How do I progress on the barbell squat?",
+    "How do I replace barbell squat if I don't have a barbell?", "how to do pushups every day",
+    "how do I do pull ups without a bar",
+])
+def test_how_to_needs_an_exercise(classifier, question):
+    assert classifier.classify(question).label != HOW_TO
+
+
+@pytest.mark.parametrize('question', ["How to make money online", "how do i make a cake", "tell me a joke"])
+def test_out_of_scope_examples(classifier, question):
+    # Kata "make" tidak boleh membuat pertanyaan di luar topik terbaca sebagai permintaan rencana
+    assert classifier.model.predict(question)[0] == OUT_OF_SCOPE
+
+
+def test_confident_out_of_scope_is_refused(classifier):
+    assert classifier.classify("How to make money online").label == OUT_OF_SCOPE
+
+
+def test_model_fits_its_training_examples(classifier, records):
+    examples = build_examples(records)
+    wrong = [(label, text) for label, text in examples if classifier.model.predict(text)[0] != label]
+    assert not wrong
+
+
+def test_good_morning_without_question_goes_to_llm(classifier):
+    assert classifier.classify("good morning").label == GENERAL
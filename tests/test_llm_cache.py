@@ -0,0 +1,61 @@
+from langchain.chains import LLMChain
+from langchain.prompts import PromptTemplate
+
+from llm_cache import ResponseCache, make_key
+from tests.fakes import FakeStreamingLLM
+
+
+def make_chain(responses):
+    prompt = PromptTemplate(template="{question}", input_variables=["question"])
+    return LLMChain(llm=FakeStreamingLLM(responses=responses), prompt=prompt)
+
+
+def test_hit_skips_llm():
+    cache = ResponseCache(':memory:')
+    chain = make_chain(["first answer", "second answer"])
+    key = make_key("How do I squat?", [], "v1", "fake")
+
+    response, hit = cache.get_or_generate(key, lambda: chain.run("How do I squat?"))
+    assert (response, hit) == ("first answer", False)
+
+    response, hit = cache.get_or_generate(key, lambda: chain.run("How do I squat?"))
+    assert (response, hit) == ("first answer", True)
+    assert chain.llm.index == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_question_is_normalized():
+    assert make_key("How do I squat?", [], "v1", "fake") == make_key("  how do i   SQUAT ", [], "v1", "fake")
+
+
+def test_key_changes_invalidate():
+    base = make_key("How do I squat?", ["User: hi"], "v1", "fake", k=8)
+    assert make_key("How do I squat?", ["User: hello"], "v1", "fake", k=8) != base
+    assert make_key("How do I squat?", ["User: hi"], "v2", "fake", k=8) != base
+    assert make_key("How do I squat?", ["User: hi"], "v1", "other-model", k=8) != base
+    assert make_key("How do I squat?", ["User: hi"], "v1", "fake", k=4) != base
+
+    cache = ResponseCache(':memory:')
+    chain = make_chain(["first answer", "second answer"])
+    cache.get_or_generate(base, lambda: chain.run("q"))
+    new_key = make_key("How do I squat?", ["User: hi"], "v2", "fake", k=8)
+    response, hit = cache.get_or_generate(new_key, lambda: chain.run("q"))
+    assert (response, hit) == ("second answer", False)
+
+
+def test_expired_entry_is_a_miss():
+    cache = ResponseCache(':memory:', ttl_seconds=-1)
+    cache.set("key", "answer")
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResponseCache(':memory:', max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
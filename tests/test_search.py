@@ -0,0 +1,47 @@
+import pytest
+
+from dataset import load_clean_records
+from exercise_index import ExerciseIndex
+from search_index import edit_distance
+
+
+@pytest.fixture(scope='module')
+def search():
+    return ExerciseIndex(load_clean_records()).search
+
+
+def test_exact_name_ranks_first(search):
+    _, results, corrections = search.search("barbell squat", 5)
+    assert results[0]["id"] == 'Barbell_Squat'
+    assert corrections == {}
+
+
+@pytest.mark.parametrize('query, term, corrected, expected', [
+    ("hamstrnig", 'hamstrnig', 'hamstring', 'Hamstring'),
+    ("deadlfit", 'deadlfit', 'deadlift', 'Deadlift'),
+    ("hamstirng stretch", 'hamstirng', 'hamstring', 'Hamstring'),
+    ("sqaut", 'sqaut', 'squat', 'Squat'),
+])
+def test_swapped_letters_are_corrected(search, query, term, corrected, expected):
+    total, results, corrections = search.search(query, 5)
+    assert total > 0
+    assert corrections[term][0] == corrected
+    assert expected in results[0]["id"]
+
+
+def test_query_without_match(search):
+    assert search.search("xyzzy", 5) == (0, [], {})
+
+
+def test_paging(search):
+    total, first, _ = search.search("stretch", 5)
+    _, second, _ = search.search("stretch", 5, offset=5)
+    assert total > 10
+    assert len(first) == len(second) == 5
+    assert not {result["id"] for result in first} & {result["id"] for result in second}
+
+
+def test_edit_distance():
+    assert edit_distance("deadlfit", "deadlift", 2) == 1
+    assert edit_distance("squat", "squat", 2) == 0
+    assert edit_distance("banana", "bench", 2) == 3
@@ -0,0 +1,46 @@
+from langchain.chains import LLMChain
+from langchain.prompts import PromptTemplate
+
+from streaming import StreamHandler
+from tests.fakes import FakeStreamingLLM, RecordingPlaceholder
+
+ANSWER = "Keep your back straight and push through your heels."
+DELAY = 0.01
+
+
+def run_chain(handler, delay=DELAY):
+    prompt = PromptTemplate(template="{question}", input_variables=["question"])
+    chain = LLMChain(llm=FakeStreamingLLM(responses=[ANSWER], delay=delay), prompt=prompt)
+    return chain.run("How do I squat?", callbacks=[handler])
+
+
+def test_tokens_are_streamed_to_placeholder():
+    placeholder = RecordingPlaceholder()
+    handler = StreamHandler(placeholder)
+    response = run_chain(handler, delay=0.0)
+    handler.finish(response)
+
+    words = ANSWER.split()
+    # Satu render per token, kursor di akhir, lalu jawaban final tanpa kursor
+    assert len(placeholder.rendered) == len(words) + 1
+    assert placeholder.rendered[0] == words[0] + " ▌"
+    assert all(text.endswith("▌") for text in placeholder.rendered[:-1])
+    assert placeholder.rendered[-1] == ANSWER
+    assert handler.text == ANSWER
+
+
+def test_first_token_arrives_before_the_full_answer():
+    handler = StreamHandler(RecordingPlaceholder())
+    timings = handler.finish(run_chain(handler))
+
+    tokens = len(ANSWER.split())
+    assert DELAY <= timings["time_to_first_token"] < DELAY * tokens
+    assert timings["total_time"] >= DELAY * tokens
+    assert timings["time_to_first_token"] < timings["total_time"]
+
+
+def test_no_tokens_means_no_first_token_time():
+    handler = StreamHandler(RecordingPlaceholder())
+    timings = handler.finish("cached answer")
+    assert timings["time_to_first_token"] is None
+    assert timings["total_time"] >= 0
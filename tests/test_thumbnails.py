@@ -0,0 +1,51 @@
+import os
+import shutil
+
+import pytest
+
+import thumbnails
+
+pytestmark = pytest.mark.skipif(not thumbnails.PIL_AVAILABLE, reason="Pillow is not installed")
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    exercises = tmp_path / 'exercises'
+    (exercises / 'Pushups').mkdir(parents=True)
+    path = exercises / 'Pushups' / '0.jpg'
+    shutil.copy(os.path.join(thumbnails.EXERCISES_FOLDER, 'Pushups', '0.jpg'), path)
+    monkeypatch.setattr(thumbnails, 'EXERCISES_FOLDER', str(exercises))
+    return str(path)
+
+
+def test_changed_source_removes_old_variants(source, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    small = thumbnails.get_derivative(source, 64, 80, 'webp', cache_dir)
+    large = thumbnails.get_derivative(source, 128, 80, 'webp', cache_dir)
+    assert os.path.exists(small) and os.path.exists(large)
+
+    os.utime(source, ns=(1, 1))
+    fresh = thumbnails.get_derivative(source, 64, 80, 'webp', cache_dir)
+    assert fresh != small
+    assert os.listdir(os.path.dirname(fresh)) == [os.path.basename(fresh)]
+
+
+def test_prune_removes_stale_and_orphaned_variants(source, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    variant = thumbnails.get_derivative(source, 64, 80, 'jpeg', cache_dir)
+    os.makedirs(os.path.join(cache_dir, 'ab'))
+    open(os.path.join(cache_dir, 'ab', 'old-layout.jpg'), 'wb').close()
+    assert thumbnails.prune(cache_dir, thumbnails.EXERCISES_FOLDER) == 1
+    assert os.path.exists(variant)
+
+    os.utime(source, ns=(1, 1))
+    assert thumbnails.prune(cache_dir, thumbnails.EXERCISES_FOLDER) == 1
+    assert os.listdir(cache_dir) == []
+
+
+def test_sources_outside_the_catalog_stay_in_cache_dir(tmp_path):
+    outside = tmp_path / 'elsewhere.jpg'
+    shutil.copy(os.path.join(thumbnails.EXERCISES_FOLDER, 'Pushups', '0.jpg'), outside)
+    cache_dir = str(tmp_path / 'cache')
+    path = thumbnails.get_derivative(str(outside), 32, 80, 'jpeg', cache_dir)
+    assert os.path.commonpath([path, cache_dir]) == cache_dir
@@ -0,0 +1,180 @@
+"""
+Varian gambar latihan (ukuran/kualitas/format) yang dibuat sekali lalu disimpan di disk.
+
+Setiap gambar sumber punya folder sendiri di cache; nama file varian diawali mtime dan
+ukuran sumber, jadi varian dari versi lama dikenali dan dihapus saat varian baru dibuat
+atau saat pre-generate.
+
+Pre-generate semua ukuran umum secara paralel (sekaligus membersihkan varian usang):
+    python thumbnails.py --widths 320 640 --formats webp jpeg --workers 8
+"""
+import os
+import hashlib
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from exercise_index import BASE_DIR, EXERCISES_FOLDER, load_records
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Lokasi cache turunan gambar di disk
+CACHE_DIR = os.environ.get('GOGYM_THUMBNAIL_DIR', os.path.join(BASE_DIR, '.cache', 'thumbnails'))
+
+# format -> (nama format Pillow, mimetype, ekstensi file)
+FORMATS = {
+    'jpeg': ('JPEG', 'image/jpeg', 'jpg'),
+    'webp': ('WEBP', 'image/webp', 'webp'),
+    'png': ('PNG', 'image/png', 'png'),
+}
+
+MIN_WIDTH = 16
+MAX_WIDTH = 2048
+DEFAULT_QUALITY = 80
+DEFAULT_WIDTHS = (320, 640)
+
+
+def source_dir(source_path, cache_dir=CACHE_DIR):
+    """Folder cache untuk satu gambar sumber, misalnya <cache>/Barbell_Squat/0.jpg."""
+    relative = os.path.relpath(source_path, EXERCISES_FOLDER)
+    if relative.startswith(os.pardir) or os.path.isabs(relative):
+        # Gambar di luar folder exercises/ tidak boleh keluar dari cache_dir
+        relative = hashlib.sha1(os.path.abspath(source_path).encode()).hexdigest()
+    return os.path.join(cache_dir, relative)
+
+
+def version_prefix(stat):
+    return f"{stat.st_mtime_ns}-{stat.st_size}-"
+
+
+def derivative_path(source_path, width, quality, fmt, cache_dir=CACHE_DIR):
+    """Path file turunan; namanya memuat mtime dan ukuran sumber (satu stat) sehingga file baru otomatis dibuat ulang."""
+    prefix = version_prefix(os.stat(source_path))
+    return os.path.join(source_dir(source_path, cache_dir), f"{prefix}{width or 'full'}-{quality}.{FORMATS[fmt][2]}")
+
+
+def remove_stale(target_path):
+    """Menghapus varian lain di folder sumber yang dibuat dari versi sumber yang berbeda."""
+    folder, name = os.path.split(target_path)
+    prefix = '-'.join(name.split('-')[:2]) + '-'
+    removed = 0
+    for entry in os.listdir(folder):
+        # File .tmp mungkin sedang ditulis proses lain
+        if not entry.startswith(prefix) and not entry.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(folder, entry))
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def prune(cache_dir=CACHE_DIR, exercises_folder=EXERCISES_FOLDER):
+    """
+    Menghapus varian yang sumbernya sudah berubah atau terhapus, termasuk file dari format
+    cache lama. Mengembalikan jumlah file yang dihapus.
+    """
+    removed = 0
+    if not os.path.isdir(cache_dir):
+        return removed
+    for folder, _, files in os.walk(cache_dir, topdown=False):
+        if not files:
+            continue
+        source_path = os.path.join(exercises_folder, os.path.relpath(folder, cache_dir))
+        try:
+            current = version_prefix(os.stat(source_path))
+        except (FileNotFoundError, NotADirectoryError):
+            current = None
+        for name in files:
+            if name.endswith('.tmp') or (current and name.startswith(current)):
+                continue
+            os.remove(os.path.join(folder, name))
+            removed += 1
+    # Folder kosong (sumber terhapus atau format lama) ikut dibuang
+    for folder, _, _ in os.walk(cache_dir, topdown=False):
+        if folder != cache_dir and not os.listdir(folder):
+            shutil.rmtree(folder, ignore_errors=True)
+    return removed
+
+
+def render(source_path, target_path, width, quality, fmt):
+    """Mengubah ukuran/format gambar sumber dan menyimpannya secara atomik ke target_path."""
+    with Image.open(source_path) as image:
+        # Tidak memperbesar gambar yang lebih kecil dari lebar yang diminta
+        if width and width < image.width:
+            image.thumbnail((width, image.height))
+        if fmt != 'png' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        # Nama file sementara unik per panggilan, aman untuk beberapa thread/proses sekaligus
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                image.save(f, FORMATS[fmt][0], quality=quality, optimize=True)
+            os.replace(temp_path, target_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+def ensure_derivative(source_path, target_path, width, quality, fmt):
+    """Membuat target_path jika belum ada di disk, lalu menghapus varian dari versi sumber yang lama."""
+    if not os.path.exists(target_path):
+        render(source_path, target_path, width, quality, fmt)
+        remove_stale(target_path)
+
+
+def get_derivative(source_path, width=None, quality=DEFAULT_QUALITY, fmt='jpeg', cache_dir=CACHE_DIR):
+    """Mengembalikan path varian gambar, membuatnya dulu jika belum ada di cache."""
+    if not PIL_AVAILABLE:
+        raise RuntimeError("Pillow is required to generate image variants.")
+
+    target_path = derivative_path(source_path, width, quality, fmt, cache_dir)
+    ensure_derivative(source_path, target_path, width, quality, fmt)
+    return target_path
+
+
+def _pregenerate(job):
+    source_path, width, quality, fmt, cache_dir = job
+    try:
+        get_derivative(source_path, width, quality, fmt, cache_dir)
+        return None
+    except Exception as e:
+        return f"{source_path} ({width}px {fmt}): {e}"
+
+
+def pregenerate(widths=DEFAULT_WIDTHS, formats=('webp',), quality=DEFAULT_QUALITY, workers=None, cache_dir=CACHE_DIR):
+    """Membuat semua varian untuk seluruh gambar katalog memakai process pool."""
+    jobs = [
+        (os.path.join(EXERCISES_FOLDER, image), width, quality, fmt, cache_dir)
+        for record in load_records()
+        for image in record.get('images', [])
+        for width in widths
+        for fmt in formats
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        errors = [error for error in executor.map(_pregenerate, jobs, chunksize=32) if error]
+    return len(jobs), errors, prune(cache_dir)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pre-generate exercise image variants.")
+    parser.add_argument('--widths', type=int, nargs='+', default=list(DEFAULT_WIDTHS))
+    parser.add_argument('--formats', nargs='+', default=['webp'], choices=sorted(FORMATS))
+    parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if not PIL_AVAILABLE:
+        parser.error("Pillow is required to generate image variants.")
+
+    total, errors, removed = pregenerate(args.widths, args.formats, args.quality, args.workers)
+    for error in errors:
+        print(f"Error: {error}")
+    print(f"Generated {total - len(errors)} of {total} image variants in {CACHE_DIR}, removed {removed} stale files")